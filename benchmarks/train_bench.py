@@ -0,0 +1,181 @@
+"""Training pipeline benchmark.
+
+Runs ``models/train.py``'s pipeline end to end on synthetic OHLC written as ``dt=``
+Parquet partitions, fully offline, and reports where the time goes: Parquet loading,
+feature building, labels, the scaler, cross-validation (or the hyperparameter search),
+the final fits and saving to a registry. Also reports fits/sec and peak memory (RSS of
+this process and of pool workers; ``--tracemalloc`` adds Python-heap peak at some cost).
+The JSON output carries the commit and library versions so runs compare across commits.
+
+    python -m benchmarks.train_bench --rows 100000 --workers 4 --out bench.json
+    python -m benchmarks.train_bench --profile train.prof   # cProfile dump (+ top functions on stderr)
+"""
+
+from __future__ import annotations
+
+import argparse
+import cProfile
+import io
+import json
+import pathlib
+import pstats
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.backtest_bench import _synthetic_ohlc
+from models import train
+from models.cv import plan
+
+
+@dataclass
+class TrainBenchResult:
+    rows: int
+    feature_rows: int
+    horizons: Dict[str, int]
+    workers: int
+    threads: int
+    search_configs: int
+    seconds: float
+    stages: Dict[str, float]
+    fits: int
+    fits_per_sec: float
+    peak_rss_mb: float
+    peak_worker_rss_mb: float
+    tracemalloc_peak_mb: Optional[float] = None
+    env: Dict[str, Any] = field(default_factory=dict)
+
+
+def _write_partitions(df: pd.DataFrame, root: pathlib.Path, symbol: str) -> None:
+    # Same layout and string columns as ingest/polygon_loader.py.
+    df = df.assign(symbol=symbol, timeframe="1m", source="synthetic")
+    for dt, part in df.groupby(df["ts"].dt.date):
+        d = root / symbol / "timeframe=1m" / f"dt={dt}"
+        d.mkdir(parents=True, exist_ok=True)
+        part.to_parquet(d / f"{dt}.parquet", index=False)
+
+
+def _env() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ""
+    versions = {}
+    for mod in ("numpy", "pandas", "pyarrow", "sklearn", "xgboost", "lightgbm"):
+        try:
+            versions[mod] = __import__(mod).__version__
+        except ImportError:
+            versions[mod] = None
+    return {"commit": commit or None, "python": sys.version.split()[0], **versions}
+
+
+def _maxrss_mb(who: int) -> float:
+    # ru_maxrss is KiB on Linux.
+    return resource.getrusage(who).ru_maxrss / 1024.0
+
+
+def run(
+    rows: int = 50_000,
+    horizons: Optional[Dict[str, int]] = None,
+    workers: int = 1,
+    threads: int = 1,
+    search_configs: int = 0,
+    n_splits: int = 5,
+    trace_memory: bool = False,
+    seed: int = 7,
+) -> TrainBenchResult:
+    from sklearn.preprocessing import StandardScaler
+
+    horizons = dict(horizons or train.HORIZONS)
+    search = None
+    if search_configs > 0:
+        search = {**train.DEFAULT_SEARCH, "configs": search_configs}
+    if trace_memory:
+        tracemalloc.start()
+    stats: Dict[str, Any] = {"stages": {}}
+    with tempfile.TemporaryDirectory(prefix="train-bench-") as tmp:
+        root = pathlib.Path(tmp)
+        _write_partitions(_synthetic_ohlc(rows, seed), root / "data", "BENCH")
+
+        t0 = time.perf_counter()
+        df = train.load_parquet_dir(root / "data", "BENCH")
+        stats["stages"]["load_parquet"] = time.perf_counter() - t0
+        out = train.train_all(df, horizons, workers, threads, n_splits=n_splits, search=search, stats=stats)
+        t1 = time.perf_counter()
+        for h, (model, meta) in out.items():
+            train.save_version(root / "registry", h, model, meta)
+        stats["stages"]["save"] = time.perf_counter() - t1
+        seconds = time.perf_counter() - t0
+
+        # The scaler is fitted inside every task; time one fit on the full matrix separately.
+        X = train.build_features(df)[train.FEATURES].to_numpy(dtype=np.float64)
+        t2 = time.perf_counter()
+        StandardScaler(with_mean=False).fit(X)
+        stats["stages"]["scaler_fit_once"] = time.perf_counter() - t2
+
+    traced = None
+    if trace_memory:
+        traced = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+    fit_seconds = sum(stats["stages"].get(k, 0.0) for k in ("cv", "search", "final_fit"))
+    return TrainBenchResult(
+        rows=rows,
+        feature_rows=int(stats.get("rows", 0)),
+        horizons=horizons,
+        workers=workers,
+        threads=threads,
+        search_configs=search_configs,
+        seconds=round(seconds, 4),
+        stages={k: round(v, 4) for k, v in stats["stages"].items()},
+        fits=int(stats.get("fits", 0)),
+        fits_per_sec=round(stats.get("fits", 0) / fit_seconds, 3) if fit_seconds else 0.0,
+        peak_rss_mb=round(_maxrss_mb(resource.RUSAGE_SELF), 1),
+        peak_worker_rss_mb=round(_maxrss_mb(resource.RUSAGE_CHILDREN), 1),
+        tracemalloc_peak_mb=round(traced, 1) if traced is not None else None,
+        env=_env(),
+    )
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=50_000, help="synthetic 1-minute bars")
+    ap.add_argument("--horizons", default=",".join(f"{h}={b}" for h, b in train.HORIZONS.items()), help="name=bars,...")
+    ap.add_argument("--workers", type=int, default=1)
+    ap.add_argument("--threads", type=int, default=None)
+    ap.add_argument("--search_configs", type=int, default=0, help="0: fixed candidates (stable baseline)")
+    ap.add_argument("--n_splits", type=int, default=5)
+    ap.add_argument("--tracemalloc", action="store_true", help="also report the Python-heap peak (slower)")
+    ap.add_argument("--profile", default=None, help="write a cProfile dump here")
+    ap.add_argument("--out", default=None, help="write the JSON result here as well as stdout")
+    args = ap.parse_args(argv)
+    horizons = {h: int(b) for h, b in (p.split("=") for p in args.horizons.split(","))}
+    workers, threads = plan(workers=args.workers, threads=args.threads)
+    kwargs = dict(rows=args.rows, horizons=horizons, workers=workers, threads=threads,
+                  search_configs=args.search_configs, n_splits=args.n_splits, trace_memory=args.tracemalloc)
+
+    if args.profile:
+        prof = cProfile.Profile()
+        r = prof.runcall(run, **kwargs)
+        prof.dump_stats(args.profile)
+        buf = io.StringIO()
+        pstats.Stats(prof, stream=buf).sort_stats("cumulative").print_stats(15)
+        print(buf.getvalue(), file=sys.stderr)
+    else:
+        r = run(**kwargs)
+    text = json.dumps(asdict(r), indent=2, sort_keys=True)
+    if args.out:
+        pathlib.Path(args.out).write_text(text + "\n")
+    print(text)
+    return r
+
+
+if __name__ == "__main__":
+    main()
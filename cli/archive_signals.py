@@ -0,0 +1,35 @@
+"""Retention job: move cold months of signal history to compressed Parquet.
+
+Whole months older than ``--keep_days`` are written to
+``<archive_dir>/<table>/month=YYYY-MM/part.parquet`` and then dropped from the
+database (a partition drop on Postgres; a month whose locks are not granted within
+``--lock_timeout`` is left for the next run). History/evaluate reads that reach past
+the hot window union the archive back in when SIGNAL_ARCHIVE_DIR is set.
+
+Usage:
+  python cli/archive_signals.py --archive_dir ./data/signal_archive --keep_days 180
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from datetime import timedelta
+
+from storage.db_store import get_store, utc_now
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--archive_dir", default=os.getenv("SIGNAL_ARCHIVE_DIR", "./data/signal_archive"))
+    ap.add_argument("--keep_days", type=int, default=int(os.getenv("SIGNAL_RETENTION_DAYS", "180")))
+    ap.add_argument("--lock_timeout", type=float, default=5.0, help="seconds to wait for a month's locks (Postgres)")
+    args = ap.parse_args()
+    store = get_store(archive_dir=args.archive_dir)
+    res = store.archive_before(utc_now() - timedelta(days=max(1, args.keep_days)), lock_timeout=args.lock_timeout)
+    print(json.dumps(res, indent=2))
+
+
+if __name__ == "__main__":
+    main()
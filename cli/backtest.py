@@ -1,13 +1,12 @@
 import argparse, pathlib, pandas as pd, json
 from backtest.engine import monthly_walkforward
+from storage.candle_reader import read_candles
 
-def load_parquet_dir(data_dir: pathlib.Path, symbol: str) -> pd.DataFrame:
-    base = data_dir / symbol
-    parts = list(base.rglob("*.parquet"))
-    if not parts:
-        raise FileNotFoundError(f"No Parquet under {base}")
-    dfs = [pd.read_parquet(p) for p in sorted(parts)]
-    return pd.concat(dfs, ignore_index=True).sort_values("ts")
+def load_parquet_dir(data_dir: pathlib.Path, symbol: str, start=None, end=None) -> pd.DataFrame:
+    df = read_candles(str(data_dir), symbol, start, end, columns=("ts","h","l","c"))
+    if df.empty:
+        raise FileNotFoundError(f"No Parquet under {pathlib.Path(data_dir) / symbol} for [{start}, {end}]")
+    return df
 
 def main():
     ap = argparse.ArgumentParser()
@@ -15,8 +14,10 @@ def main():
     ap.add_argument("--symbol", default="GBPUSD")
     ap.add_argument("--horizon", default="30m", choices=["30m","2h"])
     ap.add_argument("--out", required=True)
+    ap.add_argument("--start", default=None, help="first candle date/time (UTC, e.g. 2024-01-01)")
+    ap.add_argument("--end", default=None, help="last candle date/time (UTC)")
     args = ap.parse_args()
-    df = load_parquet_dir(pathlib.Path(args.data_dir), args.symbol)
+    df = load_parquet_dir(pathlib.Path(args.data_dir), args.symbol, args.start, args.end)
     horizon_bars = 6 if args.horizon=="30m" else 24
     res = monthly_walkforward(df, horizon_bars=horizon_bars)
     pathlib.Path(args.out).parent.mkdir(parents=True, exist_ok=True)
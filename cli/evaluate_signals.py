@@ -0,0 +1,38 @@
+"""Evaluate newly matured signals and persist their realized outcomes.
+
+Only signals whose horizon is fully covered by the candle data and that have no
+outcome yet are processed, so this is cheap to run on every candle update.
+
+Usage:
+  python cli/evaluate_signals.py --data_dir ./data/market_candles --symbol GBPUSD
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+
+from services.outcomes import OutcomeJob
+from storage.db_store import get_store
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--data_dir", default=os.getenv("DATA_DIR", "./data/market_candles"))
+    ap.add_argument("--symbol", default=os.getenv("SYMBOL", "GBPUSD"))
+    ap.add_argument("--timeframe", default=f"{os.getenv('BAR_MINUTES', '5')}m")
+    ap.add_argument("--horizons", default="30m,2h")
+    args = ap.parse_args()
+    job = OutcomeJob(
+        store=get_store(),
+        data_dir=args.data_dir,
+        symbol=args.symbol,
+        timeframe=args.timeframe,
+        horizons=[h.strip() for h in args.horizons.split(",") if h.strip()],
+    )
+    done = job.run()
+    print(f"Evaluated {sum(done.values())} signals: {done}")
+
+
+if __name__ == "__main__":
+    main()
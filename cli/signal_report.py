@@ -8,6 +8,8 @@ Env:
   SYMBOL               (default: GBPUSD)
   HORIZON              (default: 30m)
   SLACK_WEBHOOK_URL    If set, posts a simple message payload.
+  FOLLOW               If "1" (requires API_BASE_URL), stays connected to /signals/stream
+                       and reports each new signal as its bar closes instead of polling.
 """
 
 from __future__ import annotations
@@ -15,6 +17,7 @@ from __future__ import annotations
 import json
 import os
 from datetime import datetime
+from typing import Iterator
 
 import requests
 
@@ -25,6 +28,16 @@ def _fetch_from_api(api_base: str, horizon: str) -> dict:
     return r.json()
 
 
+def _follow_api(api_base: str, symbol: str, horizon: str) -> Iterator[dict]:
+    """Yield signals pushed by the API's Server-Sent Events stream."""
+    params = {"topics": f"{symbol}:{horizon}", "replay": 0}
+    with requests.get(f"{api_base}/signals/stream", params=params, stream=True, timeout=(10, 120)) as r:
+        r.raise_for_status()
+        for line in r.iter_lines(decode_unicode=True):
+            if line and line.startswith("data: "):
+                yield json.loads(line[len("data: "):])["signal"]
+
+
 def _post_to_slack(webhook: str, payload: dict) -> None:
     side = str(payload.get("side", "?")).upper()
     prob = payload.get("prob_up", payload.get("p", None))
@@ -50,11 +63,25 @@ def _post_to_slack(webhook: str, payload: dict) -> None:
     r.raise_for_status()
 
 
+def _report(payload: dict, slack) -> None:
+    payload = dict(payload)
+    payload["generated_at"] = datetime.utcnow().isoformat()
+    print(json.dumps(payload, indent=2, sort_keys=True), flush=True)
+
+    if slack:
+        _post_to_slack(slack, payload)
+
+
 def main() -> int:
     api_base = os.getenv("API_BASE_URL")
     horizon = os.getenv("HORIZON", "30m")
     slack = os.getenv("SLACK_WEBHOOK_URL")
 
+    if api_base and os.getenv("FOLLOW") == "1":
+        for payload in _follow_api(api_base, os.getenv("SYMBOL", "GBPUSD"), horizon):
+            _report(payload, slack)
+        return 0
+
     if not api_base:
         # fallback: direct import path
         from services.inference_api.main import latest  # type: ignore
@@ -63,13 +90,7 @@ def main() -> int:
     else:
         payload = _fetch_from_api(api_base, horizon)
 
-    payload = dict(payload)
-    payload["generated_at"] = datetime.utcnow().isoformat()
-    print(json.dumps(payload, indent=2, sort_keys=True))
-
-    if slack:
-        _post_to_slack(slack, payload)
-
+    _report(payload, slack)
     return 0
 
 
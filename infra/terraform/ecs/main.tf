@@ -1,6 +1,7 @@
 locals {
   api_paths = [
     "/health",
+    "/ready",
     "/signals/*",
     "/backtest/*",
     "/docs",
@@ -249,7 +250,7 @@ resource "aws_lb_target_group" "api" {
   vpc_id      = var.vpc_id
 
   health_check {
-    path = "/health"
+    path = "/ready"
   }
 }
 
@@ -317,7 +318,7 @@ resource "aws_lb_target_group" "api" {
   vpc_id      = var.vpc_id
 
   health_check {
-    path = "/health"
+    path = "/ready"
   }
 }
 
@@ -348,7 +349,7 @@ resource "aws_ecs_task_definition" "api" {
   network_mode             = "awsvpc"
   requires_compatibilities = ["FARGATE"]
   cpu                      = 512
-  memory                   = 1024
+  memory                   = var.api_memory
   execution_role_arn       = aws_iam_role.task_execution.arn
   task_role_arn            = aws_iam_role.task.arn
 
@@ -366,7 +367,10 @@ resource "aws_ecs_task_definition" "api" {
       environment = [
         { name = "MODEL_REGISTRY", value = "/models_registry/gbpusd" },
         { name = "DATA_DIR",       value = "/data/market_candles" },
-        { name = "SYMBOL",         value = "GBPUSD" }
+        { name = "SYMBOL",         value = "GBPUSD" },
+        { name = "TASK_MEMORY_MB", value = tostring(var.api_memory) },
+        # Resident models/candles get ~60% of the task; the rest is the interpreter and worker pools.
+        { name = "RESIDENT_MEMORY_MB", value = tostring(floor(var.api_memory * 0.6)) }
       ]
       secrets = local.api_secrets
       logConfiguration = {
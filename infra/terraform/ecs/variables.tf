@@ -71,3 +71,8 @@ variable "alarm_email" {
   type    = string
   default = ""
 }
+
+variable "api_memory" {
+  type    = number
+  default = 1024
+}
@@ -0,0 +1,133 @@
+"""Compact, versioned model artifact that loads without unpickling sklearn.
+
+A trained ``Pipeline([("scaler", StandardScaler(with_mean=False)), ("clf", booster)])``
+is exported as:
+
+- ``scale.npy``: the scaler's ``scale_`` vector (``with_mean=False``, so serving is ``X / scale``)
+- ``booster.json`` (XGBoost) or ``booster.txt`` (LightGBM): the booster in its native format
+- ``manifest.json``: format version, booster kind, feature names, training metadata and a
+  SHA-256 per file. It is written last, so a version directory without a manifest is incomplete.
+
+Only the booster library itself is needed to load it, and its native formats are stable across
+releases, unlike pickles that pin the exact sklearn/xgboost/lightgbm versions used in training.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from typing import Any, Dict
+
+import numpy as np
+
+MANIFEST = "manifest.json"
+FORMAT = "native-gbm"
+FORMAT_VERSION = 1
+_BOOSTER_FILES = {"xgboost": "booster.json", "lightgbm": "booster.txt"}
+
+
+def _sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _kind(clf: Any) -> str:
+    mod = type(clf).__module__
+    if mod.startswith("xgboost"):
+        return "xgboost"
+    if mod.startswith("lightgbm"):
+        return "lightgbm"
+    raise ValueError(f"unsupported classifier for native export: {type(clf).__name__}")
+
+
+def save_native(pipe: Any, out_dir: str, meta: Dict[str, Any]) -> Dict[str, Any]:
+    """Export a fitted scaler+booster pipeline into ``out_dir``; returns the manifest."""
+    scaler = pipe.named_steps["scaler"]
+    clf = pipe.named_steps["clf"]
+    kind = _kind(clf)
+    os.makedirs(out_dir, exist_ok=True)
+
+    scale = np.ones(int(scaler.n_features_in_)) if scaler.scale_ is None else scaler.scale_
+    np.save(os.path.join(out_dir, "scale.npy"), np.asarray(scale, dtype=np.float64))
+    booster_file = _BOOSTER_FILES[kind]
+    booster_path = os.path.join(out_dir, booster_file)
+    if kind == "xgboost":
+        clf.get_booster().save_model(booster_path)
+    else:
+        clf.booster_.save_model(booster_path)
+
+    files = {name: _sha256(os.path.join(out_dir, name)) for name in ("scale.npy", booster_file)}
+    manifest = {
+        **meta,
+        "format": FORMAT,
+        "format_version": FORMAT_VERSION,
+        "kind": kind,
+        "scale": "scale.npy",
+        "booster": booster_file,
+        "files": files,
+        "library_version": __import__(kind).__version__,
+    }
+    tmp = os.path.join(out_dir, MANIFEST + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, os.path.join(out_dir, MANIFEST))
+    return manifest
+
+
+class NativeModel:
+    """``predict_proba``-compatible wrapper around a native booster and its scale vector."""
+
+    def __init__(self, kind: str, booster: Any, scale: np.ndarray, manifest: Dict[str, Any], nbytes: int):
+        self.kind = kind
+        self.booster = booster
+        self.scale = scale
+        self.manifest = manifest
+        self.nbytes = nbytes
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        x = np.asarray(X, dtype=np.float64) / self.scale
+        if self.kind == "xgboost":
+            p = self.booster.inplace_predict(x)
+        else:
+            p = self.booster.predict(x)
+        p = np.asarray(p, dtype=np.float64).reshape(-1)
+        return np.column_stack([1.0 - p, p])
+
+
+def read_manifest(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        manifest = json.load(f)
+    if manifest.get("format") != FORMAT or int(manifest.get("format_version", 0)) > FORMAT_VERSION:
+        raise ValueError(f"unsupported artifact format in {path}: {manifest.get('format')} v{manifest.get('format_version')}")
+    return manifest
+
+
+def load_native(manifest_path: str, verify: bool = True) -> NativeModel:
+    """Load the artifact described by ``manifest_path``, checking file checksums by default."""
+    manifest = read_manifest(manifest_path)
+    base = os.path.dirname(manifest_path)
+    nbytes = 0
+    for name, digest in manifest["files"].items():
+        path = os.path.join(base, name)
+        nbytes += os.path.getsize(path)
+        if verify and _sha256(path) != digest:
+            raise ValueError(f"checksum mismatch for {path}")
+
+    scale = np.load(os.path.join(base, manifest["scale"]))
+    booster_path = os.path.join(base, manifest["booster"])
+    kind = manifest["kind"]
+    if kind == "xgboost":
+        import xgboost
+
+        booster = xgboost.Booster(model_file=booster_path)
+    elif kind == "lightgbm":
+        import lightgbm
+
+        booster = lightgbm.Booster(model_file=booster_path)
+    else:
+        raise ValueError(f"unsupported booster kind: {kind}")
+    return NativeModel(kind, booster, scale, manifest, nbytes)
@@ -0,0 +1,153 @@
+"""Fold x candidate x horizon training tasks scheduled on a process pool.
+
+Every cross-validation fold and every final fit is an independent ``Task`` that builds
+a fresh pipeline, so nothing is refitted in place across folds. Feature matrices and
+labels are written once as ``.npy`` files and opened with ``mmap_mode="r"`` in the
+workers: a task pickles only paths and row ranges, and the OS page cache shares the
+data between processes instead of copying it into each one.
+
+Each worker runs its booster with ``threads`` threads (``n_jobs`` plus a
+``threadpool_limits`` cap for BLAS/OpenMP), so ``workers * threads`` stays within
+the machine's cores instead of every task spawning one thread per core.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Name -> constructor kwargs; the fixed configurations model selection compares.
+CANDIDATES: Dict[str, Dict[str, Any]] = {
+    "xgb": dict(n_estimators=200, max_depth=4, learning_rate=0.1, subsample=0.8),
+    "lgbm": dict(n_estimators=400, learning_rate=0.05, subsample=0.8),
+}
+
+# Share of a fold's training window held out (its most recent rows) for early stopping.
+VALID_FRAC = 0.15
+
+Rows = Tuple[int, int]
+
+
+@dataclass(frozen=True)
+class Task:
+    horizon: str
+    model: str
+    params: Dict[str, Any]
+    x_path: str
+    y_path: str  # (n_labels, n_rows) label matrix shared by all horizons
+    train: Rows
+    test: Optional[Rows] = None  # None: final fit, the fitted pipeline is returned
+    fold: Optional[int] = None
+    label: int = 0  # row of the label matrix
+    early_stopping: int = 0  # rounds without improvement on the fold's validation tail; 0 = fit all trees
+
+    @property
+    def cost(self) -> int:
+        return self.train[1] - self.train[0]
+
+
+def make_pipeline(model: str, params: Dict[str, Any], threads: int = 1, early_stopping: int = 0) -> Any:
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    if model == "xgb":
+        from xgboost import XGBClassifier
+
+        es = dict(early_stopping_rounds=early_stopping, eval_metric="logloss") if early_stopping else {}
+        clf = XGBClassifier(n_jobs=threads, **es, **params)
+    elif model == "lgbm":
+        from lightgbm import LGBMClassifier
+
+        clf = LGBMClassifier(n_jobs=threads, verbose=-1, **params)
+    else:
+        raise ValueError(f"unknown model: {model}")
+    return Pipeline([("scaler", StandardScaler(with_mean=False)), ("clf", clf)])
+
+
+def share(arr: np.ndarray, path: str) -> str:
+    """Write ``arr`` for workers to memory-map; returns the path."""
+    np.save(path, np.ascontiguousarray(arr))
+    return path
+
+
+def fold_rows(n: int, n_splits: int = 5) -> List[Tuple[Rows, Rows]]:
+    """``TimeSeriesSplit`` folds as contiguous (train, test) row ranges."""
+    from sklearn.model_selection import TimeSeriesSplit
+
+    return [((0, int(tr[-1]) + 1), (int(te[0]), int(te[-1]) + 1)) for tr, te in TimeSeriesSplit(n_splits).split(np.empty(n))]
+
+
+def _fit_early_stopping(pipe: Any, task: Task, X: np.ndarray, y: np.ndarray) -> int:
+    """Fit on the training window minus its validation tail; returns the best tree count."""
+    a, b = task.train
+    v = b - max(int((b - a) * VALID_FRAC), 1)
+    # The pipeline does not transform eval_set, so scale the validation rows the way fit will.
+    valid = [(pipe.named_steps["scaler"].fit(X[a:v]).transform(X[v:b]), y[v:b])]
+    if task.model == "xgb":
+        pipe.fit(X[a:v], y[a:v], clf__eval_set=valid, clf__verbose=False)
+        return int(pipe.named_steps["clf"].best_iteration) + 1
+    import lightgbm
+
+    callbacks = [lightgbm.early_stopping(task.early_stopping, verbose=False)]
+    pipe.fit(X[a:v], y[a:v], clf__eval_set=valid, clf__callbacks=callbacks)
+    return int(pipe.named_steps["clf"].best_iteration_ or task.params.get("n_estimators", 100))
+
+
+def run_task(task: Task, threads: int = 1) -> Any:
+    """Fit one task: a fold returns ``{"auc", "trees"}`` on its test rows, a final fit the pipeline."""
+    from sklearn.metrics import roc_auc_score
+    from threadpoolctl import threadpool_limits
+
+    X = np.load(task.x_path, mmap_mode="r")
+    y = np.load(task.y_path, mmap_mode="r")[task.label]
+    with threadpool_limits(threads):
+        if task.test is None or not task.early_stopping:
+            pipe = make_pipeline(task.model, task.params, threads)
+            a, b = task.train
+            pipe.fit(X[a:b], y[a:b])
+            trees = int(task.params.get("n_estimators", 100))
+        else:
+            pipe = make_pipeline(task.model, task.params, threads, task.early_stopping)
+            trees = _fit_early_stopping(pipe, task, X, y)
+        if task.test is None:
+            return pipe
+        a, b = task.test
+        return {"auc": float(roc_auc_score(y[a:b], pipe.predict_proba(X[a:b])[:, 1])), "trees": trees}
+
+
+def _limit_threads(threads: int) -> None:
+    # Before xgboost/lightgbm load in the worker, so their OpenMP pools start small.
+    for var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ[var] = str(threads)
+
+
+def run_tasks(tasks: Sequence[Task], workers: int = 1, threads: int = 1) -> List[Any]:
+    """Results in ``tasks`` order; the largest fits are started first to shorten the tail."""
+    order = sorted(range(len(tasks)), key=lambda i: -tasks[i].cost)
+    results: List[Any] = [None] * len(tasks)
+    if workers <= 1:
+        for i in order:
+            results[i] = run_task(tasks[i], threads)
+        return results
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(workers, mp_context=ctx, initializer=_limit_threads, initargs=(threads,)) as pool:
+        futures = {i: pool.submit(run_task, tasks[i], threads) for i in order}
+        for i, fut in futures.items():
+            results[i] = fut.result()
+    return results
+
+
+def plan(cpus: Optional[int] = None, workers: Optional[int] = None, threads: Optional[int] = None) -> Tuple[int, int]:
+    """(workers, threads per task) that together use ``cpus`` cores."""
+    cpus = max(int(cpus or os.cpu_count() or 1), 1)
+    if workers is None:
+        workers = cpus if threads is None else max(cpus // max(int(threads), 1), 1)
+    workers = max(int(workers), 1)
+    if threads is None:
+        threads = max(cpus // workers, 1)
+    return workers, max(int(threads), 1)
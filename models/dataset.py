@@ -0,0 +1,58 @@
+"""One feature matrix, every horizon's labels.
+
+``build_training_set`` takes the engineered feature frame once and derives the
+up/down label of each horizon from the same close array in a single vectorised
+pass, into one ``(n_horizons, n_rows)`` array. ``TrainingSet.horizon`` then hands
+out views (no copies) trimmed to the rows whose label is known, so adding a
+horizon costs one label row and its model fits, not another feature build.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class TrainingSet:
+    X: np.ndarray  # (n_rows, n_features) float64
+    labels: np.ndarray  # (n_horizons, n_rows) int8, 1 = close higher ``bars`` later
+    horizons: Dict[str, int]  # horizon -> bars, in label-row order
+    features: List[str]
+    ts: Optional[np.ndarray] = None  # bar timestamps of the rows, when the frame has them
+
+    def index(self, h: str) -> int:
+        return list(self.horizons).index(h)
+
+    def rows(self, h: str) -> int:
+        """Rows usable for ``h``: the last ``bars`` have no future close yet."""
+        return max(len(self.X) - self.horizons[h], 0)
+
+    def horizon(self, h: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(X, y) views for one horizon."""
+        n = self.rows(h)
+        return self.X[:n], self.labels[self.index(h), :n]
+
+    def last_ts(self, h: str) -> Optional[str]:
+        """Timestamp of the last row ``h`` trains on (ISO), for warm-start cut-offs."""
+        n = self.rows(h)
+        if self.ts is None or n == 0:
+            return None
+        return pd.Timestamp(self.ts[n - 1]).isoformat()
+
+
+def build_training_set(x: pd.DataFrame, horizons: Dict[str, int], features: Sequence[str]) -> TrainingSet:
+    """``x`` is the ts-sorted output of feature engineering (with its ``c`` column)."""
+    X = x[list(features)].to_numpy(dtype=np.float64)
+    close = x["c"].to_numpy(dtype=np.float64)
+    bars = np.fromiter(horizons.values(), dtype=np.int64, count=len(horizons))
+    n = len(close)
+    # fut[i, j] = close[j + bars[i]]; positions past the end compare false and are never handed out.
+    idx = np.arange(n)[None, :] + bars[:, None]
+    fut = np.take(close, idx, mode="clip") if n else np.empty((len(bars), 0))
+    labels = ((fut > close[None, :]) & (idx < n)).astype(np.int8)
+    ts = x["ts"].to_numpy() if "ts" in x else None
+    return TrainingSet(X=X, labels=labels, horizons=dict(horizons), features=list(features), ts=ts)
@@ -0,0 +1,165 @@
+"""Warm-start retraining on candles appended since the latest registry version.
+
+Instead of refitting on the full history, ``warm_start`` loads the current version of a
+horizon and keeps boosting its trees on the rows after that version's ``trained_until``
+(XGBoost via ``xgb_model=``, LightGBM via ``init_model=``), reusing the stored scaler
+so new trees see inputs scaled exactly like the old ones. The most recent ``holdout``
+share of the new rows is kept out of the fit; the continued model is written as a new
+version only if its AUC and Brier score on that slice do not regress against the
+base model. A full retrain (``models/train.py``) still runs when the base version's
+full training is older than ``--full_every_days`` or no version exists yet.
+
+    python models/incremental.py --data_dir ./data/market_candles --out_dir ./models_registry/gbpusd
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import pathlib
+from typing import Any, Dict, Optional, Tuple
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.metrics import brier_score_loss, roc_auc_score
+from sklearn.pipeline import Pipeline
+
+from models.cv import plan
+from models.dataset import build_training_set
+from models.registry import Registry
+from models.train import DEFAULT_SEARCH, FEATURES, HORIZONS, build_features, load_parquet_dir, save_version, train_all
+
+# Bars before the cut-off re-read so the rolling features of the first new bar are complete.
+LOOKBACK_BARS = 50
+
+
+def latest_version(out_dir: str, h: str) -> Optional[pathlib.Path]:
+    """The served (CURRENT) version, which warm starts continue from."""
+    d = Registry(out_dir).current_dir(h)
+    return d if d is not None and (d / "model.pkl").exists() else None
+
+
+def continue_boosting(pipe: Pipeline, X: np.ndarray, y: np.ndarray, trees: int) -> Pipeline:
+    """A new pipeline with ``trees`` more boosting rounds fitted on (X, y); ``pipe`` is untouched."""
+    scaler = pipe.named_steps["scaler"]
+    prev = pipe.named_steps["clf"]
+    clf = clone(prev).set_params(n_estimators=trees)
+    Xs = scaler.transform(X)
+    if hasattr(prev, "get_booster"):
+        clf.set_params(early_stopping_rounds=None)
+        clf.fit(Xs, y, xgb_model=prev.get_booster(), verbose=False)
+    else:
+        clf.fit(Xs, y, init_model=prev.booster_)
+    return Pipeline([("scaler", scaler), ("clf", clf)])
+
+
+def _score(pipe: Pipeline, X: np.ndarray, y: np.ndarray) -> Dict[str, float]:
+    p = pipe.predict_proba(X)[:, 1]
+    return {"auc": float(roc_auc_score(y, p)), "brier": float(brier_score_loss(y, p))}
+
+
+def warm_start(
+    df: pd.DataFrame,
+    base_dir: pathlib.Path,
+    h: str,
+    bars: int,
+    trees: int = 50,
+    holdout: float = 0.2,
+    min_rows: int = 100,
+    tolerance: float = 0.0,
+) -> Tuple[Optional[Pipeline], Dict[str, Any]]:
+    """(continued pipeline or None, report). The report's ``meta`` is the new version's metadata."""
+    spec = json.loads((base_dir / "feature_spec.json").read_text())
+    report: Dict[str, Any] = {"horizon": h, "base_version": base_dir.name, "accepted": False}
+    if not spec.get("trained_until"):
+        report["reason"] = "base version has no trained_until; run a full retrain"
+        return None, report
+
+    df = df.sort_values("ts").reset_index(drop=True)
+    cut = pd.Timestamp(spec["trained_until"])
+    start = int(df["ts"].searchsorted(cut, side="right"))
+    x = build_features(df.iloc[max(start - LOOKBACK_BARS, 0):])
+    x = x[x["ts"] > cut].reset_index(drop=True)
+    ds = build_training_set(x, {h: bars}, spec.get("features", FEATURES))
+    X, y = ds.horizon(h)
+    n = len(y)
+    report["new_rows"] = n
+    if n < min_rows:
+        report["reason"] = f"only {n} new labelled rows (< {min_rows})"
+        return None, report
+
+    split = n - max(int(n * holdout), 1)
+    if len(np.unique(y[split:])) < 2 or len(np.unique(y[:split])) < 2:
+        report["reason"] = "new window or holdout has a single class"
+        return None, report
+
+    base = joblib.load(base_dir / "model.pkl")
+    cand = continue_boosting(base, X[:split], y[:split], trees)
+    before, after = _score(base, X[split:], y[split:]), _score(cand, X[split:], y[split:])
+    report.update(holdout_rows=n - split, base=before, candidate=after, trees_added=trees)
+    if after["auc"] < before["auc"] - tolerance or after["brier"] > before["brier"] + tolerance:
+        report["reason"] = "holdout metrics regressed"
+        return None, report
+
+    report["accepted"] = True
+    report["meta"] = {
+        **spec,
+        "trained_until": pd.Timestamp(ds.ts[split - 1]).isoformat(),
+        "warm_start": {k: report[k] for k in ("base_version", "new_rows", "holdout_rows", "trees_added", "base", "candidate")},
+    }
+    return cand, report
+
+
+def full_due(base_dir: Optional[pathlib.Path], full_every_days: float) -> bool:
+    if base_dir is None:
+        return True
+    spec = json.loads((base_dir / "feature_spec.json").read_text())
+    if not spec.get("full_trained_at"):
+        return True
+    age = pd.Timestamp.now(tz="UTC") - pd.Timestamp(spec["full_trained_at"])
+    return age >= pd.Timedelta(days=full_every_days)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--data_dir", required=True)
+    ap.add_argument("--symbol", default="GBPUSD")
+    ap.add_argument("--out_dir", default="./models_registry/gbpusd")
+    ap.add_argument("--horizons", default=",".join(f"{h}={b}" for h, b in HORIZONS.items()), help="name=bars,...")
+    ap.add_argument("--trees", type=int, default=50, help="boosting rounds added per warm start")
+    ap.add_argument("--holdout", type=float, default=0.2, help="share of the new rows kept for validation")
+    ap.add_argument("--min_rows", type=int, default=100)
+    ap.add_argument("--tolerance", type=float, default=0.0, help="allowed AUC drop / Brier rise on the holdout")
+    ap.add_argument("--full_every_days", type=float, default=7.0, help="full retrain when the last one is older")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--threads", type=int, default=None)
+    args = ap.parse_args()
+    horizons = {h: int(b) for h, b in (p.split("=") for p in args.horizons.split(","))}
+    bases = {h: latest_version(args.out_dir, h) for h in horizons}
+    full = {h: b for h, b in horizons.items() if full_due(bases[h], args.full_every_days)}
+    start = None
+    if not full:
+        # Warm starts only need the candles after the oldest cut-off (plus feature lookback).
+        cuts = [json.loads((bases[h] / "feature_spec.json").read_text()).get("trained_until") for h in horizons]
+        if all(cuts):
+            start = min(pd.Timestamp(c) for c in cuts) - pd.Timedelta(days=1)
+    df = load_parquet_dir(pathlib.Path(args.data_dir), args.symbol, start)
+
+    for h, bars in horizons.items():
+        if h in full:
+            continue
+        base = bases[h]
+        model, report = warm_start(df, base, h, bars, args.trees, args.holdout, args.min_rows, args.tolerance)
+        if model is not None:
+            report["saved"] = str(save_version(args.out_dir, h, model, report.pop("meta")))
+        print(json.dumps(report))
+    if full:
+        workers, threads = plan(workers=args.workers, threads=args.threads)
+        for h, (model, meta) in train_all(df, full, workers, threads, search=DEFAULT_SEARCH).items():
+            print(json.dumps({"horizon": h, "full_retrain": True, "saved": str(save_version(args.out_dir, h, model, meta))}))
+
+
+if __name__ == "__main__":
+    main()
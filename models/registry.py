@@ -0,0 +1,202 @@
+"""Model registry: per-horizon version index plus an atomically swapped ``CURRENT`` pointer.
+
+Layout under a symbol's registry root::
+
+    <root>/<h>/<version>/      artifact files (manifest.json, booster, scale.npy, model.pkl, ...)
+    <root>/<h>/index.json      every version with its metrics and file checksums, plus promotion history
+    <root>/<h>/CURRENT         name of the version being served
+
+A version directory is assembled under a hidden temporary name and renamed into
+place complete, and ``index.json``/``CURRENT`` are rewritten via a temp file and
+``os.replace``, so a reader never sees a half-written artifact or pointer. Servers
+watch only the ``CURRENT`` file's (mtime, size) and resolve the model with one small
+file read instead of globbing and sorting version directories. Writers serialise on
+a per-horizon ``flock`` so concurrent trainings cannot lose index entries.
+
+    python -m models.registry list     --registry ./models_registry/gbpusd --horizon 30m
+    python -m models.registry promote  --registry ./models_registry/gbpusd --horizon 30m --version 2024-05-01T020000Z
+    python -m models.registry rollback --registry ./models_registry/gbpusd --horizon 30m
+"""
+
+from __future__ import annotations
+
+import argparse
+import fcntl
+import hashlib
+import json
+import os
+import pathlib
+import shutil
+import tempfile
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+import pandas as pd
+
+CURRENT = "CURRENT"
+INDEX = "index.json"
+# Metadata fields copied into the index entry.
+SUMMARY_KEYS = ("model", "auc", "brier", "trained_until", "full_trained_at")
+
+
+def _sha256(path: pathlib.Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _write_atomic(path: pathlib.Path, text: str) -> None:
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        os.fchmod(fd, 0o644)  # mkstemp creates 0600
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def read_current(horizon_dir: str) -> Optional[str]:
+    """The served version named by ``<horizon_dir>/CURRENT``, or None."""
+    try:
+        with open(os.path.join(horizon_dir, CURRENT)) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+class Registry:
+    def __init__(self, root: str):
+        self.root = pathlib.Path(root)
+
+    def _dir(self, h: str) -> pathlib.Path:
+        return self.root / h
+
+    @contextmanager
+    def _locked(self, h: str) -> Iterator[None]:
+        d = self._dir(h)
+        d.mkdir(parents=True, exist_ok=True)
+        with open(d / ".lock", "w") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def index(self, h: str) -> Dict[str, Any]:
+        try:
+            return json.loads((self._dir(h) / INDEX).read_text())
+        except FileNotFoundError:
+            return {"horizon": h, "versions": [], "history": []}
+
+    def current(self, h: str) -> Optional[str]:
+        return read_current(str(self._dir(h)))
+
+    def current_dir(self, h: str) -> Optional[pathlib.Path]:
+        """The served version's directory; without a pointer, the newest version directory."""
+        v = self.current(h)
+        if v is not None:
+            return self._dir(h) / v
+        dirs = sorted(p for p in self._dir(h).glob("*") if p.is_dir() and not p.name.startswith("."))
+        return dirs[-1] if dirs else None
+
+    def stage(self, h: str) -> pathlib.Path:
+        """An empty hidden directory to write a new version into before ``add``."""
+        self._dir(h).mkdir(parents=True, exist_ok=True)
+        return pathlib.Path(tempfile.mkdtemp(dir=self._dir(h), prefix=".staging-"))
+
+    def add(self, h: str, staged: pathlib.Path, version: str, meta: Dict[str, Any], promote: bool = True) -> pathlib.Path:
+        """Move a staged directory into place as ``version``, index it and optionally promote it."""
+        checksums = {p.name: _sha256(p) for p in sorted(staged.iterdir()) if p.is_file()}
+        with self._locked(h):
+            idx = self.index(h)
+            taken = {v["version"] for v in idx["versions"]}
+            name, n = version, 1
+            while name in taken or (self._dir(h) / name).exists():
+                n += 1
+                name = f"{version}-{n}"
+            final = self._dir(h) / name
+            os.rename(staged, final)
+            os.chmod(final, 0o755)  # mkdtemp creates 0700; servers may run as another user
+            entry = {"version": name, "created_at": pd.Timestamp.now(tz="UTC").isoformat(), "files": checksums}
+            entry.update({k: meta[k] for k in SUMMARY_KEYS if k in meta})
+            idx["versions"].append(entry)
+            self._write_index(h, idx)
+            if promote:
+                self._promote(h, idx, name)
+        return final
+
+    def discard(self, staged: pathlib.Path) -> None:
+        shutil.rmtree(staged, ignore_errors=True)
+
+    def promote(self, h: str, version: str) -> None:
+        with self._locked(h):
+            idx = self.index(h)
+            if version not in {v["version"] for v in idx["versions"]}:
+                raise ValueError(f"unknown version for {h}: {version}")
+            self._promote(h, idx, version)
+
+    def rollback(self, h: str) -> str:
+        """Re-point ``CURRENT`` at the previously promoted version; returns it."""
+        with self._locked(h):
+            idx = self.index(h)
+            history: List[Dict[str, Any]] = idx["history"]
+            if len(history) < 2:
+                raise ValueError(f"nothing to roll back to for {h}")
+            history.pop()
+            prev = history[-1]["version"]
+            self._write_index(h, idx)
+            _write_atomic(self._dir(h) / CURRENT, prev + "\n")
+            return prev
+
+    def verify(self, h: str, version: str) -> List[str]:
+        """Files of ``version`` whose checksum no longer matches the index."""
+        entry = next(v for v in self.index(h)["versions"] if v["version"] == version)
+        d = self._dir(h) / version
+        return [name for name, digest in entry["files"].items() if not (d / name).exists() or _sha256(d / name) != digest]
+
+    def _promote(self, h: str, idx: Dict[str, Any], version: str) -> None:
+        idx["history"].append({"version": version, "promoted_at": pd.Timestamp.now(tz="UTC").isoformat()})
+        self._write_index(h, idx)
+        _write_atomic(self._dir(h) / CURRENT, version + "\n")
+
+    def _write_index(self, h: str, idx: Dict[str, Any]) -> None:
+        _write_atomic(self._dir(h) / INDEX, json.dumps(idx, indent=2))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("command", choices=["list", "promote", "rollback", "verify"])
+    ap.add_argument("--registry", default="./models_registry/gbpusd")
+    ap.add_argument("--horizon", required=True)
+    ap.add_argument("--version", default=None, help="promote/verify: version name (verify default: current)")
+    args = ap.parse_args()
+    reg = Registry(args.registry)
+    h = args.horizon
+    if args.command == "list":
+        cur = reg.current(h)
+        for v in reg.index(h)["versions"]:
+            mark = "*" if v["version"] == cur else " "
+            print(f"{mark} {v['version']}  model={v.get('model')} auc={v.get('auc')} brier={v.get('brier')}")
+    elif args.command == "promote":
+        if not args.version:
+            ap.error("promote needs --version")
+        reg.promote(h, args.version)
+        print(f"{h}: current -> {args.version}")
+    elif args.command == "rollback":
+        print(f"{h}: current -> {reg.rollback(h)}")
+    else:
+        version = args.version or reg.current(h)
+        bad = reg.verify(h, version)
+        print(f"{h}/{version}: " + ("ok" if not bad else "checksum mismatch: " + ", ".join(bad)))
+        raise SystemExit(1 if bad else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Successive-halving hyperparameter search for the XGBoost / LightGBM trainers.
+
+Configurations are sampled from ``SPACE`` (the fixed ``CANDIDATES`` are always
+included, so the search can only match or beat them). The budget unit is
+time-series folds: every configuration first runs on the earliest, cheapest fold;
+only the best ``1/eta`` advance to the next rung, which adds the following folds,
+until the survivors have been scored on all of them. Within a fold, boosting stops
+``early_stopping`` rounds after the validation loss on the fold's most recent
+training rows stopped improving, so each fit grows only as many trees as it needs
+(up to ``MAX_TREES``). Rungs stop starting once ``budget_s`` wall-clock seconds
+have passed; the winner is then the best configuration at the deepest completed rung.
+
+All horizons are searched together: each rung's fits are one batch on the training
+process pool. The per-trial log is returned for the registry metadata.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from models.cv import CANDIDATES, Rows, Task, run_tasks
+
+SPACE: Dict[str, Dict[str, List[Any]]] = {
+    "xgb": {
+        "max_depth": [3, 4, 5, 6],
+        "learning_rate": [0.03, 0.05, 0.1],
+        "subsample": [0.7, 0.8, 1.0],
+        "colsample_bytree": [0.6, 0.8, 1.0],
+        "min_child_weight": [1, 5, 10],
+    },
+    "lgbm": {
+        "num_leaves": [15, 31, 63],
+        "learning_rate": [0.03, 0.05, 0.1],
+        "subsample": [0.7, 0.8, 1.0],
+        "subsample_freq": [1],
+        "colsample_bytree": [0.6, 0.8, 1.0],
+        "min_child_samples": [10, 20, 50],
+    },
+}
+MAX_TREES = 1000
+
+Config = Tuple[str, Dict[str, Any]]
+
+
+@dataclass
+class Trial:
+    model: str
+    params: Dict[str, Any]
+    folds: Dict[int, Dict[str, Any]] = field(default_factory=dict)
+
+    @property
+    def auc(self) -> float:
+        return float(np.mean([f["auc"] for f in self.folds.values()])) if self.folds else float("-inf")
+
+    @property
+    def trees(self) -> int:
+        return int(np.median([f["trees"] for f in self.folds.values()])) if self.folds else MAX_TREES
+
+    def to_dict(self) -> Dict[str, Any]:
+        params = {k: v for k, v in self.params.items() if k != "n_estimators"}
+        return {"model": self.model, "params": params, "folds": len(self.folds), "auc": round(self.auc, 6), "trees": self.trees}
+
+
+def sample_configs(n: int, space: Dict[str, Dict[str, List[Any]]] = SPACE, seed: int = 0) -> List[Config]:
+    """The fixed candidates plus random draws from ``space``, without duplicates."""
+    configs: List[Config] = [(name, {**params, "n_estimators": MAX_TREES}) for name, params in CANDIDATES.items()]
+    seen = {json.dumps(c, sort_keys=True) for c in configs}
+    rng = np.random.default_rng(seed)
+    names = sorted(space)
+    for _ in range(50 * n):
+        if len(configs) >= n:
+            break
+        name = names[rng.integers(len(names))]
+        params = {k: v[rng.integers(len(v))] for k, v in space[name].items()}
+        params["n_estimators"] = MAX_TREES
+        key = json.dumps((name, params), sort_keys=True)
+        if key not in seen:
+            seen.add(key)
+            configs.append((name, params))
+    return configs
+
+
+def rungs(n_folds: int, eta: int) -> List[int]:
+    """Folds evaluated by the end of each rung, e.g. 5 folds, eta=3 -> [1, 3, 5]."""
+    out, r = [], 1
+    while r < n_folds:
+        out.append(r)
+        r *= eta
+    return out + [n_folds]
+
+
+def successive_halving(
+    x_path: str,
+    y_path: str,
+    folds: Dict[str, Sequence[Tuple[Rows, Rows]]],
+    labels: Dict[str, int],
+    configs: int = 16,
+    eta: int = 3,
+    budget_s: Optional[float] = None,
+    early_stopping: int = 50,
+    workers: int = 1,
+    threads: int = 1,
+    seed: int = 0,
+    clock: Callable[[], float] = time.monotonic,
+) -> Dict[str, Dict[str, Any]]:
+    """Per horizon: the winning ``model``/``params`` (``n_estimators`` from early stopping), its ``auc`` and the ``search`` log."""
+    eta = max(int(eta), 2)
+    t0 = clock()
+    trials = {h: [Trial(m, p) for m, p in sample_configs(configs, seed=seed)] for h in folds}
+    alive = {h: list(ts) for h, ts in trials.items()}
+    n_folds = min(len(f) for f in folds.values())
+    log: List[Dict[str, Any]] = []
+    stopped = False
+    for k, r in enumerate(rungs(n_folds, eta)):
+        if k and budget_s is not None and clock() - t0 >= budget_s:
+            stopped = True
+            break
+        batch: List[Tuple[Trial, int, Task]] = []
+        for h, ts in alive.items():
+            for trial in ts:
+                for i in range(r):
+                    if i not in trial.folds:
+                        tr, te = folds[h][i]
+                        task = Task(h, trial.model, trial.params, x_path, y_path, tr, te, fold=i,
+                                    label=labels[h], early_stopping=early_stopping)
+                        batch.append((trial, i, task))
+        started = clock()
+        for (trial, i, _), res in zip(batch, run_tasks([t for _, _, t in batch], workers, threads)):
+            trial.folds[i] = res
+        log.append({"folds": r, "configs": len(next(iter(alive.values()))), "fits": len(batch),
+                    "seconds": round(clock() - started, 3)})
+        if r < n_folds:
+            alive = {h: sorted(ts, key=lambda t: -t.auc)[: max(math.ceil(len(ts) / eta), 1)] for h, ts in alive.items()}
+
+    out = {}
+    for h, ts in trials.items():
+        depth = max(len(t.folds) for t in ts)
+        best = max((t for t in ts if len(t.folds) == depth), key=lambda t: t.auc)
+        out[h] = {
+            "model": best.model,
+            "params": {**best.params, "n_estimators": best.trees},
+            "auc": best.auc,
+            "search": {
+                "method": "successive_halving",
+                "eta": eta,
+                "early_stopping": early_stopping,
+                "budget_s": budget_s,
+                "elapsed_s": round(clock() - t0, 3),
+                "stopped_by_budget": stopped,
+                "rungs": log,
+                "trials": sorted((t.to_dict() for t in ts), key=lambda d: (-d["folds"], -d["auc"])),
+            },
+        }
+    return out
@@ -1,10 +1,12 @@
-import argparse, pathlib, json, numpy as np, pandas as pd, joblib
-from sklearn.metrics import roc_auc_score, brier_score_loss
-from sklearn.model_selection import TimeSeriesSplit
-from sklearn.preprocessing import StandardScaler
-from sklearn.pipeline import Pipeline
-from xgboost import XGBClassifier
-from lightgbm import LGBMClassifier
+import argparse, pathlib, json, tempfile, time, numpy as np, pandas as pd, joblib
+from contextlib import contextmanager
+from sklearn.metrics import brier_score_loss
+from models.artifact import save_native
+from models.registry import Registry
+from storage.candle_reader import read_candles
+from models.dataset import build_training_set
+from models.cv import CANDIDATES, Task, fold_rows, plan, run_tasks, share
+from models.search import successive_halving
 
 def rsi(series, n=14):
     delta = series.diff()
@@ -31,53 +33,134 @@ def target(df, horizon_bars):
     fut = df['c'].shift(-horizon_bars)
     return (fut > df['c']).astype(int)
 
-def load_parquet_dir(data_dir: pathlib.Path, symbol: str) -> pd.DataFrame:
-    base = data_dir / symbol
-    parts = list(base.rglob("*.parquet"))
-    if not parts:
-        raise FileNotFoundError(f"No Parquet under {base}")
-    dfs = [pd.read_parquet(p) for p in sorted(parts)]
-    return pd.concat(dfs, ignore_index=True).sort_values("ts")
+# What build_features reads; open/volume and the per-row string columns are never loaded.
+COLUMNS = ("ts","h","l","c")
+
+def load_parquet_dir(data_dir: pathlib.Path, symbol: str, start=None, end=None) -> pd.DataFrame:
+    df = read_candles(str(data_dir), symbol, start, end, columns=COLUMNS)
+    if df.empty:
+        raise FileNotFoundError(f"No Parquet under {pathlib.Path(data_dir) / symbol} for [{start}, {end}]")
+    return df
+
+FEATURES = ['ret1','ret5','vol20','rng','atr14','rsi14','tokyo','london','newyork']
+HORIZONS = {"30m": 6, "2h": 24}
+DEFAULT_SEARCH = {"configs": 16, "eta": 3, "budget_s": 1800.0, "early_stopping": 50}
+
+@contextmanager
+def _timed(stats, name):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        if stats is not None:
+            stages = stats.setdefault("stages", {})
+            stages[name] = stages.get(name, 0.0) + time.perf_counter() - t0
+
+def train_all(df, horizons=HORIZONS, workers=1, threads=1, n_splits=5, search=None, stats=None):
+    """Model selection + final fit for every horizon; fold/candidate/horizon tasks run in parallel.
+
+    Without ``search`` the fixed CANDIDATES are compared on every fold; with it (kwargs for
+    ``successive_halving``, e.g. ``{"configs": 16, "budget_s": 1800}``) configurations are searched.
+    A ``stats`` dict, when given, receives per-stage seconds and the number of model fits.
+    """
+    with _timed(stats, "build_features"):
+        x = build_features(df)
+    with _timed(stats, "labels"):
+        ds = build_training_set(x, horizons, FEATURES)
+    fits = 0
+    with tempfile.TemporaryDirectory(prefix="train-") as tmp:
+        with _timed(stats, "share"):
+            xp, yp = share(ds.X, f"{tmp}/X.npy"), share(ds.labels, f"{tmp}/labels.npy")
+        folds = {h: fold_rows(ds.rows(h), n_splits) for h in ds.horizons}
+        if search is not None:
+            with _timed(stats, "search"):
+                best = successive_halving(xp, yp, folds, {h: ds.index(h) for h in ds.horizons},
+                                          workers=workers, threads=threads, **search)
+            fits += sum(r["fits"] for r in next(iter(best.values()))["search"]["rungs"])
+        else:
+            tasks = [
+                Task(h, name, params, xp, yp, tr, te, fold=i, label=ds.index(h))
+                for h in ds.horizons
+                for name, params in CANDIDATES.items()
+                for i, (tr, te) in enumerate(folds[h])
+            ]
+            with _timed(stats, "cv"):
+                results = run_tasks(tasks, workers, threads)
+            fits += len(tasks)
+            aucs = {}
+            for t, res in zip(tasks, results):
+                aucs.setdefault((t.horizon, t.model), []).append(res["auc"])
+            best = {}
+            for (h, name), v in aucs.items():
+                if h not in best or np.mean(v) > best[h]["auc"]:
+                    best[h] = {"model": name, "params": CANDIDATES[name], "auc": float(np.mean(v))}
+        finals = [Task(h, best[h]["model"], best[h]["params"], xp, yp, (0, ds.rows(h)), label=ds.index(h)) for h in ds.horizons]
+        with _timed(stats, "final_fit"):
+            pipes = run_tasks(finals, workers, threads)
+        fits += len(finals)
+        out = {}
+        now = pd.Timestamp.now(tz="UTC").isoformat()
+        with _timed(stats, "score"):
+            for t, pipe in zip(finals, pipes):
+                X, y = ds.horizon(t.horizon)
+                brier = float(brier_score_loss(y, pipe.predict_proba(X)[:,1]))
+                meta = {"model":t.model,"auc":best[t.horizon]["auc"],"brier":brier,"features":FEATURES,"params":t.params,
+                        "trained_until":ds.last_ts(t.horizon),"full_trained_at":now}
+                if "search" in best[t.horizon]:
+                    meta["search"] = best[t.horizon]["search"]
+                out[t.horizon] = (pipe, meta)
+    if stats is not None:
+        stats["fits"] = stats.get("fits", 0) + fits
+        stats["rows"] = len(ds.X)
+    return out
+
+def version_name():
+    # Second resolution so same-day trainings (nightly full, hourly warm starts) never collide.
+    return pd.Timestamp.now(tz="UTC").strftime("%Y-%m-%dT%H%M%SZ")
+
+def save_version(out_dir, h, model, meta, version=None, promote=True):
+    """Write a complete version, index it and (by default) point CURRENT at it; returns its directory."""
+    reg = Registry(str(out_dir))
+    tmp = reg.stage(h)
+    try:
+        spec = {"horizon":h, **{k: v for k, v in meta.items() if k != "search"}}
+        save_native(model, str(tmp), spec)  # what the API loads
+        joblib.dump(model, tmp/"model.pkl")
+        (tmp/"feature_spec.json").write_text(json.dumps(spec, indent=2))
+        (tmp/"metadata.json").write_text(json.dumps({"horizon":h, **meta}, indent=2))  # + search trials
+    except BaseException:
+        reg.discard(tmp)
+        raise
+    return reg.add(h, tmp, version or version_name(), meta, promote=promote)
 
 def train_one(df, horizon_bars):
-    x = build_features(df)
-    y = target(x, horizon_bars)
-    x = x.iloc[:-horizon_bars]; y = y.iloc[:-horizon_bars]
-    feats = [c for c in x.columns if c not in ('ts','o','h','l','c','v')]
-    X = x[feats].values; yv = y.values
-    best_auc=-1; best=None; best_pipe=None
-    for name, clf in [
-        ("xgb", XGBClassifier(n_estimators=200, max_depth=4, learning_rate=0.1, subsample=0.8)),
-        ("lgbm", LGBMClassifier(n_estimators=400, learning_rate=0.05, subsample=0.8)),
-    ]:
-        pipe = Pipeline([("scaler", StandardScaler(with_mean=False)), ("clf", clf)])
-        tscv = TimeSeriesSplit(n_splits=5)
-        aucs=[]
-        for tr, te in tscv.split(X):
-            pipe.fit(X[tr], yv[tr]); p=pipe.predict_proba(X[te])[:,1]; aucs.append(roc_auc_score(yv[te], p))
-        auc=float(np.mean(aucs))
-        if auc>best_auc: best_auc=auc; best=name; best_pipe=pipe
-    best_pipe.fit(X, yv)
-    p = best_pipe.predict_proba(X)[:,1]
-    brier=float(brier_score_loss(yv, p))
-    meta={"model":best,"auc":best_auc,"brier":brier,"features":feats}
-    return best_pipe, meta
+    return train_all(df, {"h": horizon_bars})["h"]
 
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--data_dir", required=True)
     ap.add_argument("--symbol", default="GBPUSD")
     ap.add_argument("--out_dir", default="./models_registry/gbpusd")
+    ap.add_argument("--start", default=None, help="first candle date/time to train on (UTC, e.g. 2024-01-01)")
+    ap.add_argument("--end", default=None, help="last candle date/time to train on (UTC)")
+    ap.add_argument("--horizons", default=",".join(f"{h}={b}" for h, b in HORIZONS.items()), help="name=bars,...")
+    ap.add_argument("--no_promote", action="store_true", help="index the new versions without pointing CURRENT at them")
+    ap.add_argument("--workers", type=int, default=None, help="training processes (default: all cores)")
+    ap.add_argument("--threads", type=int, default=None, help="booster threads per task (default: cores / workers)")
+    ap.add_argument("--search_configs", type=int, default=DEFAULT_SEARCH["configs"], help="configurations per horizon for successive halving (0: fixed candidates)")
+    ap.add_argument("--search_eta", type=int, default=DEFAULT_SEARCH["eta"], help="keep the best 1/eta configurations per rung")
+    ap.add_argument("--search_budget_s", type=float, default=DEFAULT_SEARCH["budget_s"], help="stop starting new rungs after this many seconds")
+    ap.add_argument("--early_stopping", type=int, default=DEFAULT_SEARCH["early_stopping"], help="boosting rounds without validation improvement")
     args = ap.parse_args()
-    df = load_parquet_dir(pathlib.Path(args.data_dir), args.symbol)
-    for h, bars in [("30m",6),("2h",24)]:
-        model, meta = train_one(df, bars)
-        out = pathlib.Path(args.out_dir) / h / pd.Timestamp.utcnow().date().isoformat()
-        out.mkdir(parents=True, exist_ok=True)
-        joblib.dump(model, out/"model.pkl")
-        (out/"feature_spec.json").write_text(json.dumps({"horizon":h, **meta}, indent=2))
-        (out/"metadata.json").write_text(json.dumps({"horizon":h, **meta}, indent=2))
-        print("Saved", out)
+    df = load_parquet_dir(pathlib.Path(args.data_dir), args.symbol, args.start, args.end)
+    workers, threads = plan(workers=args.workers, threads=args.threads)
+    horizons = {h: int(b) for h, b in (p.split("=") for p in args.horizons.split(","))}
+    search = None
+    if args.search_configs > 0:
+        search = {"configs": args.search_configs, "eta": args.search_eta,
+                  "budget_s": args.search_budget_s, "early_stopping": args.early_stopping}
+    for h, (model, meta) in train_all(df, horizons, workers, threads, search=search).items():
+        print("Saved", save_version(args.out_dir, h, model, meta, promote=not args.no_promote))
 
 if __name__ == "__main__":
     main()
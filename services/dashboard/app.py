@@ -1,8 +1,10 @@
 import os
 import json
+import time
 from datetime import datetime
 
 import pandas as pd
+import pyarrow as pa
 import requests
 import streamlit as st
 
@@ -16,34 +18,65 @@ def fetch_latest_signal(api_base: str, horizon: str) -> dict:
     return r.json()
 
 
-def fetch_backtest(api_base: str, horizon: str, days: int) -> dict:
-    r = requests.post(
-        f"{api_base}/backtest/run",
-        json={"horizon": horizon, "days": days},
-        timeout=60,
-    )
+def fetch_backtest(api_base: str, horizon: str, days: int, wait_s: float = 600.0) -> dict:
+    # Submit as a job (cached/deduplicated server-side) and poll instead of holding one long request.
+    r = requests.post(f"{api_base}/backtest/jobs", json={"horizon": horizon, "days": days}, timeout=20)
     r.raise_for_status()
-    return r.json()
+    job = r.json()
+    deadline = time.monotonic() + wait_s
+    while job["status"] not in ("done", "failed"):
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"backtest job {job['job_id']} still {job['status']}")
+        time.sleep(1.0)
+        r = requests.get(f"{api_base}/backtest/jobs/{job['job_id']}", timeout=20)
+        r.raise_for_status()
+        job = r.json()
+    if job["status"] == "failed":
+        raise RuntimeError(job.get("error") or "backtest failed")
+    return job["result"]
+
+
+ARROW = "application/vnd.apache.arrow.stream"
 
 
-def fetch_history(api_base: str, horizon: str, days: int) -> dict:
+def _read_arrow(r: requests.Response) -> pd.DataFrame:
+    return pa.ipc.open_stream(r.content).read_pandas()
+
+
+def fetch_history(api_base: str, horizon: str, days: int, limit: int = 25) -> pd.DataFrame:
+    # Newest rows only; charts come from the pre-aggregated rollups.
     r = requests.get(
         f"{api_base}/signals/history",
-        params={"h": horizon, "days": int(days), "limit": 5000},
+        params={"h": horizon, "days": int(days), "limit": int(limit), "order": "desc"},
+        headers={"Accept": ARROW},
+        timeout=20,
+    )
+    r.raise_for_status()
+    return _read_arrow(r)
+
+
+def fetch_rollups(api_base: str, horizon: str, days: int) -> dict:
+    # Hourly buckets for short windows, daily beyond two weeks (~180 rows for 180 days).
+    bucket = "1h" if int(days) <= 14 else "1d"
+    r = requests.get(
+        f"{api_base}/signals/rollups",
+        params={"h": horizon, "days": int(days), "bucket": bucket},
         timeout=20,
     )
     r.raise_for_status()
     return r.json()
 
 
-def fetch_evaluate(api_base: str, horizon: str, days: int) -> dict:
+def fetch_evaluate(api_base: str, horizon: str, days: int):
+    """(summary, outcome rows) with the rows read straight into a DataFrame."""
     r = requests.get(
         f"{api_base}/signals/evaluate",
         params={"h": horizon, "days": int(days), "limit": 5000},
+        headers={"Accept": ARROW},
         timeout=30,
     )
     r.raise_for_status()
-    return r.json()
+    return json.loads(r.headers.get("X-Summary", "{}")), _read_arrow(r)
 
 
 st.set_page_config(page_title="GBPUSD Signal Dashboard", layout="wide")
@@ -108,24 +141,25 @@ st.divider()
 
 st.subheader("Signal history")
 try:
-    hist = fetch_history(api_base, horizon, int(hist_days))
-    rows = hist.get("rows", [])
-    if rows:
-        dfh = pd.DataFrame(rows)
-        dfh["asof_ts"] = pd.to_datetime(dfh["asof_ts"], utc=True, errors="coerce")
-        dfh = dfh.sort_values("asof_ts")
+    roll = fetch_rollups(api_base, horizon, int(hist_days))
+    rrows = roll.get("rows", [])
+    if rrows:
+        dfr = pd.DataFrame(rrows)
+        dfr["bucket_ts"] = pd.to_datetime(dfr["bucket_ts"], utc=True, errors="coerce")
+        dfr = dfr.sort_values("bucket_ts")
         c1, c2 = st.columns([0.65, 0.35])
         with c1:
-            st.write("P(up) over time")
-            if "prob_up" in dfh.columns:
-                st.line_chart(dfh.set_index("asof_ts")["prob_up"])
-            else:
-                st.info("No prob_up in stored rows.")
+            st.write(f"Mean P(up) per {roll.get('bucket', 'bucket')}")
+            st.line_chart(dfr.set_index("bucket_ts")["mean_prob_up"])
         with c2:
             st.write("Side counts")
-            st.dataframe(dfh["side"].value_counts(dropna=False).rename("count").to_frame())
-        st.write("Latest stored rows")
-        st.dataframe(dfh.tail(25), use_container_width=True)
+            counts = {"buy": int(dfr["n_buy"].sum()), "sell": int(dfr["n_sell"].sum())}
+            counts["other"] = int(dfr["n"].sum()) - counts["buy"] - counts["sell"]
+            st.dataframe(pd.Series(counts, name="count").to_frame())
+        dfh = fetch_history(api_base, horizon, int(hist_days))
+        if not dfh.empty:
+            st.write("Latest stored rows")
+            st.dataframe(dfh.sort_values("asof_ts"), use_container_width=True)
     else:
         st.info("No stored signals yet. Refresh 'Latest signal' a few times.")
 except Exception as e:
@@ -133,13 +167,9 @@ except Exception as e:
 
 st.subheader("Live vs realized (directional)")
 try:
-    ev = fetch_evaluate(api_base, horizon, int(hist_days))
-    s = ev.get("summary", {})
+    s, dfe = fetch_evaluate(api_base, horizon, int(hist_days))
     st.json(s)
-    ev_rows = ev.get("rows", [])
-    if ev_rows:
-        dfe = pd.DataFrame(ev_rows)
-        dfe["asof_ts"] = pd.to_datetime(dfe["asof_ts"], utc=True, errors="coerce")
+    if not dfe.empty:
         dfe = dfe.sort_values("asof_ts")
         if "hit" in dfe.columns:
             st.line_chart(dfe.set_index("asof_ts")["hit"].rolling(20, min_periods=1).mean())
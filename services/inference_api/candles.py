@@ -0,0 +1,120 @@
+"""Resident candle window per symbol/timeframe.
+
+The buffer is filled once from the newest ``dt=`` partitions and then advanced by
+re-reading only partition files whose (mtime, size) changed or that are new, found
+with one directory listing of ``<data_dir>/<symbol>/timeframe=<tf>``. The newest two
+partitions stay watched, so a late rewrite of the previous day is picked up too;
+re-read rows are merged by ``ts`` (the file's version wins). Handlers get the current
+snapshot without copying; an update builds a new frame and swaps the reference, so a
+snapshot a request already holds never changes underneath it.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import pathlib
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from storage.candle_reader import CANDLE_COLUMNS, read_partition
+
+logger = logging.getLogger(__name__)
+
+Stamp = Tuple[float, int]
+
+# Partitions whose files are re-checked: today's and the one before it.
+WATCH_PARTITIONS = 2
+
+
+class CandleBuffer:
+    def __init__(
+        self,
+        data_dir: str,
+        symbol: str,
+        timeframe: str = "1m",
+        max_rows: int = 20_000,
+        tail_partitions: int = 10,
+        check_every: float = 5.0,
+    ):
+        self.root = pathlib.Path(data_dir) / symbol / f"timeframe={timeframe}"
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.max_rows = int(max_rows)
+        self.tail_partitions = int(tail_partitions)
+        self.check_every = float(check_every)
+        self._df: Optional[pd.DataFrame] = None
+        self._files: Dict[str, Stamp] = {}
+        self._first_dt: Optional[str] = None
+        self._checked: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def frame(self) -> Optional[pd.DataFrame]:
+        """Current ts-sorted snapshot (treat as read-only), or None when there is no data."""
+        if self._checked is None or time.monotonic() - self._checked >= self.check_every:
+            self.refresh()
+        return self._df
+
+    def nbytes(self) -> int:
+        df = self._df
+        return int(df.memory_usage(index=True).sum()) if df is not None else 0
+
+    def refresh(self) -> int:
+        """Pick up new/changed partition files; returns the number of rows added."""
+        if not self._lock.acquire(blocking=self._df is None):
+            return 0  # another request is already refreshing
+        try:
+            self._checked = time.monotonic()
+            return self._advance()
+        finally:
+            self._lock.release()
+
+    def _dt_dirs(self) -> List[str]:
+        try:
+            return sorted(e.name for e in os.scandir(self.root) if e.is_dir() and e.name.startswith("dt="))
+        except FileNotFoundError:
+            return []
+
+    def _advance(self) -> int:
+        dirs = self._dt_dirs()
+        if self._first_dt is None:
+            dirs = dirs[-self.tail_partitions :]
+        else:
+            dirs = [d for d in dirs if d >= self._first_dt]
+        changed: List[str] = []
+        for d in dirs:
+            for e in os.scandir(self.root / d):
+                if not e.name.endswith(".parquet"):
+                    continue
+                st = e.stat()
+                stamp = (st.st_mtime, st.st_size)
+                if self._files.get(e.path) != stamp:
+                    self._files[e.path] = stamp
+                    changed.append(e.path)
+        if dirs:
+            watched = dirs[-WATCH_PARTITIONS:]
+            self._first_dt = watched[0]
+            # Older partitions are final; forget their stamps.
+            self._files = {p: s for p, s in self._files.items() if any(f"{os.sep}{d}{os.sep}" in p for d in watched)}
+        if not changed:
+            return 0
+
+        new = pd.concat([self._read(p) for p in sorted(changed)], ignore_index=True)
+        old = self._df
+        merged = new if old is None else pd.concat([old, new], ignore_index=True)
+        # Rewritten bars replace the resident ones; rows are re-sorted so late rows land in place.
+        merged = merged.drop_duplicates("ts", keep="last").sort_values("ts", kind="stable")
+        added = len(merged) - (len(old) if old is not None else 0)
+        if merged.empty:
+            return 0
+        self._df = merged.tail(self.max_rows).reset_index(drop=True)
+        logger.debug("candle buffer %s/%s +%d rows (%d re-read)", self.symbol, self.timeframe, added, len(new))
+        return added
+
+    @staticmethod
+    def _read(path: str) -> pd.DataFrame:
+        # Skips the per-row symbol/timeframe/source strings.
+        return read_partition(path, CANDLE_COLUMNS)
@@ -0,0 +1,96 @@
+"""Content-negotiated tabular responses.
+
+Row-oriented endpoints can answer with the default JSON document or with a body
+produced straight from an Arrow table: NDJSON (one object per line, serialized per
+batch by pandas' C encoder), an Arrow IPC stream, or Parquet. Pick the format with
+``?format=`` or the ``Accept`` header; response metadata that does not fit in the
+table (cursors, summaries) travels in ``X-`` headers.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+from typing import Any, Dict, Iterator, Optional
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+MEDIA_TYPES = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+BATCH_ROWS = 5000
+
+
+def negotiate(accept: Optional[str], fmt: Optional[str] = None) -> str:
+    """Response format name from an explicit ``format`` or the Accept header (JSON by default)."""
+    if fmt:
+        if fmt not in MEDIA_TYPES:
+            raise HTTPException(status_code=400, detail=f"unknown format {fmt!r}; expected one of {sorted(MEDIA_TYPES)}")
+        return fmt
+    for part in (accept or "").split(","):
+        media = part.split(";")[0].strip().lower()
+        for name, mt in MEDIA_TYPES.items():
+            if media == mt:
+                return name
+    return "json"
+
+
+def meta_headers(**values: Any) -> Dict[str, str]:
+    """``X-Next-Cursor``-style headers; dicts are JSON-encoded, None values dropped."""
+    out = {}
+    for k, v in values.items():
+        if v is None:
+            continue
+        name = "X-" + "-".join(w.capitalize() for w in k.split("_"))
+        out[name] = json.dumps(v, separators=(",", ":")) if isinstance(v, (dict, list)) else str(v)
+    return out
+
+
+def respond(table: pa.Table, fmt: str, headers: Optional[Dict[str, str]] = None) -> StreamingResponse:
+    body = {"ndjson": ndjson_chunks, "arrow": arrow_chunks, "parquet": parquet_chunks}[fmt](table)
+    return StreamingResponse(body, media_type=MEDIA_TYPES[fmt], headers=headers)
+
+
+def ndjson_chunks(table: pa.Table, batch_rows: int = BATCH_ROWS) -> Iterator[bytes]:
+    for batch in table.to_batches(max_chunksize=batch_rows):
+        if batch.num_rows:
+            yield batch.to_pandas().to_json(orient="records", lines=True, date_format="iso", date_unit="us").encode()
+
+
+class _Chunks(io.RawIOBase):
+    def __init__(self) -> None:
+        self.parts = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self.parts.append(bytes(b))
+        return len(b)
+
+    def drain(self) -> bytes:
+        out = b"".join(self.parts)
+        self.parts.clear()
+        return out
+
+
+def arrow_chunks(table: pa.Table, batch_rows: int = BATCH_ROWS) -> Iterator[bytes]:
+    sink = _Chunks()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        for batch in table.to_batches(max_chunksize=batch_rows):
+            writer.write_batch(batch)
+            yield sink.drain()
+    yield sink.drain()
+
+
+def parquet_chunks(table: pa.Table) -> Iterator[bytes]:
+    # The footer needs every row group, so Parquet goes out as one piece.
+    buf = io.BytesIO()
+    pq.write_table(table, buf, compression="zstd")
+    yield buf.getvalue()
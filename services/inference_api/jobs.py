@@ -0,0 +1,173 @@
+"""Background job registry for long-running API work (backtests).
+
+``submit`` returns immediately with a ``Job`` that clients poll (or stream) by id.
+Results are memoized per key for ``ttl`` seconds in an LRU of ``max_results``
+entries; callers put the data version into the key so new candles miss the cache.
+A submission whose key matches a job still running is attached to that job rather
+than starting another. Jobs complete through future callbacks, so they do not
+depend on any particular event loop; async handlers await ``Job.wait_async``, which
+parks on their own loop instead of holding an executor thread while a backtest runs.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from services.inference_api.workers import WorkerPool
+
+TERMINAL = ("done", "failed")
+
+
+@dataclass
+class Job:
+    id: str
+    key: Hashable
+    created_at: float
+    status: str = "queued"
+    cached: bool = False
+    finished_at: Optional[float] = None
+    result: Any = None
+    error: Optional[str] = None
+    _future: Optional[Future] = field(default=None, repr=False)
+    _done: threading.Event = field(default_factory=threading.Event, repr=False)
+    _waiters: List[Callable[[], None]] = field(default_factory=list, repr=False)
+    _waiters_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def state(self) -> str:
+        if self.status == "queued" and self._future is not None and self._future.running():
+            return "running"
+        return self.status
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    async def wait_async(self, timeout: Optional[float] = None) -> bool:
+        """``wait`` for coroutines: no thread is held while the job runs."""
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+
+        def wake() -> None:
+            loop.call_soon_threadsafe(lambda: fut.done() or fut.set_result(True))
+
+        with self._waiters_lock:
+            if self._done.is_set():
+                return True
+            self._waiters.append(wake)
+        try:
+            await asyncio.wait_for(fut, timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            with self._waiters_lock:
+                if wake in self._waiters:
+                    self._waiters.remove(wake)
+
+    def _set_done(self) -> None:
+        with self._waiters_lock:
+            self._done.set()
+            waiters, self._waiters = self._waiters, []
+        for wake in waiters:
+            try:
+                wake()
+            except RuntimeError:
+                pass  # the waiter's loop is already closed
+
+    def to_dict(self, now: float) -> Dict[str, Any]:
+        out = {
+            "job_id": self.id,
+            "status": self.state(),
+            "cached": self.cached,
+            "elapsed_s": round((self.finished_at or now) - self.created_at, 3),
+        }
+        if self.status == "done":
+            out["result"] = self.result
+        elif self.status == "failed":
+            out["error"] = self.error
+        return out
+
+
+class JobManager:
+    def __init__(
+        self,
+        pool: WorkerPool,
+        ttl: float = 900.0,
+        max_results: int = 32,
+        max_jobs: int = 256,
+        clock: Callable[[], float] = time.monotonic,
+        on_finish: Optional[Callable[[Job], None]] = None,
+    ):
+        self.pool = pool
+        self.ttl = float(ttl)
+        self.max_results = int(max_results)
+        self.max_jobs = int(max_jobs)
+        self.clock = clock
+        self.on_finish = on_finish
+        self.hits = 0
+        self.joined = 0
+        self.misses = 0
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._active: Dict[Hashable, Job] = {}
+        self._results: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, key: Hashable, fn: Callable[..., Any], *args: Any) -> Job:
+        """Cached, in-flight or new job for ``key``; raises ``Saturated`` when the pool is full."""
+        with self._lock:
+            now = self.clock()
+            hit = self._results.get(key)
+            if hit is not None and now - hit[0] <= self.ttl:
+                self._results.move_to_end(key)
+                self.hits += 1
+                job = Job(id=uuid.uuid4().hex, key=key, created_at=now, status="done", cached=True,
+                          finished_at=now, result=hit[1])
+                job._set_done()
+                return self._track(job)
+            self._results.pop(key, None)
+            job = self._active.get(key)
+            if job is not None:
+                self.joined += 1
+                return job
+            job = Job(id=uuid.uuid4().hex, key=key, created_at=now)
+            job._future = self.pool.submit(fn, *args)
+            self.misses += 1
+            self._active[key] = self._track(job)
+        job._future.add_done_callback(lambda fut: self._finish(job, fut))
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def _track(self, job: Job) -> Job:
+        self._jobs[job.id] = job
+        while len(self._jobs) > self.max_jobs:
+            oldest = next(iter(self._jobs.values()))
+            if oldest.status not in TERMINAL:
+                break
+            self._jobs.popitem(last=False)
+        return job
+
+    def _finish(self, job: Job, fut: Future) -> None:
+        with self._lock:
+            job.finished_at = self.clock()
+            try:
+                job.result = fut.result()
+                job.status = "done"
+                self._results[job.key] = (job.finished_at, job.result)
+                self._results.move_to_end(job.key)
+                while len(self._results) > self.max_results:
+                    self._results.popitem(last=False)
+            except Exception as e:
+                job.error = f"{type(e).__name__}: {e}"
+                job.status = "failed"
+            self._active.pop(job.key, None)
+        if self.on_finish is not None:
+            self.on_finish(job)
+        job._set_done()
@@ -1,12 +1,31 @@
-from fastapi import FastAPI
+import time
+_T0 = time.perf_counter()  # start of the module-import startup phase
+from fastapi import FastAPI, Header, HTTPException, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 from datetime import datetime
-import pandas as pd, numpy as np, pathlib, glob, joblib, os, json
+from typing import Dict, List, Optional
+import pandas as pd, numpy as np, os, asyncio, json, logging
+import pyarrow as pa
 from models.toy_model import score_dummy
 from lib.sessions import session_flags
-from backtest.engine import monthly_walkforward
 from functools import lru_cache
-from storage.db_store import get_store
+from contextlib import asynccontextmanager
+from storage.db_store import get_store, iso_z
+from services.inference_api.model_cache import ModelCache
+from services.inference_api.symbols import SymbolRegistry
+from services.inference_api.candles import CandleBuffer
+from services.inference_api.scoring import FeatureState, PayloadMemo, score_row
+from services.inference_api.scheduler import BarScheduler
+from services.inference_api.workers import Saturated, WorkerPool
+from services.inference_api.jobs import TERMINAL, JobManager
+from services.inference_api.encoding import meta_headers, negotiate, respond
+from services.inference_api.pubsub import Broker, topic
+from services.inference_api.metrics import REGISTRY as METRICS, STAGE_SECONDS, MetricsMiddleware, stage
+from services.inference_api.startup import StartupProfile
+from services.outcomes import OutcomeJob
+
+logger = logging.getLogger(__name__)
 
 
 @lru_cache(maxsize=1)
@@ -15,11 +34,103 @@ def _store():
     return get_store()
 
 REGISTRY = os.getenv("MODEL_REGISTRY", "./models_registry/gbpusd")
+# Any symbol is served from <root>/<symbol>/<horizon>/<version>; MODEL_REGISTRY stays SYMBOL's registry.
+REGISTRY_ROOT = os.getenv("MODEL_REGISTRY_ROOT", os.path.dirname(os.path.normpath(REGISTRY)))
+# The resident LRU shares the container with the interpreter, worker processes and request
+# buffers, so by default it gets RESIDENT_SHARE of TASK_MEMORY_MB rather than all of it.
+RESIDENT_SHARE = 0.6
+TASK_MEMORY_MB = float(os.getenv("TASK_MEMORY_MB", "1024"))
+RESIDENT_MB = float(os.getenv("RESIDENT_MEMORY_MB", str(TASK_MEMORY_MB * RESIDENT_SHARE)))
 DATA_DIR = os.getenv("DATA_DIR", "./data/market_candles")
 SYMBOL = os.getenv("SYMBOL", "GBPUSD")
 BAR_MINUTES = int(os.getenv("BAR_MINUTES", "5"))
+SYMBOLS = tuple(x.strip() for x in os.getenv("SYMBOLS", SYMBOL).split(",") if x.strip())
+MAX_BATCH = int(os.getenv("SIGNAL_BATCH_MAX", "64"))
+HORIZONS = tuple(h.strip() for h in os.getenv("SIGNAL_HORIZONS", "30m,2h").split(",") if h.strip())
+# Matured signals get their realized outcome this often (0 disables; cli/evaluate_signals.py does the same once).
+OUTCOME_EVERY = float(os.getenv("OUTCOME_EVERY_SECONDS", str(BAR_MINUTES * 60)))
+
+_startup = StartupProfile()
+
+def _check_db():
+    _store().init()
+    with _store().engine.connect() as conn:
+        conn.exec_driver_sql("SELECT 1")
+
+def _load_models(sym: str):
+    cache = _model_cache(sym)
+    for h in HORIZONS:
+        if cache.error(h):
+            cache.invalidate(h)  # a retry re-checks the registry instead of waiting out check_every
+        if cache.get(h) is None and cache.error(h):
+            # An artifact exists but is unreadable (e.g. still syncing): not ready, retry later.
+            raise RuntimeError(f"model {sym}/{h} failed to load: {cache.error(h)}")
+
+def _first_signals():
+    if _scheduler_enabled():
+        _scheduler.tick()
+    else:
+        # Score once without publishing: nothing would refresh a published entry.
+        for sym in SYMBOLS:
+            _signals(sym, list(HORIZONS))
+
+def _warm_up_steps():
+    """Pay the first-request costs up front: DB, candle windows, model unpickling, first scores."""
+    steps = [("db", _check_db)]
+    for sym in SYMBOLS:
+        steps.append((f"candles:{sym}", lambda sym=sym: _candles(sym).refresh()))
+        steps.append((f"models:{sym}", lambda sym=sym: _load_models(sym)))
+    steps.append(("signals", _first_signals))
+    return steps
+
+def _scheduler_enabled() -> bool:
+    return os.getenv("SIGNAL_SCHEDULER", "1") == "1"
+
+async def _start():
+    failed = await asyncio.to_thread(_startup.run, _warm_up_steps())
+    _startup.finish()
+    if _scheduler_enabled():
+        _scheduler.start()
+    # Failed phases are retried (backoff capped at WARMUP_RETRY_MAX_SECONDS) until /ready can flip;
+    # outcomes start after the first pass so the schema normally exists. Both end with this task.
+    loops = [_startup.retry(failed, cap=float(os.getenv("WARMUP_RETRY_MAX_SECONDS", "60")))] if failed else []
+    if OUTCOME_EVERY > 0:
+        loops.append(_outcome_loop(OUTCOME_EVERY))
+    await asyncio.gather(*loops)
+
+def _evaluate_outcomes() -> dict:
+    """Persist outcomes of newly matured signals for every symbol with stored signals.
+
+    Symbols served lazily via ``?symbol=`` persist signals too, so the list comes from
+    the store rather than ``SYMBOLS``.
+    """
+    timeframe = f"{BAR_MINUTES}m"
+    symbols = dict.fromkeys([*SYMBOLS, *_store().signal_symbols(timeframe)])
+    return {
+        sym: OutcomeJob(store=_store(), data_dir=DATA_DIR, symbol=sym, timeframe=timeframe, horizons=HORIZONS).run()
+        for sym in symbols
+    }
 
-app = FastAPI(title="GBPUSD Signal & Trade Assist - Inference API")
+async def _outcome_loop(every: float):
+    while True:
+        try:
+            await asyncio.to_thread(_evaluate_outcomes)
+        except Exception:
+            logger.exception("outcome evaluation failed")
+        await asyncio.sleep(every)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    _startup.record("import", _IMPORTED - _T0)
+    # Warm up in the background: /health answers at once, /ready once warm.
+    warm = asyncio.create_task(_start())
+    yield
+    warm.cancel()
+    await _scheduler.stop()
+    _heavy.shutdown(); _light.shutdown()
+
+app = FastAPI(title="GBPUSD Signal & Trade Assist - Inference API", lifespan=lifespan)
+app.add_middleware(MetricsMiddleware)
 
 class OrderSuggestion(BaseModel):
     entry_type: str
@@ -29,26 +140,53 @@ class OrderSuggestion(BaseModel):
     size: int
     tif: str
 
-def _latest_artifacts(h: str):
-    pattern = f"{REGISTRY}/{h}/*/model.pkl"
-    files = sorted(glob.glob(pattern))
-    if not files: return None, None
-    return files[-1], files[-1].replace("model.pkl","feature_spec.json")
-
-def _load_recent_parquet():
-    base = pathlib.Path(DATA_DIR) / SYMBOL
-    parts = sorted(base.rglob("*.parquet"))[-10:]
-    if not parts:
+# Heavy work (backtest, evaluate) runs in its own process pool and batch scoring in a small
+# thread lane, both with admission control, so a burst cannot starve /signals/latest or /health.
+_heavy = WorkerPool("heavy", int(os.getenv("API_HEAVY_WORKERS", "2")), int(os.getenv("API_HEAVY_QUEUE", "4")))
+_light = WorkerPool("batch", int(os.getenv("API_BATCH_WORKERS", "2")), int(os.getenv("API_BATCH_QUEUE", "8")), processes=False)
+
+async def _offload(pool: WorkerPool, fn, *args):
+    try:
+        return await pool.run(fn, *args)
+    except Saturated as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"})
+
+# Models and candle windows load per symbol on first use and stay resident (LRU within
+# RESIDENT_MEMORY_MB); each registry is re-checked at most every MODEL_CHECK_SECONDS.
+_symbols = SymbolRegistry(
+    REGISTRY_ROOT, DATA_DIR, budget_bytes=int(RESIDENT_MB * 2**20), overrides={SYMBOL: REGISTRY}, pinned=SYMBOLS,
+    model_check_every=float(os.getenv("MODEL_CHECK_SECONDS", "30")),
+    candle_rows=int(os.getenv("CANDLE_BUFFER_ROWS", "20000")),
+)
+
+def _model_cache(symbol: str) -> ModelCache:
+    return _symbols.get(symbol).models
+
+def _candles(symbol: str = SYMBOL) -> CandleBuffer:
+    return _symbols.get(symbol).candles
+
+def _check_symbol(symbol: str) -> None:
+    if not _symbols.known(symbol):
+        raise HTTPException(status_code=404, detail=f"unknown symbol {symbol!r}")
+
+# Last-bar feature vector per symbol and computed payloads per (symbol, h, bar, model).
+_features = FeatureState()
+_memo = PayloadMemo()
+# New signals fan out to /signals/stream and /signals/ws subscribers once per bar.
+_broker = Broker(replay=int(os.getenv("SIGNAL_REPLAY", "10")), queue_size=int(os.getenv("SIGNAL_SUBSCRIBER_QUEUE", "32")))
+
+def _load_recent_parquet(symbol: str = SYMBOL):
+    """Resident candle window (read-only view); synthetic candles when no data exists."""
+    df = _candles(symbol).frame()
+    if df is None:
         np.random.seed(42)
         c = np.cumsum(np.random.randn(500))/10000 + 1.27
         df = pd.DataFrame({"o":c,"h":c+np.abs(np.random.randn(500))*0.0005,"l":c-np.abs(np.random.randn(500))*0.0005,"c":c})
         df['ts'] = pd.date_range(end=pd.Timestamp.utcnow(), periods=len(df), freq='T', tz='UTC')
-        return df
-    dfs = [pd.read_parquet(p) for p in parts]
-    return pd.concat(dfs, ignore_index=True).sort_values("ts")
+    return df
 
 def _build_features(df: pd.DataFrame):
-    x = df.copy().sort_values('ts').tail(500)
+    x = df.tail(500).copy()
     x['ret1'] = x['c'].pct_change()
     x['ret5'] = x['c'].pct_change(5)
     x['vol20'] = x['c'].pct_change().rolling(20).std()
@@ -68,45 +206,109 @@ def rsi(series: pd.Series, n: int = 14) -> pd.Series:
     rs = gain / (loss + 1e-12)
     return 100 - (100 / (1 + rs))
 
+_LATEST = METRICS.counter("signals_latest_total", "/signals/latest responses by source.", ["source"])
+
+
+def _ratio(hits: float, misses: float) -> float:
+    return hits / (hits + misses) if hits + misses else 0.0
+
+
+@app.get("/metrics")
+def metrics():
+    """Prometheus text exposition of stage timings, request counts and cache hit ratios."""
+    return PlainTextResponse(METRICS.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/health")
 def health():
     return {"status": "ok", "time": datetime.utcnow().isoformat()}
 
+@app.get("/ready")
+def ready():
+    """Readiness: 503 until the warm-up phases finished (per-phase timings included)."""
+    body = _startup.as_dict()
+    return body if _startup.ready else JSONResponse(body, status_code=503)
+
 @app.get("/signals/latest")
-def latest(h: str = "30m"):
+def latest(h: str = "30m", symbol: str = SYMBOL):
+    _check_symbol(symbol)
+    now = datetime.utcnow()
+    # Precomputed at bar close when the scheduler is running; on-demand otherwise.
+    payload = _scheduler.get(symbol, h)
+    _LATEST.inc(source="precomputed" if payload is not None else "on_demand")
+    payload = payload or _signal(h, symbol)
+    return {**payload, "now": now.isoformat(), "session": session_flags(now)}
+
+
+def _signal(h: str, symbol: str = SYMBOL) -> dict:
+    """Signal for the newest bar; scored and persisted once per (bar, model version)."""
+    return _signals(symbol, [h])[0]
+
+
+def _signals(symbol: str, horizons: List[str]) -> List[dict]:
+    """Newest-bar signals of one symbol for several horizons."""
+    return _signals_many({symbol: horizons})[symbol]
+
+
+def _signals_many(todo: Dict[str, List[str]]) -> Dict[str, List[dict]]:
+    """Newest-bar signals for several symbols, each for several horizons.
+
+    Per symbol, candles and the feature vector are shared across horizons and each
+    model scores one row; all newly computed payloads are persisted in one write.
+    """
     now = datetime.utcnow(); sess = session_flags(now)
-    model_pkl, meta_json = _latest_artifacts(h if h in ("30m","2h") else "30m")
-    df = _load_recent_parquet()
-    asof_ts = df.sort_values("ts")["ts"].iloc[-1]
+    out: Dict[str, List[dict]] = {}
+    new = []
+    for symbol, horizons in todo.items():
+        with stage("candles"):
+            df = _load_recent_parquet(symbol)
+        with stage("features"):
+            asof_ts, feats = _features.latest(symbol, df)
+        out[symbol] = []
+        for h in horizons:
+            with stage("model_load"):
+                loaded = _model_cache(symbol).get(h if h in ("30m","2h") else "30m")
+            key = (symbol, h, asof_ts, loaded.version if loaded is not None and feats is not None else "toy")
+            payload = _memo.get(key)
+            if payload is None:
+                with stage("predict"):
+                    payload = _payload(symbol, h, asof_ts, df, feats, None if key[-1] == "toy" else loaded, now, sess)
+                new.append((key, payload))
+            out[symbol].append(payload)
+    if new:
+        with stage("persist"):
+            _store().upsert_signals([p for _, p in new])
+        for key, payload in new:
+            _memo.put(key, payload)
+            _broker.publish(topic(key[0], key[1]), payload)
+    return out
+
+
+def _payload(symbol, h, asof_ts, df, feats, loaded, now, sess) -> dict:
     timeframe = f"{BAR_MINUTES}m"
-    if not model_pkl:
+    if loaded is None:
         s = score_dummy(df.tail(200), horizon=h)
-        payload = {
+        return {
             "now": now.isoformat(),
             "asof_ts": asof_ts.isoformat(),
-            "symbol": SYMBOL,
+            "symbol": symbol,
             "timeframe": timeframe,
             "horizon": h,
             **s,
             "session": sess,
             "source": "toy",
         }
-        _store().upsert_signal(payload)
-        return payload
-    model = joblib.load(model_pkl); meta = json.load(open(meta_json))
-    X = _build_features(df); feats = [f for f in meta["features"] if f in X.columns]
-    Xn = X[feats].values
-    p = float(model.predict_proba(Xn)[-1,1])
-    price = float(X['c'].iloc[-1]); atr = float((X['rng'].rolling(14).mean().iloc[-1]))
+    p = score_row(loaded.model, feats, loaded.meta["features"])
+    price = feats["c"]; atr = feats["atr14"]
     d_sl = max(atr*0.8, 0.0008); rr = 1.4
     if p >= 0.5:
         entry_type="stop"; entry_px=price+0.5*d_sl; sl_px=entry_px-d_sl; tp_px=entry_px+rr*d_sl; side="buy"
     else:
         entry_type="stop"; entry_px=price-0.5*d_sl; sl_px=entry_px+d_sl; tp_px=entry_px-rr*d_sl; side="sell"
-    payload = {
+    return {
         "now": now.isoformat(),
         "asof_ts": asof_ts.isoformat(),
-        "symbol": SYMBOL,
+        "symbol": symbol,
         "timeframe": timeframe,
         "horizon": h,
         "prob_up": p,
@@ -123,106 +325,217 @@ def latest(h: str = "30m"):
             "tif": "GTD-5m",
         },
         "source": "registry",
+        "model_version": loaded.version,
     }
-    _store().upsert_signal(payload)
-    return payload
+
+
+def _precompute(symbol: str, horizons: List[str]) -> List[dict]:
+    # One candle refresh, feature build and write per symbol and bar, shared by every horizon.
+    _candles(symbol).refresh()
+    return _signals(symbol, horizons)
+
+
+_scheduler = BarScheduler(_precompute, SYMBOLS, HORIZONS, BAR_MINUTES)
+
+
+class SignalPair(BaseModel):
+    symbol: str = SYMBOL
+    horizon: str = "30m"
+
+
+class BatchRequest(BaseModel):
+    pairs: List[SignalPair]
+
+
+@app.post("/signals/batch")
+async def batch(req: BatchRequest):
+    """Latest signals for several symbol/horizon pairs in one call (request order kept)."""
+    if len(req.pairs) > MAX_BATCH:
+        raise HTTPException(status_code=400, detail=f"at most {MAX_BATCH} pairs per batch")
+    unknown = sorted(s for s in {p.symbol for p in req.pairs} if not _symbols.known(s))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"unknown symbols: {unknown}")
+    pairs = [(p.symbol, p.horizon) for p in req.pairs]
+    return await _offload(_light, _batch_signals, pairs)
+
+
+def _batch_signals(pairs):
+    now = datetime.utcnow()
+    found, todo = {}, {}
+    for k in dict.fromkeys(pairs):
+        hit = _scheduler.get(*k)
+        if hit is not None:
+            found[k] = hit
+        else:
+            todo.setdefault(k[0], []).append(k[1])
+    # Every symbol's new payloads go to the store in one write.
+    for sym, sigs in _signals_many(todo).items():
+        found.update(((sym, h), s) for h, s in zip(todo[sym], sigs))
+    extra = {"now": now.isoformat(), "session": session_flags(now)}
+    out = [{**found[k], **extra} for k in pairs]
+    return {"count": len(out), "signals": out}
+
+
+def _topics(topics: Optional[str]) -> List[str]:
+    names = [t.strip() for t in topics.split(",") if t.strip()] if topics else [topic(SYMBOL, h) for h in HORIZONS]
+    for name in names:
+        sym, _, h = name.partition(":")
+        if not h:
+            raise HTTPException(status_code=400, detail=f"topic {name!r} must be SYMBOL:HORIZON")
+        _check_symbol(sym)
+    return names
+
+
+@app.get("/signals/stream")
+async def stream_signals(topics: Optional[str] = None, replay: int = 1, heartbeat: float = 15.0,
+                         limit: Optional[int] = None):
+    """Server-Sent Events: one ``signal`` event per new bar and topic (``SYMBOL:HORIZON``, comma-separated).
+
+    The last ``replay`` signals per topic are sent on connect; ``limit`` closes the
+    stream after that many events.
+    """
+    sub = _broker.subscribe(_topics(topics), replay)
+
+    async def events():
+        sent = 0
+        try:
+            while limit is None or sent < limit:
+                msg = await sub.get(timeout=max(heartbeat, 0.1))
+                if msg is None:
+                    yield ": ping\n\n"
+                    continue
+                yield f"id: {msg['seq']}\nevent: signal\ndata: {json.dumps(msg)}\n\n"
+                sent += 1
+        finally:
+            _broker.unsubscribe(sub)
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@app.websocket("/signals/ws")
+async def signals_ws(ws: WebSocket, topics: Optional[str] = None, replay: int = 1, limit: Optional[int] = None):
+    """WebSocket variant of ``/signals/stream``: one JSON message per new signal."""
+    try:
+        names = _topics(topics)
+    except HTTPException as e:
+        await ws.close(code=1008, reason=str(e.detail))
+        return
+    await ws.accept()
+    sub = _broker.subscribe(names, replay)
+    sent = 0
+    try:
+        while limit is None or sent < limit:
+            msg = await sub.get()
+            await ws.send_json(msg)
+            sent += 1
+        await ws.close()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        _broker.unsubscribe(sub)
+
+
+HISTORY_FIELDS = (
+    "asof_ts", "horizon", "symbol", "timeframe", "side", "prob_up",
+    "expected_move", "entry_px", "sl_px", "tp_px", "source",
+)
 
 
 @app.get("/signals/history")
-def history(days: int = 30, h: str = "30m", limit: int = 2000):
+def history(days: int = 30, h: str = "30m", limit: int = 2000, cursor: Optional[str] = None,
+            fields: Optional[str] = None, layout: str = "rows", order: str = "asc",
+            fmt: Optional[str] = Query(None, alias="format"), accept: Optional[str] = Header(None),
+            symbol: str = SYMBOL):
     """Historical signals captured by /signals/latest.
 
-    Returns an ordered list suitable for charting.
+    Returns an ordered list suitable for charting. Pass ``next_cursor`` back as
+    ``cursor`` to page forward; ``fields`` is a comma-separated projection,
+    ``layout=columns`` returns one array per field instead of row objects and
+    ``order=desc`` walks newest-first. NDJSON, Arrow IPC and Parquet bodies are
+    available via ``format=`` or ``Accept`` (cursor in ``X-Next-Cursor``).
     """
-    rows = _store().fetch_signals(days=days, horizon=h, symbol=SYMBOL, timeframe=f"{BAR_MINUTES}m", limit=limit)
-    # keep payload lightweight by default
-    out = [
-        {
-            "asof_ts": r["asof_ts"],
-            "horizon": r["horizon"],
-            "symbol": r["symbol"],
-            "timeframe": r["timeframe"],
-            "side": r.get("side"),
-            "prob_up": r.get("prob_up"),
-            "expected_move": r.get("expected_move"),
-            "entry_px": r.get("entry_px"),
-            "sl_px": r.get("sl_px"),
-            "tp_px": r.get("tp_px"),
-            "source": r.get("source"),
-        }
-        for r in rows
-    ]
-    return {"count": len(out), "rows": out}
+    fmt = negotiate(accept, fmt)
+    wanted = tuple(f.strip() for f in fields.split(",") if f.strip()) if fields else HISTORY_FIELDS
+    try:
+        page = _store().query_signals(fields=wanted, days=days, horizon=h, symbol=symbol,
+                                      timeframe=f"{BAR_MINUTES}m", limit=limit, cursor=cursor,
+                                      newest_first=(order == "desc"))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if fmt != "json":
+        return respond(page.to_arrow(), fmt, meta_headers(next_cursor=page.next_cursor))
+    if layout == "columns":
+        cols = page.columns()
+        for f in ("asof_ts", "created_at"):
+            if f in cols:
+                cols[f] = [iso_z(t) for t in cols[f]]
+        return {"count": len(page), "columns": cols, "next_cursor": page.next_cursor}
+    out = page.records()
+    return {"count": len(out), "rows": out, "next_cursor": page.next_cursor}
+
+
+@app.get("/signals/rollups")
+def rollups(days: int = 30, h: str = "30m", bucket: str = "1h", symbol: str = SYMBOL):
+    """Pre-aggregated hourly/daily signal stats (counts by side, mean P(up), hit-rate/Brier)."""
+    try:
+        rows = _store().fetch_rollups(days=days, horizon=h, symbol=symbol, timeframe=f"{BAR_MINUTES}m", bucket=bucket)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"count": len(rows), "bucket": bucket, "rows": rows}
 
 
 @app.get("/signals/evaluate")
-def evaluate(days: int = 30, h: str = "30m", limit: int = 2000):
+async def evaluate(days: int = 30, h: str = "30m", limit: int = 2000, cursor: Optional[str] = None,
+                   fmt: Optional[str] = Query(None, alias="format"), accept: Optional[str] = Header(None),
+                   symbol: str = SYMBOL):
     """Compare stored signals to realized outcomes on the candle series.
 
     This is a lightweight 'live-vs-realized' check for the dashboard.
     It does NOT re-run training; it only checks whether the *direction* implied by the
-    signal was correct after the horizon.
+    signal was correct after the horizon. Outcomes are materialized by the API's outcome
+    loop (or ``cli/evaluate_signals.py``) once each horizon has elapsed, so this is an indexed read.
+    Non-JSON formats carry the rows in the body and the summary in ``X-Summary``.
     """
-    h = h if h in ("30m", "2h") else "30m"
-    horizon_minutes = 30 if h == "30m" else 120
-    horizon_bars = max(1, int(round(horizon_minutes / max(BAR_MINUTES, 1))))
+    fmt = negotiate(accept, fmt)
+    db_url = _store().engine.url.render_as_string(hide_password=False)
+    with stage("evaluate"):
+        out = await _offload(_heavy, _evaluate, db_url, days, h, limit, cursor, fmt != "json", symbol)
+    if fmt == "json":
+        return out
+    summary, ipc, next_cursor = out
+    return respond(pa.ipc.open_stream(ipc).read_all(), fmt, meta_headers(summary=summary, next_cursor=next_cursor))
 
-    rows = _store().fetch_signals(days=days, horizon=h, symbol=SYMBOL, timeframe=f"{BAR_MINUTES}m", limit=limit)
-    if not rows:
-        return {"summary": {"count": 0}, "rows": []}
 
-    # Load enough candles to cover the evaluation window plus horizon.
-    df = _load_recent_parquet().copy().sort_values("ts")
-    df = df[["ts", "c"]].dropna()
+@lru_cache(maxsize=4)
+def _worker_store(db_url: str):
+    return get_store(db_url)
 
-    sig = pd.DataFrame(
-        {
-            "asof_ts": pd.to_datetime([r["asof_ts"] for r in rows], utc=True, errors="coerce"),
-            "side": [r.get("side") for r in rows],
-            "prob_up": [r.get("prob_up") for r in rows],
-        }
-    ).dropna(subset=["asof_ts"])
-    if sig.empty:
-        return {"summary": {"count": 0}, "rows": []}
-
-    sig = sig.sort_values("asof_ts")
-    sig["target_ts"] = sig["asof_ts"] + pd.Timedelta(minutes=horizon_minutes)
-
-    # Map to nearest candle close at/just before asof, and at/just before target.
-    base = df.rename(columns={"ts": "asof_ts", "c": "c0"}).sort_values("asof_ts")
-    sig = pd.merge_asof(sig, base, on="asof_ts", direction="backward")
-    fut = df.rename(columns={"ts": "target_ts", "c": "c1"}).sort_values("target_ts")
-    sig = pd.merge_asof(sig, fut, on="target_ts", direction="backward")
-    sig = sig.dropna(subset=["c0", "c1"])
-
-    sig["realized_up"] = (sig["c1"] > sig["c0"]).astype(int)
-    sig["signal_buy"] = (sig["side"].astype(str).str.lower() == "buy").astype(int)
-    sig["hit"] = (sig["signal_buy"] == sig["realized_up"]).astype(int)
-
-    # Metrics
-    n = int(len(sig))
-    acc = float(sig["hit"].mean()) if n else 0.0
-    # brier score if prob_up present
-    if sig["prob_up"].notna().any():
-        p = sig["prob_up"].astype(float).clip(0, 1)
-        y = sig["realized_up"].astype(float)
-        brier = float(((p - y) ** 2).mean())
-    else:
-        brier = None
 
-    out_rows = sig[["asof_ts", "target_ts", "side", "prob_up", "c0", "c1", "realized_up", "hit"]].copy()
-    out_rows["asof_ts"] = out_rows["asof_ts"].dt.strftime("%Y-%m-%dT%H:%M:%SZ")
-    out_rows["target_ts"] = out_rows["target_ts"].dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+def _evaluate(db_url: str, days: int, h: str, limit: int, cursor: Optional[str], columnar: bool = False,
+              symbol: str = SYMBOL):
+    # Runs in a worker process; the DB URL is passed in because workers outlive env changes.
+    h = h if h in ("30m", "2h") else "30m"
+    horizon_minutes = 30 if h == "30m" else 120
+    horizon_bars = max(1, int(round(horizon_minutes / max(BAR_MINUTES, 1))))
 
+    store = _worker_store(db_url)
+    kw = dict(days=days, horizon=h, symbol=symbol, timeframe=f"{BAR_MINUTES}m")
     summary = {
-        "count": n,
+        **store.outcome_summary(**kw),
         "horizon": h,
         "bar_minutes": BAR_MINUTES,
         "horizon_bars": horizon_bars,
-        "accuracy": acc,
-        "brier": brier,
     }
-    return {"summary": summary, "rows": out_rows.to_dict(orient="records")}
+    page = store.query_outcomes(limit=limit, cursor=cursor, **kw)
+    if columnar:
+        # Arrow IPC crosses the process boundary as one buffer instead of pickled rows.
+        table = page.to_arrow()
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as w:
+            w.write_table(table)
+        return summary, sink.getvalue().to_pybytes(), page.next_cursor
+    return {"summary": summary, "rows": page.records(), "next_cursor": page.next_cursor}
 
 
 class BacktestRequest(BaseModel):
@@ -230,18 +543,46 @@ class BacktestRequest(BaseModel):
     days: int = 90
 
 
-@app.post("/backtest/run")
-def run_backtest(req: BacktestRequest):
-    """Bounded backtest for dashboard use.
-
-    Uses the toy walk-forward backtest engine in backtest.engine on recent parquet.
-    This is intended for exploratory validation only (NOT for live trading decisions).
-    """
+# Backtest results are memoized per (params, candle data version); identical in-flight
+# submissions share one job.
+def _observe_job(job):
+    STAGE_SECONDS.observe(job.finished_at - job.created_at, stage="backtest")
+
+_jobs = JobManager(_heavy, ttl=float(os.getenv("BACKTEST_CACHE_TTL", "900")),
+                   max_results=int(os.getenv("BACKTEST_CACHE_SIZE", "32")), on_finish=_observe_job)
+
+# Cache counters live on their owners; sampled at scrape time.
+METRICS.gauge("signal_memo_hits_total", "Per-bar signal memo hits.", lambda: _memo.hits, kind="counter")
+METRICS.gauge("signal_memo_misses_total", "Per-bar signal memo misses.", lambda: _memo.misses, kind="counter")
+METRICS.gauge("signal_memo_hit_ratio", "Per-bar signal memo hit ratio.", lambda: _ratio(_memo.hits, _memo.misses))
+METRICS.gauge("backtest_cache_hits_total", "Backtests answered from the result cache.", lambda: _jobs.hits, kind="counter")
+METRICS.gauge("backtest_jobs_joined_total", "Backtests attached to an identical running job.", lambda: _jobs.joined, kind="counter")
+METRICS.gauge("backtest_cache_misses_total", "Backtests actually executed.", lambda: _jobs.misses, kind="counter")
+METRICS.gauge("backtest_cache_hit_ratio", "Backtest result cache hit ratio (joined jobs count as hits).",
+              lambda: _ratio(_jobs.hits + _jobs.joined, _jobs.misses))
+METRICS.gauge("heavy_pool_inflight", "Tasks admitted to the heavy worker pool.", lambda: _heavy.inflight)
+METRICS.gauge("resident_symbols", "Symbols with models/candles resident.", lambda: len(_symbols.resident()))
+METRICS.gauge("resident_bytes", "Estimated bytes of resident models and candle windows.", _symbols.nbytes)
+METRICS.gauge("resident_evictions_total", "Symbols evicted to stay within the memory budget.", lambda: _symbols.evictions, kind="counter")
+METRICS.gauge("signal_subscribers", "Connected SSE/WebSocket signal subscribers.", lambda: _broker.subscribers)
+METRICS.gauge("signals_published_total", "Signals fanned out to subscribers.", lambda: _broker.published, kind="counter")
+METRICS.gauge("batch_pool_inflight", "Tasks admitted to the batch worker lane.", lambda: _light.inflight)
+
+
+def _submit_backtest(req: BacktestRequest):
     h = req.horizon if req.horizon in ("30m", "2h") else "30m"
     days = max(1, min(int(req.days), 3650))
+    df = _load_recent_parquet()
+    version = (len(df), df["ts"].iloc[-1].isoformat())
+    try:
+        return _jobs.submit(("backtest", h, days, BAR_MINUTES, version), _backtest, df, h, days)
+    except Saturated as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"})
+
+
+def _backtest(df: pd.DataFrame, h: str, days: int):
+    from backtest.engine import monthly_walkforward  # only worker processes pay for it
 
-    df = _load_recent_parquet().copy()
-    df = df.sort_values("ts")
     # bound by lookback
     end = df["ts"].max()
     start = end - pd.Timedelta(days=days)
@@ -250,7 +591,7 @@ def run_backtest(req: BacktestRequest):
     horizon_minutes = 30 if h == "30m" else 120
     horizon_bars = max(1, int(round(horizon_minutes / max(BAR_MINUTES, 1))))
 
-    res = monthly_walkforward(df.rename(columns={"o":"o","h":"h","l":"l","c":"c","ts":"ts"}), horizon_bars=horizon_bars)
+    res = monthly_walkforward(df, horizon_bars=horizon_bars)
     trades = int(res.get("trades", 0))
     pnl = float(res.get("pnl", 0.0))
     winrate = float(res.get("winrate", 0.0))
@@ -266,3 +607,57 @@ def run_backtest(req: BacktestRequest):
         "winrate": winrate,
     }
     return {"summary": summary, "raw": res}
+
+
+@app.post("/backtest/run")
+async def run_backtest(req: BacktestRequest):
+    """Bounded backtest for dashboard use.
+
+    Uses the toy walk-forward backtest engine in backtest.engine on recent parquet.
+    This is intended for exploratory validation only (NOT for live trading decisions).
+    Blocks until the result is ready; use ``/backtest/jobs`` to submit and poll instead.
+    """
+    job = await asyncio.to_thread(_submit_backtest, req)
+    # Awaited on the loop: a burst of waiters must not tie up the executor the scheduler uses.
+    await job.wait_async()
+    if job.status == "failed":
+        raise HTTPException(status_code=500, detail=job.error)
+    return job.result
+
+
+@app.post("/backtest/jobs", status_code=202)
+async def submit_backtest(req: BacktestRequest):
+    """Start (or join, or answer from cache) a backtest; poll ``/backtest/jobs/{job_id}``."""
+    job = await asyncio.to_thread(_submit_backtest, req)
+    return job.to_dict(time.monotonic())
+
+
+def _job(job_id: str):
+    job = _jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="unknown job")
+    return job
+
+
+@app.get("/backtest/jobs/{job_id}")
+def backtest_job(job_id: str):
+    return _job(job_id).to_dict(time.monotonic())
+
+
+@app.get("/backtest/jobs/{job_id}/stream")
+async def stream_backtest_job(job_id: str, heartbeat: float = 5.0):
+    """NDJSON status lines every ``heartbeat`` seconds, ending with the finished job."""
+    job = _job(job_id)
+
+    async def lines():
+        while True:
+            cur = job.to_dict(time.monotonic())
+            yield json.dumps(cur) + "\n"
+            if cur["status"] in TERMINAL:
+                return
+            await job.wait_async(max(heartbeat, 0.1))
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+_IMPORTED = time.perf_counter()
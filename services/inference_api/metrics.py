@@ -0,0 +1,170 @@
+"""In-process latency histograms and counters in the Prometheus text format.
+
+Deliberately tiny (no client library): a metric is a dict of label tuples to
+running totals behind a lock, so an observation costs a bisect and a few adds.
+``stage("predict")`` times a block into ``inference_stage_seconds``, and
+``MetricsMiddleware`` counts every HTTP request by route template and status.
+Values owned elsewhere (cache hit counters) are read at scrape time through
+``REGISTRY.gauge(name, help, fn)``.
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 120.0)
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{v}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name, self.help, self.label_names = name, help, tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(labels.get(n, "") for n in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(tuple(labels.get(n, "") for n in self.label_names), 0.0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_labels(self.label_names, k)} {v:g}" for k, v in items]
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name, self.help, self.label_names = name, help, tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        # per label set: [bucket counts..., +Inf count, sum]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(labels.get(n, "") for n in self.label_names)
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            row = self._values.get(key)
+            if row is None:
+                row = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            row[i] += 1
+            row[-1] += value
+
+    def count(self, **labels: str) -> int:
+        row = self._values.get(tuple(labels.get(n, "") for n in self.label_names))
+        return int(sum(row[:-1])) if row else 0
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+        out = []
+        for key, row in items:
+            cum = 0.0
+            for le, n in zip(self.buckets + (float("inf"),), row[:-1]):
+                cum += n
+                bound = "+Inf" if le == float("inf") else f"{le:g}"
+                le_label = 'le="%s"' % bound
+                out.append(f"{self.name}_bucket{_labels(self.label_names, key, le_label)} {cum:g}")
+            out.append(f"{self.name}_sum{_labels(self.label_names, key)} {row[-1]:.6g}")
+            out.append(f"{self.name}_count{_labels(self.label_names, key)} {cum:g}")
+        return out
+
+
+class _Callback:
+    def __init__(self, name: str, help: str, fn: Callable[[], float], kind: str):
+        self.name, self.help, self.fn, self.kind = name, help, fn, kind
+
+    def samples(self) -> List[str]:
+        try:
+            return [f"{self.name} {float(self.fn()):g}"]
+        except Exception:
+            return []
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, object] = {}
+
+    def _add(self, metric):
+        return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(name, help, labels))
+
+    def histogram(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, help, labels, buckets))
+
+    def gauge(self, name: str, help: str, fn: Callable[[], float], kind: str = "gauge") -> None:
+        """Sample ``fn()`` at scrape time (``kind="counter"`` for monotonic totals kept elsewhere)."""
+        # Replaced on re-registration so the callable can follow swapped objects.
+        self._metrics[name] = _Callback(name, help, fn, kind)
+
+    def render(self) -> str:
+        lines = []
+        for m in self._metrics.values():
+            lines.append(f"# HELP {m.name} {m.help}")
+            lines.append(f"# TYPE {m.name} {m.kind}")
+            lines.extend(m.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+STAGE_SECONDS = REGISTRY.histogram("inference_stage_seconds", "Time spent per pipeline stage.", ["stage"])
+REQUESTS = REGISTRY.counter("http_requests_total", "HTTP requests by route and status.", ["route", "status"])
+REQUEST_ERRORS = REGISTRY.counter("http_request_errors_total", "HTTP requests that ended in a 5xx or an exception.", ["route"])
+REQUEST_SECONDS = REGISTRY.histogram("http_request_duration_seconds", "HTTP request latency by route.", ["route"])
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - t0, stage=name)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware (no per-request task or body buffering)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        t0 = time.perf_counter()
+        status = 500
+
+        async def _send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            route = getattr(scope.get("route"), "path", "unmatched")
+            REQUESTS.inc(route=route, status=str(status))
+            REQUEST_SECONDS.observe(time.perf_counter() - t0, route=route)
+            if status >= 500:
+                REQUEST_ERRORS.inc(route=route)
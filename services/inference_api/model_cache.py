@@ -0,0 +1,168 @@
+"""Resident per-horizon model cache with cheap registry hot-reload.
+
+Each horizon's latest artifact is loaded once and kept in memory. At most every
+``check_every`` seconds a request re-checks the registry. When the horizon has a
+``CURRENT`` pointer (see ``models.registry``) that is one stat of the pointer file and,
+only if it moved, one small read naming the served version. Older registries without
+a pointer fall back to a stat of the horizon directory and of the resident model file,
+with a glob for the newest version only when one of them moved.
+A newer artifact is loaded by that one request and swapped in atomically; requests
+already holding the previous model finish with it, and concurrent requests keep
+being served the resident model while the load is in progress.
+
+A version directory with a native ``manifest.json`` (see ``models.artifact``) is loaded
+from the scale vector and booster files alone; older versions with only ``model.pkl``
+fall back to unpickling the sklearn pipeline.
+"""
+
+from __future__ import annotations
+
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from models.artifact import MANIFEST, load_native
+from models.registry import CURRENT, read_current
+
+logger = logging.getLogger(__name__)
+
+Stamp = Tuple[float, int]
+
+
+def _joblib_load(path: str) -> Any:
+    # Deferred: unpickling pulls in sklearn/xgboost/lightgbm, paid at warm-up or first use.
+    import joblib
+
+    return joblib.load(path)
+
+
+def _stamp(path: str) -> Optional[Stamp]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime, st.st_size)
+
+
+@dataclass(frozen=True)
+class LoadedModel:
+    horizon: str
+    version: str
+    path: str
+    model: Any
+    meta: Dict[str, Any]
+    stamp: Stamp
+
+
+class ModelCache:
+    def __init__(
+        self,
+        registry: str,
+        check_every: float = 30.0,
+        loader: Callable[[str], Any] = _joblib_load,
+        native_loader: Callable[[str], Any] = load_native,
+    ):
+        self.registry = registry
+        self.check_every = float(check_every)
+        self._loader = loader
+        self._native_loader = native_loader
+        self._models: Dict[str, LoadedModel] = {}
+        self._checked: Dict[str, float] = {}
+        self._dir_stamp: Dict[str, Optional[Stamp]] = {}
+        self._errors: Dict[str, str] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+
+    def _lock(self, h: str) -> threading.Lock:
+        with self._guard:
+            return self._locks.setdefault(h, threading.Lock())
+
+    def _fresh(self, h: str) -> bool:
+        last = self._checked.get(h)
+        return last is not None and time.monotonic() - last < self.check_every
+
+    def get(self, h: str) -> Optional[LoadedModel]:
+        """Resident model for ``h`` (None if the registry has none), refreshed lazily."""
+        cur = self._models.get(h)
+        if self._fresh(h):
+            return cur
+        lock = self._lock(h)
+        # With a resident model, never wait on another thread's reload.
+        if not lock.acquire(blocking=cur is None):
+            return cur
+        try:
+            cur = self._models.get(h)
+            if self._fresh(h):
+                return cur
+            return self._refresh(h, cur)
+        finally:
+            self._checked[h] = time.monotonic()
+            lock.release()
+
+    def error(self, h: str) -> Optional[str]:
+        """Why the registry's artifact for ``h`` last failed to load, or None after a good load."""
+        return self._errors.get(h)
+
+    def nbytes(self) -> int:
+        """Rough resident size: the on-disk size of each loaded artifact."""
+        return sum(getattr(m.model, "nbytes", m.stamp[1]) for m in list(self._models.values()))
+
+    def invalidate(self, h: Optional[str] = None) -> None:
+        """Force the next ``get`` to re-check the registry."""
+        for k in [h] if h else list(self._checked):
+            self._checked.pop(k, None)
+            self._dir_stamp.pop(k, None)
+
+    def _resolve(self, h: str) -> Optional[str]:
+        version = read_current(os.path.join(self.registry, h))
+        if version is not None:
+            d = os.path.join(self.registry, h, version)
+            manifest = os.path.join(d, MANIFEST)
+            return manifest if os.path.exists(manifest) else os.path.join(d, "model.pkl")
+        files = glob.glob(f"{self.registry}/{h}/*/model.pkl") + glob.glob(f"{self.registry}/{h}/*/{MANIFEST}")
+        if not files:
+            return None
+        latest = max(os.path.dirname(f) for f in files)
+        manifest = os.path.join(latest, MANIFEST)
+        return manifest if os.path.exists(manifest) else os.path.join(latest, "model.pkl")
+
+    def _refresh(self, h: str, cur: Optional[LoadedModel]) -> Optional[LoadedModel]:
+        # With a pointer, promotion/rollback are exactly the changes to CURRENT.
+        dir_stamp = _stamp(os.path.join(self.registry, h, CURRENT)) or _stamp(os.path.join(self.registry, h))
+        if cur is not None and dir_stamp == self._dir_stamp.get(h) and _stamp(cur.path) == cur.stamp:
+            return cur
+        path = self._resolve(h)
+        if path is None:
+            return cur
+        stamp = _stamp(path)
+        if cur is not None and cur.path == path and cur.stamp == stamp:
+            self._dir_stamp[h] = dir_stamp
+            return cur
+        try:
+            loaded = self._load(h, path, stamp)
+        except Exception as e:
+            # Typically a half-written artifact; keep serving what we have and retry later.
+            logger.warning("model load failed for %s (%s): %s", h, path, e)
+            self._errors[h] = f"{path}: {type(e).__name__}: {e}"
+            return cur
+        self._errors.pop(h, None)
+        self._models[h] = loaded
+        self._dir_stamp[h] = dir_stamp
+        logger.info("loaded model %s/%s", h, loaded.version)
+        return loaded
+
+    def _load(self, h: str, path: str, stamp: Optional[Stamp]) -> LoadedModel:
+        if os.path.basename(path) == MANIFEST:
+            model = self._native_loader(path)
+            meta = model.manifest
+        else:
+            model = self._loader(path)
+            with open(path.replace("model.pkl", "feature_spec.json")) as f:
+                meta = json.load(f)
+        version = os.path.basename(os.path.dirname(path))
+        return LoadedModel(horizon=h, version=version, path=path, model=model, meta=meta, stamp=stamp or (0.0, 0))
@@ -0,0 +1,92 @@
+"""In-process fan-out of new signals to streaming subscribers (SSE / WebSocket).
+
+Topics are ``"<symbol>:<horizon>"``. ``publish`` may be called from any thread
+(the scheduler and request handlers score in worker threads); delivery hops onto
+each subscriber's event loop. Every subscriber has a bounded queue: a consumer
+that falls behind loses its oldest undelivered signals (counted in ``dropped``)
+rather than growing memory or slowing the publisher, since only the newest signal
+per bar matters. The last ``replay`` messages per topic are kept and sent to new
+subscribers first.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set
+
+Message = Dict[str, Any]
+
+
+def topic(symbol: str, horizon: str) -> str:
+    return f"{symbol}:{horizon}"
+
+
+class Subscription:
+    def __init__(self, topics: Iterable[str], queue_size: int, loop: asyncio.AbstractEventLoop):
+        self.topics: Set[str] = set(topics)
+        self.loop = loop
+        self.queue: "asyncio.Queue[Message]" = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+
+    def offer(self, msg: Message) -> None:
+        """Enqueue on the subscriber's loop, evicting the oldest message when full."""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(msg)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Message]:
+        """Next message, or None after ``timeout`` seconds without one."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class Broker:
+    def __init__(self, replay: int = 10, queue_size: int = 32):
+        self.replay = int(replay)
+        self.queue_size = int(queue_size)
+        self.published = 0
+        self._history: Dict[str, Deque[Message]] = {}
+        self._subs: List[Subscription] = []
+        self._lock = threading.Lock()
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subs)
+
+    def subscribe(self, topics: Iterable[str], replay: int = 1) -> Subscription:
+        """Register on the running loop; up to ``replay`` recent messages per topic are queued first."""
+        sub = Subscription(topics, self.queue_size, asyncio.get_running_loop())
+        with self._lock:
+            backlog = []
+            for t in sorted(sub.topics):
+                hist = self._history.get(t)
+                if hist and replay > 0:
+                    backlog.extend(list(hist)[-replay:])
+            self._subs.append(sub)
+        for msg in sorted(backlog, key=lambda m: m["seq"]):
+            sub.offer(msg)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            if sub in self._subs:
+                self._subs.remove(sub)
+
+    def publish(self, topic_name: str, payload: Dict[str, Any]) -> Message:
+        with self._lock:
+            self.published += 1
+            msg = {"seq": self.published, "topic": topic_name, "signal": payload}
+            self._history.setdefault(topic_name, deque(maxlen=self.replay)).append(msg)
+            targets = [s for s in self._subs if topic_name in s.topics]
+        for sub in targets:
+            try:
+                sub.loop.call_soon_threadsafe(sub.offer, msg)
+            except RuntimeError:
+                # The subscriber's loop is gone (client vanished without unsubscribing).
+                self.unsubscribe(sub)
+        return msg
@@ -0,0 +1,94 @@
+"""Bar-close precompute loop for the inference API.
+
+Signals only change when a bar closes, so instead of scoring on every poll the API
+runs one asyncio task (started from the lifespan hook) that wakes ``delay`` seconds
+after each ``bar_minutes`` boundary, computes every configured symbol's horizons in one
+call per symbol (so candles and features are shared and each symbol's new signals are
+written once) in a worker thread and publishes the payloads into an in-memory table. Requests read
+that table; entries older than ``max_age`` are ignored so a stalled loop falls back
+to on-demand scoring instead of serving stale signals.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (symbol, horizons) -> one payload per horizon, in order.
+Compute = Callable[[str, List[str]], List[Dict[str, Any]]]
+
+
+class BarScheduler:
+    def __init__(
+        self,
+        compute: Compute,
+        symbols: Sequence[str],
+        horizons: Sequence[str],
+        bar_minutes: int,
+        delay: float = 2.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.compute = compute
+        self.symbols = tuple(symbols)
+        self.horizons = tuple(horizons)
+        self.bar_seconds = max(int(bar_minutes), 1) * 60
+        self.delay = float(delay)
+        self.max_age = 2.0 * self.bar_seconds
+        self.clock = clock
+        self._latest: Dict[Tuple[str, str], Tuple[float, Dict[str, Any]]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def get(self, symbol: str, horizon: str) -> Optional[Dict[str, Any]]:
+        """Published payload for ``(symbol, horizon)``, or None when missing/stale."""
+        hit = self._latest.get((symbol, horizon))
+        if hit is None or self.clock() - hit[0] > self.max_age:
+            return None
+        return hit[1]
+
+    def publish(self, symbol: str, horizon: str, payload: Dict[str, Any]) -> None:
+        self._latest[(symbol, horizon)] = (self.clock(), payload)
+
+    def next_run(self, now: float) -> float:
+        """Epoch seconds of the next bar close plus ``delay``."""
+        return (now // self.bar_seconds + 1) * self.bar_seconds + self.delay
+
+    def tick(self) -> int:
+        """Compute and publish every symbol's horizons; returns how many payloads were published."""
+        done = 0
+        for symbol in self.symbols:
+            try:
+                payloads = self.compute(symbol, list(self.horizons))
+            except Exception:
+                # One bad series must not stop the others; requests fall back to on-demand.
+                logger.exception("precompute failed for %s", symbol)
+                continue
+            for h, payload in zip(self.horizons, payloads):
+                self.publish(symbol, h, payload)
+                done += 1
+        return done
+
+    async def run(self) -> None:
+        await asyncio.to_thread(self.tick)
+        while True:
+            now = self.clock()
+            await asyncio.sleep(max(self.next_run(now) - now, 0.0))
+            await asyncio.to_thread(self.tick)
+
+    def start(self) -> asyncio.Task:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
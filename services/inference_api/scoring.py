@@ -0,0 +1,109 @@
+"""Incremental last-bar scoring for the inference API.
+
+``/signals/latest`` only needs the feature vector of the newest bar. It depends on
+the last ``WINDOW`` bars alone (20-bar return std needs 21 closes), so it is
+computed with numpy on that tail, once per closed bar, instead of rebuilding
+rolling features over 500 rows. Payloads are memoized per (symbol, horizon, bar,
+model version) so repeated polls within a bar are a dict lookup.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Same definitions and names as _build_features / models.train.build_features.
+FEATURE_COLUMNS = ("ret1", "ret5", "vol20", "rng", "atr14", "rsi14", "tokyo", "london", "newyork")
+WINDOW = 21
+
+
+def last_bar_features(df: pd.DataFrame) -> Optional[Dict[str, float]]:
+    """Features (plus the bar's o/h/l/c/v) of the last row of a ts-sorted frame.
+
+    Returns None when there is not enough history, matching the rows
+    ``_build_features`` drops with ``dropna``.
+    """
+    if len(df) < WINDOW:
+        return None
+    tail = df.iloc[-WINDOW:]
+    c = tail["c"].to_numpy(dtype=float)
+    h = tail["h"].to_numpy(dtype=float)
+    lo = tail["l"].to_numpy(dtype=float)
+    rets = c[1:] / c[:-1] - 1.0
+    delta = np.diff(c)[-14:]
+    gain = np.clip(delta, 0, None).mean()
+    loss = (-np.clip(delta, None, 0)).mean()
+    rng = h - lo
+    hour = pd.Timestamp(tail["ts"].iloc[-1]).hour
+    out = {
+        "ret1": float(rets[-1]),
+        "ret5": float(c[-1] / c[-6] - 1.0),
+        "vol20": float(np.std(rets[-20:], ddof=1)),
+        "rng": float(rng[-1]),
+        "atr14": float(rng[-14:].mean()),
+        "rsi14": float(100 - 100 / (1 + gain / (loss + 1e-12))),
+        "tokyo": float(0 <= hour <= 9),
+        "london": float(7 <= hour <= 16),
+        "newyork": float(12 <= hour <= 21),
+    }
+    if any(np.isnan(v) for v in out.values()):
+        return None
+    last = tail.iloc[-1]
+    for k in ("o", "h", "l", "c", "v"):
+        if k in tail.columns:
+            out[k] = float(last[k])
+    return out
+
+
+class FeatureState:
+    """Latest-bar feature vector per symbol, recomputed only when a new bar closes."""
+
+    def __init__(self) -> None:
+        self._latest: Dict[str, Tuple[pd.Timestamp, Optional[Dict[str, float]]]] = {}
+
+    def latest(self, symbol: str, df: pd.DataFrame) -> Tuple[pd.Timestamp, Optional[Dict[str, float]]]:
+        bar_ts = df["ts"].iloc[-1]
+        cached = self._latest.get(symbol)
+        if cached is not None and cached[0] == bar_ts:
+            return cached
+        entry = (bar_ts, last_bar_features(df))
+        self._latest[symbol] = entry
+        return entry
+
+
+class PayloadMemo:
+    """Small thread-safe LRU of computed signal payloads."""
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self.maxsize = int(maxsize)
+        self._d: "OrderedDict[Hashable, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            v = self._d.get(key)
+            if v is None:
+                self.misses += 1
+                return None
+            self._d.move_to_end(key)
+            self.hits += 1
+            return v
+
+    def put(self, key: Hashable, payload: Dict[str, Any]) -> None:
+        with self._lock:
+            self._d[key] = payload
+            self._d.move_to_end(key)
+            while len(self._d) > self.maxsize:
+                self._d.popitem(last=False)
+
+
+def score_row(model: Any, features: Dict[str, float], names) -> float:
+    """P(up) for one feature vector laid out in the model's training feature order."""
+    x = np.array([[features[f] for f in names if f in features]], dtype=float)
+    return float(model.predict_proba(x)[0, 1])
@@ -0,0 +1,100 @@
+"""Startup profile and readiness state for the inference API.
+
+The lifespan hook runs warm-up phases (DB connection and schema, candle windows,
+model unpickling, a first scoring pass) in the background while ``/health`` already
+answers. Each phase is timed and logged; ``/ready`` reports 503 until all phases
+finished without error, so load balancers only route traffic to a warm instance.
+Failed phases are re-run in the background with capped exponential backoff, and
+the instance turns ready once they pass.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+Step = Tuple[str, Callable[[], Any]]
+
+
+class StartupProfile:
+    def __init__(self) -> None:
+        self.phases: List[Dict[str, Any]] = []
+        self.ready = False
+        self.started_at: Optional[float] = None
+        self.ready_after: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float, error: Optional[str] = None) -> None:
+        entry = {"phase": name, "seconds": round(seconds, 4)}
+        if error:
+            entry["error"] = error
+        with self._lock:
+            # A retried phase replaces its earlier entry.
+            for i, prev in enumerate(self.phases):
+                if prev["phase"] == name:
+                    entry["attempts"] = prev.get("attempts", 1) + 1
+                    self.phases[i] = entry
+                    break
+            else:
+                self.phases.append(entry)
+        if error:
+            logger.warning("startup phase %s failed after %.3fs: %s", name, seconds, error)
+        else:
+            logger.info("startup phase %s took %.3fs", name, seconds)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a warm-up step; a failure is recorded (and blocks readiness) instead of raised."""
+        if self.started_at is None:
+            self.started_at = time.perf_counter()
+        t0 = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.record(name, time.perf_counter() - t0, f"{type(e).__name__}: {e}")
+        else:
+            self.record(name, time.perf_counter() - t0)
+
+    def run(self, steps: Sequence[Step]) -> List[Step]:
+        """Run ``(name, fn)`` warm-up steps as phases; returns the steps that failed."""
+        failed = []
+        for name, fn in steps:
+            ok = False
+            with self.phase(name):
+                fn()
+                ok = True
+            if not ok:
+                failed.append((name, fn))
+        return failed
+
+    async def retry(self, steps: Sequence[Step], first: float = 1.0, cap: float = 60.0) -> None:
+        """Re-run failed ``steps`` (backoff doubling from ``first`` up to ``cap`` s) until all pass, then finish."""
+        delay = first
+        while steps:
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, cap)
+            steps = await asyncio.to_thread(self.run, steps)
+        self.finish()
+
+    @property
+    def failed(self) -> bool:
+        return any("error" in p for p in self.phases)
+
+    def finish(self) -> bool:
+        """Mark warm-up complete; ready only if no phase failed."""
+        self.ready = not self.failed
+        if self.started_at is not None:
+            self.ready_after = round(time.perf_counter() - self.started_at, 4)
+        logger.info("startup %s after %ss", "ready" if self.ready else "not ready", self.ready_after)
+        return self.ready
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            phases = list(self.phases)
+        return {"ready": self.ready, "warmup_seconds": self.ready_after, "phases": phases}
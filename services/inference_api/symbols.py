@@ -0,0 +1,113 @@
+"""Per-symbol serving state, created on first use and bounded by a memory budget.
+
+Each symbol gets a ``ModelCache`` over ``<registry_root>/<symbol>`` (the lowercase
+directory name the training CLI writes is also accepted) and a ``CandleBuffer``
+over ``<data_dir>/<symbol>``. Nothing is loaded at startup. States live in an LRU:
+once their estimated footprint (resident model files plus candle frames) exceeds
+``budget_bytes``, the least recently used symbols are dropped and reload lazily on
+their next request. ``pinned`` symbols (the scheduler's) are never evicted.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+from services.inference_api.candles import CandleBuffer
+from services.inference_api.model_cache import ModelCache
+
+SYMBOL_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]{0,31}$")
+
+
+@dataclass
+class SymbolState:
+    symbol: str
+    models: ModelCache
+    candles: CandleBuffer
+
+    def nbytes(self) -> int:
+        return self.models.nbytes() + self.candles.nbytes()
+
+
+class SymbolRegistry:
+    def __init__(
+        self,
+        registry_root: str,
+        data_dir: str,
+        budget_bytes: int,
+        overrides: Optional[Dict[str, str]] = None,
+        pinned: Iterable[str] = (),
+        model_check_every: float = 30.0,
+        candle_rows: int = 20_000,
+        recheck_every: float = 5.0,
+    ):
+        self.registry_root = registry_root
+        self.data_dir = data_dir
+        self.budget_bytes = int(budget_bytes)
+        self.overrides = dict(overrides or {})
+        self.pinned = set(pinned)
+        self.model_check_every = float(model_check_every)
+        self.candle_rows = int(candle_rows)
+        self.recheck_every = float(recheck_every)
+        self.evictions = 0
+        self._states: "OrderedDict[str, SymbolState]" = OrderedDict()
+        self._checked: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def registry_dir(self, symbol: str) -> str:
+        if symbol in self.overrides:
+            return self.overrides[symbol]
+        for name in (symbol, symbol.lower()):
+            path = os.path.join(self.registry_root, name)
+            if os.path.isdir(path):
+                return path
+        return os.path.join(self.registry_root, symbol.lower())
+
+    def known(self, symbol: str) -> bool:
+        """A well-formed symbol that is configured or has a registry or candle directory."""
+        if not SYMBOL_RE.match(symbol):
+            return False
+        if symbol in self.overrides or symbol in self.pinned or symbol in self._states:
+            return True
+        return os.path.isdir(self.registry_dir(symbol)) or os.path.isdir(os.path.join(self.data_dir, symbol))
+
+    def get(self, symbol: str) -> SymbolState:
+        with self._lock:
+            state = self._states.get(symbol)
+            if state is None:
+                state = SymbolState(
+                    symbol=symbol,
+                    models=ModelCache(self.registry_dir(symbol), check_every=self.model_check_every),
+                    candles=CandleBuffer(self.data_dir, symbol, max_rows=self.candle_rows),
+                )
+                self._states[symbol] = state
+                self._checked = None
+            self._states.move_to_end(symbol)
+            if self._checked is None or time.monotonic() - self._checked >= self.recheck_every:
+                self._evict(keep=symbol)
+            return state
+
+    def resident(self) -> List[str]:
+        return list(self._states)
+
+    def nbytes(self) -> int:
+        return sum(s.nbytes() for s in list(self._states.values()))
+
+    def _evict(self, keep: str) -> None:
+        # Sizes grow after insertion (models/candles load lazily), so this also runs periodically.
+        self._checked = time.monotonic()
+        sizes = {k: s.nbytes() for k, s in self._states.items()}
+        total = sum(sizes.values())
+        for k in list(self._states):
+            if total <= self.budget_bytes:
+                break
+            if k == keep or k in self.pinned:
+                continue
+            del self._states[k]
+            total -= sizes[k]
+            self.evictions += 1
@@ -0,0 +1,79 @@
+"""Bounded executors for heavy inference API work.
+
+Latency-critical handlers (``/health``, ``/signals/latest``) stay plain ``def`` on
+the server's threadpool. Heavy handlers are ``async`` and await a ``WorkerPool``:
+a separately sized executor with admission control. At most ``max_workers`` tasks
+run and ``max_queue`` more may wait; anything beyond that is rejected immediately
+with ``Saturated`` (surfaced as HTTP 429) instead of queueing behind a backtest
+burst.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+
+class Saturated(RuntimeError):
+    """The pool has ``max_workers + max_queue`` tasks admitted already."""
+
+
+class WorkerPool:
+    def __init__(self, name: str, max_workers: int = 2, max_queue: int = 4, processes: bool = True):
+        self.name = name
+        self.max_workers = max(int(max_workers), 1)
+        self.max_queue = max(int(max_queue), 0)
+        self.processes = processes
+        self._executor: Optional[Executor] = None
+        self._inflight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def inflight(self) -> int:
+        return self._inflight
+
+    def _pool(self) -> Executor:
+        # Created on first use so importing the API never forks.
+        with self._lock:
+            if self._executor is None:
+                if self.processes:
+                    # spawn: the API process runs threads (scheduler, uvicorn) that fork would copy mid-state.
+                    ctx = multiprocessing.get_context("spawn")
+                    self._executor = ProcessPoolExecutor(self.max_workers, mp_context=ctx)
+                else:
+                    self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix=self.name)
+            return self._executor
+
+    def _admit(self) -> None:
+        with self._lock:
+            if self._inflight >= self.max_workers + self.max_queue:
+                raise Saturated(f"{self.name} pool is saturated ({self._inflight} tasks admitted)")
+            self._inflight += 1
+
+    def _release(self) -> None:
+        with self._lock:
+            self._inflight -= 1
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        """Schedule ``fn(*args)``; raises ``Saturated`` without waiting when full."""
+        self._admit()
+        try:
+            fut = self._pool().submit(fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        fut.add_done_callback(lambda _: self._release())
+        return fut
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Awaitable ``submit``."""
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def shutdown(self) -> None:
+        with self._lock:
+            ex, self._executor = self._executor, None
+        if ex is not None:
+            ex.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,142 @@
+"""Incremental realized-outcome evaluation for stored signals.
+
+Each signal is evaluated exactly once, after the candle series covers its whole
+horizon: close at/just before ``asof_ts`` (c0), close at/just before
+``asof_ts + horizon`` (c1) and the high/low excursions in between. Results are
+persisted in ``signal_outcomes`` so ``/signals/evaluate`` becomes an indexed read.
+"""
+
+from __future__ import annotations
+
+import pathlib
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from storage.candle_reader import read_candles
+from storage.db_store import Store, parse_ts
+
+
+def horizon_minutes(h: str) -> int:
+    """'30m' -> 30, '2h' -> 120, '1d' -> 1440."""
+    h = str(h).strip().lower()
+    units = {"m": 1, "h": 60, "d": 1440}
+    if not h or h[-1] not in units:
+        raise ValueError(f"Unsupported horizon: {h!r}")
+    return int(h[:-1]) * units[h[-1]]
+
+
+def load_candles(
+    data_dir: str,
+    symbol: str,
+    start: Optional[pd.Timestamp] = None,
+    end: Optional[pd.Timestamp] = None,
+) -> pd.DataFrame:
+    """Read ts/h/l/c for [start, end], pruning partitions by their ``dt=`` directory."""
+    return read_candles(data_dir, symbol, start, end, columns=("ts", "h", "l", "c"))
+
+
+def latest_candle_ts(data_dir: str, symbol: str) -> Optional[pd.Timestamp]:
+    """Newest candle timestamp, reading only the last partition's ``ts`` column."""
+    parts = sorted((pathlib.Path(data_dir) / symbol).rglob("*.parquet"))
+    for p in reversed(parts[-3:]):
+        ts = pd.read_parquet(p, columns=["ts"])["ts"]
+        if len(ts):
+            return pd.to_datetime(ts, utc=True).max()
+    return None
+
+
+def compute_outcomes(asof: Sequence[datetime], candles: pd.DataFrame, minutes: int) -> pd.DataFrame:
+    """Outcome rows for ``asof`` timestamps against a ts-sorted ts/h/l/c frame."""
+    sig = pd.DataFrame({"asof_ts": pd.to_datetime(list(asof), utc=True)})
+    sig["target_ts"] = sig["asof_ts"] + pd.Timedelta(minutes=int(minutes))
+    ts = candles["ts"].to_numpy()
+    c = candles["c"].to_numpy(dtype=float)
+    h = candles["h"].to_numpy(dtype=float)
+    lo = candles["l"].to_numpy(dtype=float)
+
+    # Index of the last candle at/just before each timestamp (-1: none).
+    i0 = np.searchsorted(ts, sig["asof_ts"].to_numpy(), side="right") - 1
+    i1 = np.searchsorted(ts, sig["target_ts"].to_numpy(), side="right") - 1
+
+    n = len(sig)
+    c0 = np.full(n, np.nan)
+    c1 = np.full(n, np.nan)
+    up = np.full(n, np.nan)
+    down = np.full(n, np.nan)
+    for k in range(n):
+        a, b = i0[k], i1[k]
+        if a < 0:
+            continue
+        c0[k] = c[a]
+        c1[k] = c[b]
+        if b > a:
+            up[k] = h[a + 1 : b + 1].max() - c[a]
+            down[k] = c[a] - lo[a + 1 : b + 1].min()
+        else:
+            up[k] = down[k] = 0.0
+    sig["c0"] = c0
+    sig["c1"] = c1
+    sig["realized_up"] = np.where(np.isnan(c0), np.nan, (c1 > c0).astype(float))
+    sig["up_excursion"] = up
+    sig["down_excursion"] = down
+    return sig
+
+
+@dataclass
+class OutcomeJob:
+    """Evaluates newly matured signals for one symbol/timeframe across horizons."""
+
+    store: Store
+    data_dir: str
+    symbol: str
+    timeframe: str
+    horizons: Iterable[str] = ("30m", "2h")
+    batch_size: int = 5000
+
+    def run(self, now: Optional[pd.Timestamp] = None) -> Dict[str, int]:
+        covered = latest_candle_ts(self.data_dir, self.symbol)
+        if now is not None and covered is not None:
+            covered = min(covered, pd.Timestamp(now))
+        done: Dict[str, int] = {}
+        for h in self.horizons:
+            done[h] = 0 if covered is None else self._run_horizon(h, covered)
+        return done
+
+    def _run_horizon(self, h: str, covered: pd.Timestamp) -> int:
+        minutes = horizon_minutes(h)
+        total = 0
+        while True:
+            pending = self.store.pending_outcomes(
+                horizon=h,
+                matured_before=covered.to_pydatetime(),
+                horizon_minutes=minutes,
+                symbol=self.symbol,
+                timeframe=self.timeframe,
+                limit=self.batch_size,
+            )
+            if not pending:
+                return total
+            # A day of slack so the close at/just before the first asof_ts is found across partitions.
+            start = pd.Timestamp(pending[0]) - pd.Timedelta(days=1)
+            end = pd.Timestamp(pending[-1]) + pd.Timedelta(minutes=minutes)
+            out = compute_outcomes(pending, load_candles(self.data_dir, self.symbol, start, end), minutes)
+            total += self.store.upsert_outcomes(_rows(out, h, self.symbol, self.timeframe))
+            if len(pending) < self.batch_size:
+                return total
+
+
+def _rows(out: pd.DataFrame, horizon: str, symbol: str, timeframe: str) -> List[Dict]:
+    cols = ["asof_ts", "target_ts", "c0", "c1", "realized_up", "up_excursion", "down_excursion"]
+    rows = []
+    for rec in out[cols].itertuples(index=False):
+        r = {k: (None if isinstance(v, float) and np.isnan(v) else v) for k, v in zip(cols, rec)}
+        r["asof_ts"] = parse_ts(r["asof_ts"].to_pydatetime())
+        r["target_ts"] = parse_ts(r["target_ts"].to_pydatetime())
+        if r["realized_up"] is not None:
+            r["realized_up"] = int(r["realized_up"])
+        rows.append(dict(r, horizon=horizon, symbol=symbol, timeframe=timeframe))
+    return rows
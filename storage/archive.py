@@ -0,0 +1,112 @@
+"""Cold storage for signal history: one zstd-compressed Parquet file per table-month.
+
+Layout::
+
+    <root>/<table>/month=YYYY-MM/part.parquet
+
+The store moves whole months here (see ``Store.archive_before``) and reads them
+back transparently when a query reaches past the hot window.
+"""
+
+from __future__ import annotations
+
+import os
+import pathlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+
+def month_start(ts: datetime) -> datetime:
+    ts = ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+    return ts.astimezone(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def next_month(ts: datetime) -> datetime:
+    m = month_start(ts)
+    return m.replace(year=m.year + 1, month=1) if m.month == 12 else m.replace(month=m.month + 1)
+
+
+@dataclass
+class SignalArchive:
+    root: str
+
+    def _dir(self, table: str, month: datetime) -> pathlib.Path:
+        return pathlib.Path(self.root) / table / f"month={month:%Y-%m}"
+
+    def months(self, table: str) -> List[datetime]:
+        base = pathlib.Path(self.root) / table
+        if not base.exists():
+            return []
+        out = []
+        for d in base.glob("month=*"):
+            if (d / "part.parquet").exists():
+                out.append(datetime.strptime(d.name[6:], "%Y-%m").replace(tzinfo=timezone.utc))
+        return sorted(out)
+
+    def write(self, table: str, month: datetime, df: pd.DataFrame, key: Sequence[str]) -> int:
+        """Merge ``df`` into the month's file (dedup on ``key``) via write-then-rename."""
+        d = self._dir(table, month_start(month))
+        d.mkdir(parents=True, exist_ok=True)
+        path = d / "part.parquet"
+        if path.exists():
+            df = pd.concat([pd.read_parquet(path), df], ignore_index=True)
+            df = df.drop_duplicates(subset=list(key), keep="last")
+        df = df.sort_values("asof_ts").reset_index(drop=True)
+        tmp = d / "part.parquet.tmp"
+        df.to_parquet(tmp, index=False, compression="zstd")
+        os.replace(tmp, path)
+        return len(df)
+
+    def read(
+        self,
+        table: str,
+        symbol: str,
+        timeframe: str,
+        horizon: str,
+        lo: Optional[datetime] = None,
+        hi: Optional[datetime] = None,
+        columns: Optional[Sequence[str]] = None,
+        limit: Optional[int] = None,
+        newest_first: bool = False,
+        realized_only: bool = False,
+    ) -> pd.DataFrame:
+        """Rows of one series with ``lo <= asof_ts < hi``, oldest first.
+
+        Months outside the range are skipped without being opened; the series and
+        time predicates are pushed down into the Parquet reader. With ``limit`` only
+        the oldest (``newest_first``: newest) ``limit`` rows are returned, and months
+        stop being opened once that many have been read. ``realized_only`` keeps only
+        outcome rows whose ``realized_up`` is known, like the hot outcome queries.
+        """
+        wanted = list(columns) if columns else None
+        if realized_only and wanted is not None and "realized_up" not in wanted:
+            wanted.append("realized_up")
+        frames = []
+        months = self.months(table)
+        n = 0
+        for m in reversed(months) if newest_first else months:
+            if limit is not None and n >= limit:
+                break
+            if (hi is not None and m >= hi) or (lo is not None and next_month(m) <= lo):
+                continue
+            filters: List[Tuple] = [("symbol", "==", symbol), ("timeframe", "==", timeframe), ("horizon", "==", horizon)]
+            if lo is not None:
+                filters.append(("asof_ts", ">=", pd.Timestamp(lo)))
+            if hi is not None:
+                filters.append(("asof_ts", "<", pd.Timestamp(hi)))
+            df = pd.read_parquet(self._dir(table, m) / "part.parquet", columns=wanted, filters=filters)
+            if realized_only:
+                df = df[df["realized_up"].notna()]
+            if df.empty:
+                continue
+            frames.append(df if columns is None else df[list(columns)])
+            n += len(df)
+        if not frames:
+            return pd.DataFrame(columns=list(columns) if columns else None)
+        df = pd.concat(frames, ignore_index=True).sort_values("asof_ts")
+        if limit is not None:
+            df = df.tail(limit) if newest_first else df.head(limit)
+        return df.reset_index(drop=True)
@@ -0,0 +1,109 @@
+"""Shared reader for the Parquet candle store (``<data_dir>/<symbol>/timeframe=1m/dt=YYYY-MM-DD/*.parquet``).
+
+``read_candles`` only touches what a caller asks for:
+
+- partitions whose ``dt=`` key lies outside ``[start, end]`` are skipped without being opened
+  (files without a ``dt=`` directory are always read, then filtered); a date-only ``end``
+  such as ``"2024-01-02"`` covers that whole day (``ts < 2024-01-03``);
+- only the requested columns are decoded, so the per-row ``symbol``/``timeframe``/``source``
+  strings are never materialised;
+- the ``ts`` bounds are pushed into the Parquet reader, which skips row groups by their
+  statistics and filters the rest before conversion to pandas;
+- partitions are read concurrently on a thread pool (pyarrow releases the GIL while decoding).
+"""
+
+from __future__ import annotations
+
+import pathlib
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from typing import List, Optional, Sequence, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+CANDLE_COLUMNS = ("ts", "o", "h", "l", "c", "v")
+_DATE_ONLY = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+def _ts(value) -> Optional[pd.Timestamp]:
+    if value is None:
+        return None
+    ts = pd.Timestamp(value)
+    return ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+
+
+def _end(value) -> Tuple[Optional[pd.Timestamp], bool]:
+    """(bound, exclusive): a date-only ``end`` means the end of that day, i.e. ``ts < end + 1 day``."""
+    if value is None:
+        return None, False
+    day = isinstance(value, date) and not isinstance(value, datetime)
+    if day or (isinstance(value, str) and _DATE_ONLY.match(value.strip())):
+        return _ts(value) + pd.Timedelta(days=1), True
+    return _ts(value), False
+
+
+def partitions(data_dir: str, symbol: str, start=None, end=None) -> List[pathlib.Path]:
+    """Parquet files under ``<data_dir>/<symbol>`` whose ``dt=`` key overlaps [start, end]."""
+    start = _ts(start)
+    end, exclusive = _end(end)
+    d0 = start.date().isoformat() if start is not None else None
+    d1 = end.date().isoformat() if end is not None else None
+    out = []
+    for p in sorted((pathlib.Path(data_dir) / symbol).rglob("*.parquet")):
+        dt = next((seg[3:] for seg in p.parts if seg.startswith("dt=")), None)
+        if dt is not None and ((d0 and dt < d0) or (d1 and (dt >= d1 if exclusive else dt > d1))):
+            continue
+        out.append(p)
+    return out
+
+
+def read_partition(path, columns: Sequence[str] = CANDLE_COLUMNS, start=None, end=None) -> pd.DataFrame:
+    """One file: present ``columns`` only, rows with ``start <= ts <= end`` (date-only ``end``: that whole day), ``ts`` as UTC."""
+    start = _ts(start)
+    end, exclusive = _end(end)
+    schema = pq.read_schema(path)
+    cols = [c for c in columns if c in schema.names]
+    expr = None
+    if (start is not None or end is not None) and "ts" in schema.names:
+        ts_type = schema.field("ts").type
+        if pa.types.is_timestamp(ts_type):
+            # Compare in the file's own unit/zone so the bound is pushed down without a cast.
+            def bound(t: pd.Timestamp):
+                return pa.scalar(t if ts_type.tz else t.tz_convert(None), type=ts_type)
+
+            for op, t in ((pc.greater_equal, start), (pc.less if exclusive else pc.less_equal, end)):
+                if t is not None:
+                    cond = op(pc.field("ts"), bound(t))
+                    expr = cond if expr is None else expr & cond
+    df = pq.read_table(path, columns=cols, filters=expr).to_pandas()
+    if "ts" in df:
+        df["ts"] = pd.to_datetime(df["ts"], utc=True)
+        if expr is None and (start is not None or end is not None):
+            # ts stored in a non-timestamp type: filter after conversion.
+            if start is not None:
+                df = df[df["ts"] >= start]
+            if end is not None:
+                df = df[df["ts"] < end] if exclusive else df[df["ts"] <= end]
+    return df
+
+
+def read_candles(
+    data_dir: str,
+    symbol: str,
+    start=None,
+    end=None,
+    columns: Sequence[str] = CANDLE_COLUMNS,
+    threads: int = 8,
+) -> pd.DataFrame:
+    """ts-sorted candles of ``symbol`` in [start, end] (either bound optional), ``columns`` only."""
+    parts = partitions(data_dir, symbol, start, end)
+    if not parts:
+        return pd.DataFrame({c: pd.Series([], dtype="datetime64[ns, UTC]" if c == "ts" else float) for c in columns})
+    with ThreadPoolExecutor(max(min(int(threads), len(parts)), 1)) as pool:
+        frames = list(pool.map(lambda p: read_partition(p, columns, start, end), parts))
+    df = pd.concat(frames, ignore_index=True)
+    return df.sort_values("ts", kind="stable").reset_index(drop=True)
@@ -1,31 +1,68 @@
 from __future__ import annotations
 
 import json
+import logging
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timezone, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
+import pandas as pd
+import pyarrow as pa
 from sqlalchemy import (
     DateTime,
     Float,
     Index,
     Integer,
     String,
+    Table,
     UniqueConstraint,
+    and_,
+    case,
     create_engine,
+    delete,
+    func,
     select,
+    update,
 )
 from sqlalchemy.types import JSON
-from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.engine import Engine
-from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from storage.archive import SignalArchive, month_start, next_month
+
+logger = logging.getLogger(__name__)
 
 
 def utc_now() -> datetime:
     return datetime.now(timezone.utc)
 
 
+def parse_ts(value: Any) -> Optional[datetime]:
+    """Parse an ISO timestamp (``Z`` suffix allowed) into an aware UTC datetime."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        ts = value
+    else:
+        ts = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if ts.tzinfo is None:
+        return ts.replace(tzinfo=timezone.utc)
+    return ts.astimezone(timezone.utc)
+
+
+def iso_z(ts: Optional[datetime]) -> Optional[str]:
+    # SQLite hands back naive datetimes; everything we store is UTC.
+    if ts is None:
+        return None
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
 def default_db_url() -> str:
     # Prefer Postgres/RDS via DB_URL, otherwise fall back to sqlite file.
     db_url = os.getenv("DB_URL")
@@ -42,11 +79,13 @@ class Base(DeclarativeBase):
 class Signal(Base):
     __tablename__ = "signals"
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    asof_ts: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
-    horizon: Mapped[str] = mapped_column(String, nullable=False)
-    symbol: Mapped[str] = mapped_column(String, nullable=False)
-    timeframe: Mapped[str] = mapped_column(String, nullable=False)
+    # Natural key as primary key: Postgres requires the partition column (asof_ts)
+    # in every unique constraint of a partitioned table. Tables created before this
+    # keep their surrogate id, which nothing reads.
+    asof_ts: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    horizon: Mapped[str] = mapped_column(String, primary_key=True)
+    symbol: Mapped[str] = mapped_column(String, primary_key=True)
+    timeframe: Mapped[str] = mapped_column(String, primary_key=True)
 
     side: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     prob_up: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
@@ -65,126 +104,802 @@ class Signal(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
 
     __table_args__ = (
-        UniqueConstraint("asof_ts", "horizon", "symbol", "timeframe", name="uq_signals_key"),
         Index("idx_signals_lookup", "symbol", "timeframe", "horizon", "asof_ts"),
+        # Month-range scans for retention (SQLite has no partitions to drop).
+        Index("idx_signals_asof", "asof_ts"),
+        # Monthly partitions are created by Store.ensure_partitions.
+        {"postgresql_partition_by": "RANGE (asof_ts)"},
+    )
+
+
+# Columns selectable through Store.query_signals. ``raw`` is only loaded on request.
+SIGNAL_FIELDS: Tuple[str, ...] = (
+    "asof_ts",
+    "horizon",
+    "symbol",
+    "timeframe",
+    "side",
+    "prob_up",
+    "expected_move",
+    "entry_type",
+    "entry_px",
+    "sl_px",
+    "tp_px",
+    "size",
+    "tif",
+    "source",
+    "created_at",
+    "raw",
+)
+_TS_FIELDS = ("asof_ts", "created_at", "target_ts")
+
+
+@dataclass
+class SignalPage:
+    """One keyset page of projected signal rows (tuples in ``fields`` order)."""
+
+    fields: Tuple[str, ...]
+    rows: List[Tuple[Any, ...]]
+    next_cursor: Optional[str]
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def columns(self) -> Dict[str, List[Any]]:
+        """Columnar view: one list per field, timestamps left as datetimes."""
+        if not self.rows:
+            return {f: [] for f in self.fields}
+        return {f: list(col) for f, col in zip(self.fields, zip(*self.rows))}
+
+    def records(self) -> List[Dict[str, Any]]:
+        """JSON-ready dicts with ISO ``Z`` timestamps."""
+        ts_idx = [i for i, f in enumerate(self.fields) if f in _TS_FIELDS]
+        out: List[Dict[str, Any]] = []
+        for r in self.rows:
+            vals = list(r)
+            for i in ts_idx:
+                vals[i] = iso_z(vals[i])
+            out.append(dict(zip(self.fields, vals)))
+        return out
+
+    def to_arrow(self) -> pa.Table:
+        """Arrow table built column by column; timestamps become UTC, ``raw`` JSON text."""
+        arrays = []
+        for f, col in self.columns().items():
+            if f in _TS_FIELDS:
+                arrays.append(pa.array(pd.to_datetime(pd.Series(col, dtype=object), utc=True)))
+            elif f == "raw":
+                arrays.append(pa.array([None if v is None else json.dumps(v) for v in col], type=pa.string()))
+            else:
+                arrays.append(pa.array(col))
+        return pa.Table.from_arrays(arrays, names=list(self.fields))
+
+
+def signal_row(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten a /signals/latest payload into a ``signals`` table row."""
+    asof_raw = payload.get("asof_ts") or payload.get("asof") or payload.get("now")
+    try:
+        asof_ts = parse_ts(asof_raw) or utc_now()
+    except Exception:
+        asof_ts = utc_now()
+    suggestion = payload.get("suggestion") or {}
+    return dict(
+        asof_ts=asof_ts,
+        horizon=str(payload.get("horizon", "30m")),
+        symbol=str(payload.get("symbol", os.getenv("SYMBOL", "GBPUSD"))),
+        timeframe=str(payload.get("timeframe", f"{os.getenv('BAR_MINUTES','5')}m")),
+        side=payload.get("side"),
+        prob_up=payload.get("prob_up"),
+        expected_move=payload.get("expected_move"),
+        entry_type=suggestion.get("entry_type"),
+        entry_px=suggestion.get("entry_px"),
+        sl_px=suggestion.get("sl_px"),
+        tp_px=suggestion.get("tp_px"),
+        size=suggestion.get("size"),
+        tif=suggestion.get("tif"),
+        source=payload.get("source"),
+        raw=payload,
+        created_at=utc_now(),
+    )
+
+
+class SignalRollup(Base):
+    """Per-hour/day aggregates of ``signals``, maintained by the store on every upsert."""
+
+    __tablename__ = "signal_rollups"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    symbol: Mapped[str] = mapped_column(String, nullable=False)
+    timeframe: Mapped[str] = mapped_column(String, nullable=False)
+    horizon: Mapped[str] = mapped_column(String, nullable=False)
+    bucket: Mapped[str] = mapped_column(String, nullable=False)  # "1h" | "1d"
+    bucket_ts: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    n: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    n_buy: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    n_sell: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    n_prob: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    sum_prob_up: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    # Realized outcomes, filled in once a signal's horizon has been evaluated.
+    n_outcome: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    hits: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    n_brier: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    sum_brier: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("symbol", "timeframe", "horizon", "bucket", "bucket_ts", name="uq_signal_rollups_key"),
+    )
+
+
+class SignalOutcome(Base):
+    """Realized market path for a signal once its horizon has elapsed.
+
+    Only direction-independent facts are stored; hit/MFE/MAE are derived from the
+    signal's side at read time, so re-upserting a signal never leaves a stale row.
+    """
+
+    __tablename__ = "signal_outcomes"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    asof_ts: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    horizon: Mapped[str] = mapped_column(String, nullable=False)
+    symbol: Mapped[str] = mapped_column(String, nullable=False)
+    timeframe: Mapped[str] = mapped_column(String, nullable=False)
+
+    target_ts: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    # Null when no candle covers the signal; the row still marks it as processed.
+    c0: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    c1: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    realized_up: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    up_excursion: Mapped[Optional[float]] = mapped_column(Float, nullable=True)  # max(h) - c0
+    down_excursion: Mapped[Optional[float]] = mapped_column(Float, nullable=True)  # c0 - min(l)
+    evaluated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("asof_ts", "horizon", "symbol", "timeframe", name="uq_signal_outcomes_key"),
+        Index("idx_signal_outcomes_lookup", "symbol", "timeframe", "horizon", "asof_ts"),
     )
 
 
+_SIGNAL_KEY = ("asof_ts", "horizon", "symbol", "timeframe")
+_ROLLUP_KEY = ("symbol", "timeframe", "horizon", "bucket", "bucket_ts")
+_UPSERT_CHUNK = 500
+
+ROLLUP_BUCKETS = ("1h", "1d")
+
+
+def bucket_start(ts: datetime, bucket: str) -> datetime:
+    ts = parse_ts(ts)
+    if bucket == "1h":
+        return ts.replace(minute=0, second=0, microsecond=0)
+    if bucket == "1d":
+        return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+    raise ValueError(f"Unknown rollup bucket: {bucket}")
+
+
+def _outcome_join():
+    return and_(*[getattr(SignalOutcome, k) == getattr(Signal, k) for k in _SIGNAL_KEY])
+
+
+def _is_buy():
+    # Anything that is not an explicit buy counts as a sell, as the evaluator always has.
+    return func.lower(func.coalesce(Signal.side, "")) == "buy"
+
+
+OUTCOME_FIELDS: Tuple[str, ...] = (
+    "asof_ts", "target_ts", "side", "prob_up", "c0", "c1", "realized_up", "hit", "mfe", "mae",
+)
+
+
+def _outcome_columns() -> Dict[str, Any]:
+    O = SignalOutcome
+    buy = _is_buy()
+    return {
+        "asof_ts": Signal.asof_ts,
+        "target_ts": O.target_ts,
+        "side": Signal.side,
+        "prob_up": Signal.prob_up,
+        "c0": O.c0,
+        "c1": O.c1,
+        "realized_up": O.realized_up,
+        "hit": case((buy, O.realized_up), else_=1 - O.realized_up),
+        "mfe": case((buy, O.up_excursion), else_=O.down_excursion),
+        "mae": case((buy, O.down_excursion), else_=O.up_excursion),
+    }
+
+
+def _from_archive(col: str, value: Any) -> Any:
+    """Parquet value -> what the SQL path would have returned for ``col``."""
+    if value is None or (isinstance(value, float) and value != value):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    if col == "raw" and isinstance(value, str):
+        return json.loads(value)
+    if hasattr(value, "item"):  # numpy scalar
+        return value.item()
+    return value
+
+
+def _upsert(conn: Connection, table: Table, rows: List[Dict[str, Any]], key: Sequence[str]) -> None:
+    """Insert-or-update ``rows`` on ``key`` inside the caller's transaction.
+
+    Postgres and SQLite use native ``INSERT .. ON CONFLICT DO UPDATE``; other
+    dialects fall back to update-then-insert per row.
+    """
+    if not rows:
+        return
+    dialect = conn.dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = pg_insert if dialect == "postgresql" else sqlite_insert
+        # Chunked to stay under the bound-parameter limit of either backend.
+        for i in range(0, len(rows), _UPSERT_CHUNK):
+            stmt = insert(table).values(rows[i : i + _UPSERT_CHUNK])
+            update_cols = {c: stmt.excluded[c] for c in rows[0] if c not in key}
+            conn.execute(stmt.on_conflict_do_update(index_elements=list(key), set_=update_cols))
+        return
+    for row in rows:
+        res = conn.execute(update(table).where(*[table.c[k] == row[k] for k in key]).values(**row))
+        if res.rowcount == 0:
+            conn.execute(table.insert().values(**row))
+
+
+def _partition_name(month: datetime) -> str:
+    return f"signals_y{month:%Y}m{month:%m}"
+
+
 @dataclass
 class Store:
     engine: Engine
+    archive: Optional[SignalArchive] = None
+    _ready: bool = field(default=False, init=False, repr=False)
+    _partitioned: bool = field(default=False, init=False, repr=False)
+    _partitions: Set[datetime] = field(default_factory=set, init=False, repr=False)
 
     def init(self) -> None:
+        # create_all costs a round of catalog queries; only pay it once per Store.
+        if self._ready:
+            return
         Base.metadata.create_all(self.engine)
+        if self.engine.dialect.name == "postgresql":
+            with self.engine.begin() as conn:
+                kind = conn.exec_driver_sql("SELECT relkind FROM pg_class WHERE relname = 'signals'").scalar()
+                # Tables created before partitioning stay plain; retention then deletes by range.
+                self._partitioned = kind == "p"
+                if self._partitioned:
+                    conn.exec_driver_sql("CREATE TABLE IF NOT EXISTS signals_default PARTITION OF signals DEFAULT")
+        self._ready = True
+        if self._partitioned:
+            now = month_start(utc_now())
+            self.ensure_partitions([now, next_month(now), next_month(next_month(now))])
+
+    def ensure_partitions(self, months: Iterable[datetime]) -> None:
+        """Create the monthly ``signals`` partitions covering ``months`` (Postgres only)."""
+        if not self._partitioned:
+            return
+        for m in sorted({month_start(m) for m in months} - self._partitions):
+            try:
+                with self.engine.begin() as conn:
+                    conn.exec_driver_sql(
+                        f"CREATE TABLE IF NOT EXISTS {_partition_name(m)} PARTITION OF signals "
+                        f"FOR VALUES FROM ('{m.isoformat()}') TO ('{next_month(m).isoformat()}')"
+                    )
+            except Exception as e:
+                # The default partition already holds rows for this month; they stay there.
+                logger.warning("could not create partition %s: %s", _partition_name(m), e)
+            self._partitions.add(m)
 
     def upsert_signal(self, payload: Dict[str, Any]) -> None:
+        self.upsert_signals([payload])
+
+    def upsert_signals(self, payloads: Iterable[Dict[str, Any]]) -> int:
+        """Bulk upsert keyed on (asof_ts, horizon, symbol, timeframe); one transaction.
+
+        The hour/day rollups covering the written rows are rebuilt in the same
+        transaction, so readers never see signals without their aggregates.
+        """
         self.init()
+        # Last write wins for duplicate keys within a batch (ON CONFLICT rejects them).
+        rows = list({tuple(r[k] for k in _SIGNAL_KEY): r for r in map(signal_row, payloads)}.values())
+        if not rows:
+            return 0
+        spans: Dict[Tuple[str, str, str], Tuple[datetime, datetime]] = {}
+        for r in rows:
+            series = (r["symbol"], r["timeframe"], r["horizon"])
+            lo, hi = spans.get(series, (r["asof_ts"], r["asof_ts"]))
+            spans[series] = (min(lo, r["asof_ts"]), max(hi, r["asof_ts"]))
 
-        asof_raw = payload.get("asof_ts") or payload.get("asof") or payload.get("now")
-        try:
-            asof_ts = datetime.fromisoformat(str(asof_raw).replace("Z", "+00:00")) if asof_raw else utc_now()
-            if asof_ts.tzinfo is None:
-                asof_ts = asof_ts.replace(tzinfo=timezone.utc)
-        except Exception:
-            asof_ts = utc_now()
-        horizon = str(payload.get("horizon", "30m"))
-        symbol = str(payload.get("symbol", os.getenv("SYMBOL", "GBPUSD")))
-        timeframe = str(payload.get("timeframe", f"{os.getenv('BAR_MINUTES','5')}m"))
-        suggestion = payload.get("suggestion") or {}
-
-        row = dict(
-            asof_ts=asof_ts,
-            horizon=horizon,
-            symbol=symbol,
-            timeframe=timeframe,
-            side=payload.get("side"),
-            prob_up=payload.get("prob_up"),
-            expected_move=payload.get("expected_move"),
-            entry_type=suggestion.get("entry_type"),
-            entry_px=suggestion.get("entry_px"),
-            sl_px=suggestion.get("sl_px"),
-            tp_px=suggestion.get("tp_px"),
-            size=suggestion.get("size"),
-            tif=suggestion.get("tif"),
-            source=payload.get("source"),
-            raw=payload,
-            created_at=utc_now(),
-        )
+        self.ensure_partitions(r["asof_ts"] for r in rows)
+        with self.engine.begin() as conn:
+            _upsert(conn, Signal.__table__, rows, _SIGNAL_KEY)
+            self._rebuild_rollups(conn, spans)
+        return len(rows)
 
-        db_url = str(self.engine.url)
-        is_sqlite = db_url.startswith("sqlite")
+    def _rebuild_rollups(self, conn: Connection, spans: Dict[Tuple[str, str, str], Tuple[datetime, datetime]]) -> int:
+        """Recompute every hour/day bucket overlapping each series' [lo, hi] span.
 
-        with Session(self.engine) as s:
-            # Cross-DB "upsert": lookup then update/insert. Fine for MVP volumes.
-            existing = s.scalar(
-                select(Signal).where(
-                    Signal.asof_ts == asof_ts,
-                    Signal.horizon == horizon,
+        Buckets are rebuilt from the source rows (rather than patched with deltas)
+        so re-upserting a signal with a different side/prob stays exact.
+        """
+        written = 0
+        for (symbol, timeframe, horizon), (lo, hi) in spans.items():
+            start = bucket_start(lo, "1d")
+            end = bucket_start(hi, "1d") + timedelta(days=1)
+            src = conn.execute(
+                select(Signal.asof_ts, Signal.side, Signal.prob_up, SignalOutcome.realized_up)
+                .outerjoin(SignalOutcome, _outcome_join())
+                .where(
                     Signal.symbol == symbol,
                     Signal.timeframe == timeframe,
+                    Signal.horizon == horizon,
+                    Signal.asof_ts >= start,
+                    Signal.asof_ts < end,
                 )
             )
-            if existing:
-                for k, v in row.items():
-                    setattr(existing, k, v)
-            else:
-                s.add(Signal(**row))
-            s.commit()
+            agg: Dict[Tuple[str, datetime], Dict[str, Any]] = {}
+            now = utc_now()
+            for asof_ts, side, prob_up, realized_up in src:
+                side = str(side or "").lower()
+                for b in ROLLUP_BUCKETS:
+                    a = agg.setdefault(
+                        (b, bucket_start(asof_ts, b)),
+                        dict(
+                            n=0, n_buy=0, n_sell=0, n_prob=0, sum_prob_up=0.0,
+                            n_outcome=0, hits=0, n_brier=0, sum_brier=0.0,
+                        ),
+                    )
+                    a["n"] += 1
+                    a["n_buy"] += side == "buy"
+                    a["n_sell"] += side == "sell"
+                    if prob_up is not None:
+                        a["n_prob"] += 1
+                        a["sum_prob_up"] += float(prob_up)
+                    if realized_up is not None:
+                        a["n_outcome"] += 1
+                        a["hits"] += int((side == "buy") == bool(realized_up))
+                        if prob_up is not None:
+                            a["n_brier"] += 1
+                            a["sum_brier"] += (float(prob_up) - float(realized_up)) ** 2
+            out = [
+                dict(symbol=symbol, timeframe=timeframe, horizon=horizon, bucket=b, bucket_ts=ts, updated_at=now, **a)
+                for (b, ts), a in agg.items()
+            ]
+            _upsert(conn, SignalRollup.__table__, out, _ROLLUP_KEY)
+            written += len(out)
+        return written
 
-    def fetch_signals(
+    def refresh_rollups(self, days: int = 3650, window_days: int = 31) -> int:
+        """Periodic/backfill job: rebuild rollups for every series over the last ``days``.
+
+        Works through ``window_days`` slices so memory stays bounded on long histories.
+        """
+        self.init()
+        end = utc_now()
+        start = bucket_start(end - timedelta(days=max(1, int(days))), "1d")
+        with self.engine.connect() as conn:
+            series = conn.execute(
+                select(Signal.symbol, Signal.timeframe, Signal.horizon).where(Signal.asof_ts >= start).distinct()
+            ).all()
+        written = 0
+        lo = start
+        while lo < end:
+            hi = lo + timedelta(days=window_days) - timedelta(microseconds=1)
+            with self.engine.begin() as conn:
+                written += self._rebuild_rollups(conn, {tuple(s): (lo, min(hi, end)) for s in series})
+            lo = hi + timedelta(microseconds=1)
+        return written
+
+    def signal_symbols(self, timeframe: Optional[str] = None) -> List[str]:
+        """Symbols with stored signals for ``timeframe``, read from the (small) rollup table."""
+        self.init()
+        timeframe = timeframe or f"{os.getenv('BAR_MINUTES','5')}m"
+        stmt = select(SignalRollup.symbol).where(SignalRollup.timeframe == timeframe).distinct()
+        with self.engine.connect() as conn:
+            return sorted(conn.execute(stmt).scalars())
+
+    def fetch_rollups(
         self,
         days: int = 30,
         horizon: str = "30m",
         symbol: Optional[str] = None,
         timeframe: Optional[str] = None,
-        limit: int = 5000,
+        bucket: str = "1h",
     ) -> List[Dict[str, Any]]:
+        """Pre-aggregated per-bucket stats, oldest first."""
         self.init()
+        if bucket not in ROLLUP_BUCKETS:
+            raise ValueError(f"Unknown rollup bucket: {bucket}")
         days = max(1, min(int(days), 3650))
-        limit = max(1, min(int(limit), 20000))
         symbol = symbol or os.getenv("SYMBOL", "GBPUSD")
         timeframe = timeframe or f"{os.getenv('BAR_MINUTES','5')}m"
+        cutoff = bucket_start(utc_now() - timedelta(days=days), bucket)
 
-        with Session(self.engine) as s:
-            cutoff = utc_now() - timedelta(days=days)
-            rows = s.scalars(
-                select(Signal)
-                .where(
-                    Signal.symbol == symbol,
-                    Signal.timeframe == timeframe,
-                    Signal.horizon == horizon,
-                    Signal.asof_ts >= cutoff,
-                )
-                .order_by(Signal.asof_ts.asc())
-                .limit(limit)
-            ).all()
+        R = SignalRollup
+        stmt = (
+            select(
+                R.bucket_ts, R.n, R.n_buy, R.n_sell, R.n_prob, R.sum_prob_up,
+                R.n_outcome, R.hits, R.n_brier, R.sum_brier,
+            )
+            .where(
+                R.symbol == symbol,
+                R.timeframe == timeframe,
+                R.horizon == horizon,
+                R.bucket == bucket,
+                R.bucket_ts >= cutoff,
+            )
+            .order_by(R.bucket_ts.asc())
+        )
+        with self.engine.connect() as conn:
+            rows = conn.execute(stmt).all()
+        return [
+            {
+                "bucket_ts": iso_z(ts),
+                "n": n,
+                "n_buy": n_buy,
+                "n_sell": n_sell,
+                "mean_prob_up": (sp / n_prob) if n_prob else None,
+                "n_outcome": n_out,
+                "hit_rate": (hits / n_out) if n_out else None,
+                "brier": (sb / n_brier) if n_brier else None,
+            }
+            for ts, n, n_buy, n_sell, n_prob, sp, n_out, hits, n_brier, sb in rows
+        ]
 
-        out: List[Dict[str, Any]] = []
+    def pending_outcomes(
+        self,
+        horizon: str,
+        matured_before: datetime,
+        horizon_minutes: int,
+        symbol: Optional[str] = None,
+        timeframe: Optional[str] = None,
+        limit: int = 5000,
+    ) -> List[datetime]:
+        """``asof_ts`` of signals whose horizon ends by ``matured_before`` and that have no outcome yet."""
+        self.init()
+        symbol = symbol or os.getenv("SYMBOL", "GBPUSD")
+        timeframe = timeframe or f"{os.getenv('BAR_MINUTES','5')}m"
+        latest_asof = parse_ts(matured_before) - timedelta(minutes=int(horizon_minutes))
+        stmt = (
+            select(Signal.asof_ts)
+            .outerjoin(SignalOutcome, _outcome_join())
+            .where(
+                Signal.symbol == symbol,
+                Signal.timeframe == timeframe,
+                Signal.horizon == horizon,
+                Signal.asof_ts <= latest_asof,
+                SignalOutcome.id.is_(None),
+            )
+            .order_by(Signal.asof_ts.asc())
+            .limit(max(1, int(limit)))
+        )
+        with self.engine.connect() as conn:
+            return [parse_ts(ts) for ts in conn.execute(stmt).scalars()]
+
+    def upsert_outcomes(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """Persist outcome rows (SignalOutcome columns) and fold them into the rollups."""
+        self.init()
+        now = utc_now()
+        rows = [dict(r, asof_ts=parse_ts(r["asof_ts"]), target_ts=parse_ts(r["target_ts"]), evaluated_at=now) for r in rows]
+        if not rows:
+            return 0
+        spans: Dict[Tuple[str, str, str], Tuple[datetime, datetime]] = {}
         for r in rows:
-            out.append(
-                {
-                    "asof_ts": r.asof_ts.isoformat().replace("+00:00", "Z"),
-                    "horizon": r.horizon,
-                    "symbol": r.symbol,
-                    "timeframe": r.timeframe,
-                    "side": r.side,
-                    "prob_up": r.prob_up,
-                    "expected_move": r.expected_move,
-                    "entry_type": r.entry_type,
-                    "entry_px": r.entry_px,
-                    "sl_px": r.sl_px,
-                    "tp_px": r.tp_px,
-                    "size": r.size,
-                    "tif": r.tif,
-                    "source": r.source,
-                    "raw": r.raw,
-                    "created_at": r.created_at.isoformat() if isinstance(r.created_at, datetime) else str(r.created_at),
-                }
+            series = (r["symbol"], r["timeframe"], r["horizon"])
+            lo, hi = spans.get(series, (r["asof_ts"], r["asof_ts"]))
+            spans[series] = (min(lo, r["asof_ts"]), max(hi, r["asof_ts"]))
+        with self.engine.begin() as conn:
+            _upsert(conn, SignalOutcome.__table__, rows, _SIGNAL_KEY)
+            self._rebuild_rollups(conn, spans)
+        return len(rows)
+
+    def query_outcomes(
+        self,
+        fields: Optional[Sequence[str]] = None,
+        days: int = 30,
+        horizon: str = "30m",
+        symbol: Optional[str] = None,
+        timeframe: Optional[str] = None,
+        limit: int = 5000,
+        cursor: Optional[str] = None,
+    ) -> SignalPage:
+        """Evaluated signals (outcome joined to its signal), keyset-paged on ``asof_ts``."""
+        self.init()
+        days = max(1, min(int(days), 3650))
+        limit = max(1, min(int(limit), 20000))
+        symbol = symbol or os.getenv("SYMBOL", "GBPUSD")
+        timeframe = timeframe or f"{os.getenv('BAR_MINUTES','5')}m"
+        exprs = _outcome_columns()
+        wanted = tuple(fields) if fields else OUTCOME_FIELDS
+        unknown = [f for f in wanted if f not in exprs]
+        if unknown:
+            raise ValueError(f"Unknown outcome fields: {unknown}")
+        cols = wanted if "asof_ts" in wanted else ("asof_ts",) + wanted
+
+        cutoff = utc_now() - timedelta(days=days)
+        stmt = (
+            select(*[exprs[c] for c in cols])
+            .join(SignalOutcome, _outcome_join())
+            .where(
+                Signal.symbol == symbol,
+                Signal.timeframe == timeframe,
+                Signal.horizon == horizon,
+                Signal.asof_ts >= cutoff,
+                SignalOutcome.realized_up.is_not(None),
             )
+        )
+        after = parse_ts(cursor)
+        if after is not None:
+            stmt = stmt.where(Signal.asof_ts > after)
+        stmt = stmt.order_by(Signal.asof_ts.asc()).limit(limit)
+        with self.engine.connect() as conn:
+            rows = [tuple(r) for r in conn.execute(stmt)]
+        rows = self._with_archive("signal_outcomes", (symbol, timeframe, horizon), cols, rows, cutoff, after, False, limit)
+        next_cursor = iso_z(rows[-1][cols.index("asof_ts")]) if len(rows) == limit else None
+        if cols != wanted:
+            rows = [r[1:] for r in rows]
+        return SignalPage(fields=wanted, rows=rows, next_cursor=next_cursor)
+
+    def outcome_summary(
+        self,
+        days: int = 30,
+        horizon: str = "30m",
+        symbol: Optional[str] = None,
+        timeframe: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Count / directional accuracy / Brier over evaluated signals, aggregated in SQL."""
+        self.init()
+        days = max(1, min(int(days), 3650))
+        symbol = symbol or os.getenv("SYMBOL", "GBPUSD")
+        timeframe = timeframe or f"{os.getenv('BAR_MINUTES','5')}m"
+        exprs = _outcome_columns()
+        y = SignalOutcome.realized_up
+        cutoff = utc_now() - timedelta(days=days)
+        stmt = (
+            select(
+                func.count(),
+                func.sum(exprs["hit"]),
+                func.count(Signal.prob_up),
+                func.sum((Signal.prob_up - y) * (Signal.prob_up - y)),
+            )
+            .select_from(Signal)
+            .join(SignalOutcome, _outcome_join())
+            .where(
+                Signal.symbol == symbol,
+                Signal.timeframe == timeframe,
+                Signal.horizon == horizon,
+                Signal.asof_ts >= cutoff,
+                y.is_not(None),
+            )
+        )
+        with self.engine.connect() as conn:
+            n, hits, n_brier, sum_brier = (v or 0 for v in conn.execute(stmt).one())
+        if self.archive is not None:
+            old = self.archive.read(
+                "signal_outcomes", symbol, timeframe, horizon, lo=cutoff,
+                columns=["asof_ts", "prob_up", "realized_up", "hit"],
+            ).dropna(subset=["realized_up"])
+            n += len(old)
+            hits += int(old["hit"].sum())
+            scored = old.dropna(subset=["prob_up"])
+            n_brier += len(scored)
+            sum_brier += float(((scored["prob_up"] - scored["realized_up"]) ** 2).sum())
+        return {
+            "count": int(n),
+            "accuracy": float(hits) / n if n else 0.0,
+            "brier": float(sum_brier) / n_brier if n_brier else None,
+        }
+
+    def query_signals(
+        self,
+        fields: Optional[Sequence[str]] = None,
+        days: int = 30,
+        horizon: str = "30m",
+        symbol: Optional[str] = None,
+        timeframe: Optional[str] = None,
+        limit: int = 5000,
+        cursor: Optional[str] = None,
+        newest_first: bool = False,
+    ) -> SignalPage:
+        """Projected, keyset-paginated signal read.
+
+        Selects only ``fields`` as plain tuples (no ORM hydration; ``raw`` is excluded
+        unless asked for). ``asof_ts`` is unique per symbol/timeframe/horizon, so the
+        cursor is simply the last ``asof_ts`` of the previous page.
+        """
+        self.init()
+        days = max(1, min(int(days), 3650))
+        limit = max(1, min(int(limit), 20000))
+        symbol = symbol or os.getenv("SYMBOL", "GBPUSD")
+        timeframe = timeframe or f"{os.getenv('BAR_MINUTES','5')}m"
+
+        wanted = tuple(fields) if fields else tuple(f for f in SIGNAL_FIELDS if f != "raw")
+        unknown = [f for f in wanted if f not in SIGNAL_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown signal fields: {unknown}")
+        # asof_ts always rides along so the next cursor can be derived.
+        cols = wanted if "asof_ts" in wanted else ("asof_ts",) + wanted
+
+        cutoff = utc_now() - timedelta(days=days)
+        after = parse_ts(cursor)
+
+        stmt = select(*[getattr(Signal, c) for c in cols]).where(
+            Signal.symbol == symbol,
+            Signal.timeframe == timeframe,
+            Signal.horizon == horizon,
+        )
+        stmt = stmt.where(Signal.asof_ts >= cutoff)
+        if newest_first:
+            if after is not None:
+                stmt = stmt.where(Signal.asof_ts < after)
+            stmt = stmt.order_by(Signal.asof_ts.desc())
+        else:
+            if after is not None:
+                stmt = stmt.where(Signal.asof_ts > after)
+            stmt = stmt.order_by(Signal.asof_ts.asc())
+        stmt = stmt.limit(limit)
+
+        with self.engine.connect() as conn:
+            rows = [tuple(r) for r in conn.execute(stmt)]
+        rows = self._with_archive("signals", (symbol, timeframe, horizon), cols, rows, cutoff, after, newest_first, limit)
+
+        next_cursor = iso_z(rows[-1][cols.index("asof_ts")]) if len(rows) == limit else None
+        if cols != wanted:
+            rows = [r[1:] for r in rows]
+        return SignalPage(fields=wanted, rows=rows, next_cursor=next_cursor)
+
+    def _with_archive(
+        self,
+        table: str,
+        series: Tuple[str, str, str],
+        cols: Tuple[str, ...],
+        rows: List[Tuple[Any, ...]],
+        cutoff: datetime,
+        after: Optional[datetime],
+        newest_first: bool,
+        limit: int,
+    ) -> List[Tuple[Any, ...]]:
+        """Splice archived rows (always older than hot ones) into a hot keyset page."""
+        if self.archive is None or (newest_first and len(rows) == limit):
+            return rows
+        symbol, timeframe, horizon = series
+        i = cols.index("asof_ts")
+        if newest_first:
+            lo, hi = cutoff, after
+        else:
+            # Archived rows are all older than hot ones, so only those between the cursor
+            # and the page's first hot row can land on this page.
+            lo = max(cutoff, after) if after is not None else cutoff
+            hi = parse_ts(rows[0][i]) if rows else None
+        old = self.archive.read(
+            table, symbol, timeframe, horizon, lo=lo, hi=hi, columns=list(cols),
+            limit=limit + 1, newest_first=newest_first, realized_only=table == "signal_outcomes",
+        )
+        if not newest_first and after is not None:
+            old = old[old["asof_ts"] > pd.Timestamp(after)].head(limit)
+        if old.empty:
+            return rows
+        hot = {parse_ts(r[i]) for r in rows}
+        archived = []
+        for rec in old.itertuples(index=False):
+            vals = [_from_archive(c, v) for c, v in zip(cols, rec)]
+            if vals[i] not in hot:
+                archived.append(tuple(vals))
+        if newest_first:
+            return (rows + archived[::-1])[:limit]
+        return (archived + rows)[:limit]
+
+    def archive_before(self, before: datetime, lock_timeout: float = 5.0) -> Dict[str, Any]:
+        """Retention job: move every whole month older than ``before`` to the Parquet archive.
+
+        Signals and their joined outcomes are read, written and range-deleted in one
+        transaction per month; on Postgres that only locks the month's own partition
+        (waiting at most ``lock_timeout`` seconds, after which the run stops and the
+        month is reported under ``skipped``). The emptied partition is dropped
+        afterwards in its own short transaction, also bounded by ``lock_timeout``, so
+        live writers to the parent are never queued behind the Parquet write.
+        Re-running is safe: archive files are merged on the signal key, so a rollback
+        after the Parquet write only leaves rows the next run rewrites.
+        """
+        if self.archive is None:
+            raise ValueError("Store has no archive configured (set SIGNAL_ARCHIVE_DIR)")
+        self.init()
+        horizon_month = month_start(parse_ts(before))
+        with self.engine.connect() as conn:
+            oldest = conn.execute(select(func.min(Signal.asof_ts))).scalar()
+        out: Dict[str, Any] = {"months": [], "signals": 0, "outcomes": 0}
+        if oldest is None:
+            return out
+
+        sig_cols = [getattr(Signal, f) for f in SIGNAL_FIELDS]
+        out_exprs = _outcome_columns()
+        out_cols = [Signal.symbol, Signal.timeframe, Signal.horizon] + [
+            out_exprs[f].label(f) for f in OUTCOME_FIELDS
+        ]
+        m = month_start(parse_ts(oldest))
+        while m < horizon_month:
+            hi = next_month(m)
+            in_month = and_(Signal.asof_ts >= m, Signal.asof_ts < hi)
+            part = _partition_name(m)
+            try:
+                own_partition, n_sig, n_res = self._archive_month(m, in_month, sig_cols, out_cols, lock_timeout)
+            except OperationalError as e:
+                # Lock wait timed out: leave the month hot and let the next run pick it up.
+                logger.warning("archive of %s skipped: %s", f"{m:%Y-%m}", e)
+                out["skipped"] = f"{m:%Y-%m}"
+                return out
+            if n_sig:
+                out["months"].append(f"{m:%Y-%m}")
+                out["signals"] += n_sig
+                out["outcomes"] += n_res
+            if own_partition:
+                # Empty now; dropping it briefly needs the parent's lock, so bound that wait too.
+                try:
+                    with self.engine.begin() as conn:
+                        conn.exec_driver_sql(f"SET LOCAL lock_timeout = {int(lock_timeout * 1000)}")
+                        conn.exec_driver_sql(f"DROP TABLE IF EXISTS {part}")
+                except OperationalError as e:
+                    logger.warning("could not drop emptied partition %s (next run retries): %s", part, e)
+            self._partitions.discard(m)
+            m = hi
         return out
 
+    def _archive_month(
+        self, m: datetime, in_month: Any, sig_cols: List[Any], out_cols: List[Any], lock_timeout: float
+    ) -> Tuple[bool, int, int]:
+        """Archive and delete one month in a single transaction.
+
+        Returns (month had its own partition, signals archived, outcomes archived).
+        """
+        own_partition = False
+        with self.engine.begin() as conn:
+            if conn.dialect.name == "postgresql":
+                conn.exec_driver_sql(f"SET LOCAL lock_timeout = {int(lock_timeout * 1000)}")
+                part = _partition_name(m)
+                # Without its own partition the month lives in signals_default; lock the parent then.
+                own_partition = bool(self._partitioned and conn.exec_driver_sql(f"SELECT to_regclass('{part}')").scalar())
+                target = part if own_partition else "signals"
+                # Writers to this month wait, so nothing lands between the read and the delete unarchived.
+                conn.exec_driver_sql(f"LOCK TABLE {target}, signal_outcomes IN SHARE ROW EXCLUSIVE MODE")
+            sig = pd.DataFrame(conn.execute(select(*sig_cols).where(in_month)).all(), columns=list(SIGNAL_FIELDS))
+            res = pd.DataFrame(
+                conn.execute(select(*out_cols).join(SignalOutcome, _outcome_join()).where(in_month)).all(),
+                columns=["symbol", "timeframe", "horizon", *OUTCOME_FIELDS],
+            )
+            if not sig.empty:
+                sig["raw"] = sig["raw"].map(json.dumps)
+                for df in (sig, res):
+                    for c in ("asof_ts", "created_at", "target_ts"):
+                        if c in df:
+                            df[c] = pd.to_datetime(df[c], utc=True)
+                self.archive.write("signals", m, sig, _SIGNAL_KEY)
+                if not res.empty:
+                    self.archive.write("signal_outcomes", m, res, _SIGNAL_KEY)
+            conn.execute(delete(SignalOutcome).where(SignalOutcome.asof_ts >= m, SignalOutcome.asof_ts < next_month(m)))
+            conn.execute(delete(Signal).where(in_month))
+        return own_partition, len(sig), len(res)
+
+    def fetch_signals(
+        self,
+        days: int = 30,
+        horizon: str = "30m",
+        symbol: Optional[str] = None,
+        timeframe: Optional[str] = None,
+        limit: int = 5000,
+    ) -> List[Dict[str, Any]]:
+        page = self.query_signals(
+            fields=SIGNAL_FIELDS,
+            days=days,
+            horizon=horizon,
+            symbol=symbol,
+            timeframe=timeframe,
+            limit=limit,
+        )
+        return page.records()
+
 
-def get_store(db_url: Optional[str] = None) -> Store:
+def get_store(db_url: Optional[str] = None, archive_dir: Optional[str] = None) -> Store:
     url = db_url or default_db_url()
     engine = create_engine(url, pool_pre_ping=True)
-    return Store(engine=engine)
+    archive_dir = archive_dir or os.getenv("SIGNAL_ARCHIVE_DIR")
+    return Store(engine=engine, archive=SignalArchive(archive_dir) if archive_dir else None)
@@ -0,0 +1,19 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def make_ohlc(n=600, seed=0, symbol=None):
+    """Random-walk 5m bars around 1.25; ``symbol`` adds the string column training sees live."""
+    rng = np.random.default_rng(seed)
+    c = 1.25 + np.cumsum(rng.normal(0, 1e-3, n))
+    ts = pd.date_range("2024-01-01", periods=n, freq="5min", tz="UTC")
+    df = pd.DataFrame({"ts": ts, "o": c, "h": c + 5e-4, "l": c - 5e-4, "c": c, "v": 1.0})
+    if symbol is not None:
+        df["symbol"] = symbol
+    return df
+
+
+@pytest.fixture
+def ohlc():
+    return make_ohlc
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+from lightgbm import LGBMClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+from xgboost import XGBClassifier
+
+from models.artifact import MANIFEST, load_native, save_native
+from services.inference_api.model_cache import ModelCache
+
+
+def _fit(clf):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(300, 4)) * [1.0, 10.0, 0.01, 3.0]
+    y = (X[:, 0] + X[:, 1] / 10 > 0).astype(int)
+    pipe = Pipeline([("scaler", StandardScaler(with_mean=False)), ("clf", clf)])
+    return pipe.fit(X, y), X
+
+
+@pytest.mark.parametrize("clf", [
+    XGBClassifier(n_estimators=20, max_depth=3),
+    LGBMClassifier(n_estimators=20, verbose=-1),
+])
+def test_native_artifact_matches_pipeline(tmp_path, clf):
+    pipe, X = _fit(clf)
+    manifest = save_native(pipe, str(tmp_path), {"horizon": "30m", "features": ["a", "b", "c", "d"]})
+    assert set(manifest["files"]) == {"scale.npy", manifest["booster"]}
+
+    model = load_native(str(tmp_path / MANIFEST))
+    assert model.manifest["features"] == ["a", "b", "c", "d"]
+    np.testing.assert_allclose(model.predict_proba(X[:50]), pipe.predict_proba(X[:50]), rtol=1e-5, atol=1e-6)
+
+
+def test_checksum_mismatch_is_rejected(tmp_path):
+    pipe, _ = _fit(XGBClassifier(n_estimators=5))
+    save_native(pipe, str(tmp_path), {"features": ["a", "b", "c", "d"]})
+    with open(tmp_path / "scale.npy", "r+b") as f:
+        f.seek(-1, 2)
+        f.write(b"\x01")
+    with pytest.raises(ValueError, match="checksum"):
+        load_native(str(tmp_path / MANIFEST))
+
+
+def test_cache_prefers_native_artifact_over_pickle(tmp_path):
+    pipe, X = _fit(LGBMClassifier(n_estimators=10, verbose=-1))
+    out = tmp_path / "30m" / "2024-01-02"
+    save_native(pipe, str(out), {"horizon": "30m", "features": ["a", "b", "c", "d"]})
+    (out / "model.pkl").write_bytes(b"never unpickled")
+
+    loaded = ModelCache(str(tmp_path), check_every=3600).get("30m")
+    assert loaded.version == "2024-01-02" and loaded.path.endswith(MANIFEST)
+    assert loaded.meta["kind"] == "lightgbm"
+    assert loaded.model.predict_proba(X[:1]).shape == (1, 2)
@@ -0,0 +1,67 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from services.inference_api.candles import CandleBuffer
+
+
+def _write_day(root, day, start, n, bump=0.0):
+    ts = pd.date_range(start, periods=n, freq="min", tz="UTC")
+    c = 1.25 + np.arange(n) * 0.0001 + bump
+    df = pd.DataFrame({"ts": ts, "symbol": "GBPUSD", "timeframe": "1m", "o": c, "h": c, "l": c, "c": c, "v": 1, "source": "t"})
+    d = root / "GBPUSD" / "timeframe=1m" / f"dt={day}"
+    d.mkdir(parents=True, exist_ok=True)
+    path = d / f"{day}.parquet"
+    df.to_parquet(path, index=False)
+    return path
+
+
+def test_buffer_initial_window_and_tail_appends(tmp_path):
+    for i in range(4):
+        _write_day(tmp_path, f"2024-01-0{i + 1}", f"2024-01-0{i + 1}T00:00:00Z", 10)
+    buf = CandleBuffer(str(tmp_path), "GBPUSD", tail_partitions=2, check_every=3600)
+    df = buf.frame()
+    assert len(df) == 20
+    assert list(df.columns) == ["ts", "o", "h", "l", "c", "v"]
+    assert df["ts"].is_monotonic_increasing
+
+    held = buf.frame()
+    # The updater rewrites today's file with more bars, then a new day appears.
+    p = _write_day(tmp_path, "2024-01-04", "2024-01-04T00:00:00Z", 15)
+    st = os.stat(p)
+    os.utime(p, (st.st_atime, st.st_mtime + 5))
+    _write_day(tmp_path, "2024-01-05", "2024-01-05T00:00:00Z", 3)
+    assert buf.refresh() == 8
+    assert len(buf.frame()) == 28
+    assert len(held) == 20  # earlier snapshots are never mutated
+    assert buf.refresh() == 0
+
+
+def test_buffer_caps_rows_and_handles_missing_data(tmp_path):
+    assert CandleBuffer(str(tmp_path), "GBPUSD").frame() is None
+    _write_day(tmp_path, "2024-01-01", "2024-01-01T00:00:00Z", 50)
+    buf = CandleBuffer(str(tmp_path), "GBPUSD", max_rows=30, check_every=0)
+    df = buf.frame()
+    assert len(df) == 30
+    assert df["ts"].iloc[-1] == pd.Timestamp("2024-01-01T00:49:00Z")
+
+
+def test_buffer_merges_late_rewrite_of_previous_day(tmp_path):
+    _write_day(tmp_path, "2024-01-01", "2024-01-01T23:50:00Z", 5)
+    _write_day(tmp_path, "2024-01-02", "2024-01-02T00:00:00Z", 5)
+    buf = CandleBuffer(str(tmp_path), "GBPUSD", check_every=3600)
+    assert len(buf.frame()) == 10
+
+    # Today's partition moves on, then yesterday's file is rewritten with its last bars and a fix.
+    _write_day(tmp_path, "2024-01-02", "2024-01-02T00:00:00Z", 6)
+    assert buf.refresh() == 1
+    p = _write_day(tmp_path, "2024-01-01", "2024-01-01T23:50:00Z", 10, bump=0.01)
+    st = os.stat(p)
+    os.utime(p, (st.st_atime, st.st_mtime + 5))
+    assert buf.refresh() == 5
+    df = buf.frame()
+    assert len(df) == 16
+    assert df["ts"].is_monotonic_increasing and df["ts"].is_unique
+    day1 = df[df["ts"] < pd.Timestamp("2024-01-02", tz="UTC")]
+    assert (day1["c"] > 1.255).all()  # rewritten values replaced the resident ones
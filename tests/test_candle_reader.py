@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from models.train import load_parquet_dir
+from storage.candle_reader import partitions, read_candles, read_partition
+
+
+def _write(root, start, n, naive=False):
+    ts = pd.date_range(start, periods=n, freq="h", tz="UTC")
+    c = 1.25 + np.arange(n) * 1e-4
+    df = pd.DataFrame({"ts": ts, "symbol": "GBPUSD", "timeframe": "1m", "o": c, "h": c, "l": c, "c": c, "v": 1.0})
+    for dt, part in df.groupby(df["ts"].dt.date):
+        d = root / "GBPUSD" / "timeframe=1m" / f"dt={dt}"
+        d.mkdir(parents=True, exist_ok=True)
+        if naive:
+            part = part.assign(ts=part["ts"].dt.tz_convert(None))
+        part.to_parquet(d / f"{dt}.parquet", index=False, row_group_size=6)
+    return df
+
+
+def test_prunes_partitions_and_pushes_down_columns_and_range(tmp_path):
+    df = _write(tmp_path, "2024-01-01", 24 * 10)
+    assert len(partitions(str(tmp_path), "GBPUSD")) == 10
+    assert [p.parent.name for p in partitions(str(tmp_path), "GBPUSD", "2024-01-03T05:00", "2024-01-04")] == [
+        "dt=2024-01-03", "dt=2024-01-04"]
+
+    got = read_candles(str(tmp_path), "GBPUSD", "2024-01-03T05:00", "2024-01-04T00:00", columns=("ts", "c"), threads=4)
+    assert list(got.columns) == ["ts", "c"]
+    want = df[(df["ts"] >= "2024-01-03T05:00Z") & (df["ts"] <= "2024-01-04T00:00Z")]
+    assert got["ts"].tolist() == want["ts"].tolist()
+    assert str(got["ts"].dt.tz) == "UTC"
+
+    assert len(read_candles(str(tmp_path), "GBPUSD")) == len(df)
+    empty = read_candles(str(tmp_path), "GBPUSD", "2030-01-01", columns=("ts", "h", "l", "c"))
+    assert empty.empty and list(empty.columns) == ["ts", "h", "l", "c"]
+
+
+def test_date_only_end_covers_the_whole_day(tmp_path):
+    _write(tmp_path, "2024-01-01", 24 * 4)
+    got = read_candles(str(tmp_path), "GBPUSD", start="2024-01-01", end="2024-01-02")
+    assert len(got) == 48
+    assert got["ts"].iloc[-1] == pd.Timestamp("2024-01-02T23:00Z")
+    assert [p.parent.name for p in partitions(str(tmp_path), "GBPUSD", end=pd.Timestamp("2024-01-02").date())] == [
+        "dt=2024-01-01", "dt=2024-01-02"]
+    # A timestamp stays an inclusive instant.
+    assert len(read_candles(str(tmp_path), "GBPUSD", end="2024-01-02T00:00")) == 25
+
+
+def test_naive_timestamps_and_loader_errors(tmp_path):
+    _write(tmp_path, "2024-02-01", 48, naive=True)
+    part = sorted((tmp_path / "GBPUSD").rglob("*.parquet"))[0]
+    got = read_partition(part, ("ts", "c"), start=pd.Timestamp("2024-02-01T10:00Z"), end="2024-02-01T12:00")
+    assert got["ts"].dt.hour.tolist() == [10, 11, 12] and str(got["ts"].dt.tz) == "UTC"
+
+    assert len(load_parquet_dir(tmp_path, "GBPUSD", start="2024-02-02")) == 24
+    with pytest.raises(FileNotFoundError):
+        load_parquet_dir(tmp_path, "GBPUSD", start="2025-01-01")
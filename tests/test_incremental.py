@@ -0,0 +1,51 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from lightgbm import LGBMClassifier
+from xgboost import XGBClassifier
+
+from models import train
+from models.cv import make_pipeline
+from models.incremental import continue_boosting, full_due, latest_version, warm_start
+
+
+@pytest.mark.parametrize("model", ["xgb", "lgbm"])
+def test_continue_boosting_adds_trees_without_touching_base(model):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(400, 3))
+    y = (X[:, 0] > 0).astype(int)
+    base = make_pipeline(model, {"n_estimators": 10}).fit(X[:200], y[:200])
+    before = base.predict_proba(X[200:])
+    cand = continue_boosting(base, X[200:], y[200:], trees=5)
+    clf = cand.named_steps["clf"]
+    rounds = clf.get_booster().num_boosted_rounds() if isinstance(clf, XGBClassifier) else clf.booster_.current_iteration()
+    assert rounds == 15
+    np.testing.assert_array_equal(base.predict_proba(X[200:]), before)
+    assert cand.named_steps["scaler"] is base.named_steps["scaler"]
+    assert isinstance(clf, (XGBClassifier, LGBMClassifier))
+
+
+def test_warm_start_gates_on_holdout_and_records_cutoff(tmp_path, ohlc):
+    df = ohlc(2400)
+    model, meta = train.train_all(df.iloc[:1200], {"30m": 6}, n_splits=3)["30m"]
+    base_dir = train.save_version(tmp_path, "30m", model, meta, version="2024-01-01T000000Z")
+    assert latest_version(str(tmp_path), "30m") == base_dir
+    assert not full_due(base_dir, 7) and full_due(None, 7)
+
+    cand, report = warm_start(df, base_dir, "30m", 6, trees=10, tolerance=1.0)
+    assert report["accepted"] and report["new_rows"] > 1000
+    new_meta = report["meta"]
+    assert pd.Timestamp(new_meta["trained_until"]) > pd.Timestamp(meta["trained_until"])
+    assert new_meta["full_trained_at"] == meta["full_trained_at"]
+    assert new_meta["warm_start"]["holdout_rows"] == report["holdout_rows"]
+
+    new_dir = train.save_version(tmp_path, "30m", cand, new_meta, version="2024-01-01T010000Z")
+    assert latest_version(str(tmp_path), "30m") == new_dir
+    assert json.loads((new_dir / "manifest.json").read_text())["warm_start"]["base_version"] == base_dir.name
+
+    # Nothing new since the continued version's cut-off beyond the holdout slice.
+    assert not warm_start(df.iloc[:1250], new_dir, "30m", 6)[0]
+    rejected, report = warm_start(df, base_dir, "30m", 6, trees=10, tolerance=-1.0)
+    assert rejected is None and report["reason"] == "holdout metrics regressed"
@@ -55,3 +55,64 @@ def test_signal_history_and_evaluate_work(tmp_path, monkeypatch):
     je = re.json()
     assert "summary" in je
     assert "count" in je["summary"]
+
+
+def test_signal_history_columns_layout(tmp_path, monkeypatch):
+    c = _client(tmp_path, monkeypatch)
+    assert c.get("/signals/latest", params={"h": "30m"}).status_code == 200
+
+    r = c.get("/signals/history", params={"h": "30m", "fields": "asof_ts,prob_up", "layout": "columns"})
+    assert r.status_code == 200
+    j = r.json()
+    assert set(j["columns"]) == {"asof_ts", "prob_up"}
+    assert len(j["columns"]["asof_ts"]) == j["count"]
+
+    bad = c.get("/signals/history", params={"fields": "nope"})
+    assert bad.status_code == 400
+
+
+def test_signal_rollups_endpoint(tmp_path, monkeypatch):
+    c = _client(tmp_path, monkeypatch)
+    assert c.get("/signals/latest", params={"h": "30m"}).status_code == 200
+
+    r = c.get("/signals/rollups", params={"h": "30m", "days": 7, "bucket": "1d"})
+    assert r.status_code == 200
+    j = r.json()
+    assert j["bucket"] == "1d"
+    assert sum(row["n"] for row in j["rows"]) >= 1
+
+    assert c.get("/signals/rollups", params={"bucket": "1w"}).status_code == 400
+
+
+def test_history_and_evaluate_content_negotiation(tmp_path, monkeypatch):
+    import io
+    import json
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    c = _client(tmp_path, monkeypatch)
+    for _ in range(3):
+        assert c.get("/signals/latest", params={"h": "30m"}).status_code == 200
+    want = c.get("/signals/history", params={"h": "30m", "days": 7}).json()
+
+    nd = c.get("/signals/history", params={"h": "30m", "days": 7}, headers={"Accept": "application/x-ndjson"})
+    assert nd.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(x) for x in nd.text.splitlines()]
+    assert [x["prob_up"] for x in lines] == [x["prob_up"] for x in want["rows"]]
+    assert lines[0]["asof_ts"].endswith("Z")
+
+    arrow = c.get("/signals/history", params={"h": "30m", "days": 7, "limit": 2},
+                  headers={"Accept": "application/vnd.apache.arrow.stream"})
+    t = pa.ipc.open_stream(arrow.content).read_all()
+    assert t.num_rows == 2 and str(t.schema.field("asof_ts").type) == "timestamp[ns, tz=UTC]"
+    assert arrow.headers["x-next-cursor"]
+
+    pqt = pq.read_table(io.BytesIO(c.get("/signals/history", params={"h": "30m", "days": 7, "format": "parquet"}).content))
+    assert pqt.num_rows == want["count"]
+    assert c.get("/signals/history", params={"format": "xml"}).status_code == 400
+
+    ev = c.get("/signals/evaluate", params={"h": "30m", "days": 7}, headers={"Accept": "application/vnd.apache.arrow.stream"})
+    assert ev.status_code == 200
+    assert json.loads(ev.headers["x-summary"])["horizon"] == "30m"
+    assert "hit" in pa.ipc.open_stream(ev.content).read_all().column_names
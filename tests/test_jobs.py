@@ -0,0 +1,103 @@
+import asyncio
+import json
+import threading
+
+from fastapi.testclient import TestClient
+
+from services.inference_api import main as api
+from services.inference_api.jobs import JobManager
+from services.inference_api.workers import WorkerPool
+
+
+class _Clock:
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self):
+        return self.t
+
+
+def _manager(**kw):
+    return JobManager(WorkerPool("t", max_workers=2, max_queue=2, processes=False), **kw)
+
+
+def test_identical_submissions_share_one_job_then_hit_cache():
+    gate = threading.Event()
+    calls = []
+
+    def work(x):
+        calls.append(x)
+        gate.wait(5)
+        return x * 2
+
+    jobs = _manager()
+    first = jobs.submit(("k", 1), work, 1)
+    assert jobs.submit(("k", 1), work, 1) is first
+    gate.set()
+    assert first.wait(5)
+    assert first.to_dict(0)["result"] == 2
+
+    again = jobs.submit(("k", 1), work, 1)
+    assert again.cached and again.status == "done" and again.result == 2
+    assert jobs.get(again.id) is again
+    assert calls == [1]
+
+
+def test_cache_expires_and_is_bounded():
+    clock = _Clock()
+    jobs = _manager(ttl=10, max_results=1, clock=clock)
+    jobs.submit("a", int, "1").wait(5)
+    clock.t = 5
+    assert jobs.submit("a", int, "1").cached
+    clock.t = 20
+    assert not jobs.submit("a", int, "1").cached  # expired
+    jobs.submit("a", int, "1").wait(5)
+    jobs.submit("b", int, "2").wait(5)
+    assert not jobs.submit("a", int, "1").cached  # evicted by b
+
+
+def test_wait_async_resolves_on_the_loop_without_a_thread():
+    gate = threading.Event()
+    jobs = _manager()
+    job = jobs.submit("slow", lambda: gate.wait(5) and 7)
+
+    async def scenario():
+        assert not await job.wait_async(0.05)
+        waiter = asyncio.ensure_future(job.wait_async())
+        await asyncio.sleep(0)
+        assert job._waiters
+        gate.set()
+        assert await asyncio.wait_for(waiter, 5)
+        assert job.result == 7 and not job._waiters
+        # a cached job is already done and returns immediately
+        assert await jobs.submit("slow", int, "0").wait_async(0)
+
+    asyncio.run(scenario())
+
+
+def test_failed_job_is_reported_and_not_cached():
+    jobs = _manager()
+    job = jobs.submit("bad", int, "x")
+    assert job.wait(5)
+    d = job.to_dict(0)
+    assert d["status"] == "failed" and "ValueError" in d["error"]
+    assert not jobs.submit("bad", int, "x").cached
+
+
+def test_backtest_job_endpoints(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "test.db"))
+    monkeypatch.delenv("DB_URL", raising=False)
+    api._store.cache_clear()
+    pool = WorkerPool("heavy", max_workers=1, max_queue=1, processes=False)
+    monkeypatch.setattr(api, "_jobs", JobManager(pool))
+    c = TestClient(api.app)
+
+    r = c.post("/backtest/jobs", json={"horizon": "30m", "days": 30})
+    assert r.status_code == 202
+    job_id = r.json()["job_id"]
+    lines = [json.loads(x) for x in c.get(f"/backtest/jobs/{job_id}/stream", params={"heartbeat": 0.1}).iter_lines() if x]
+    assert lines[-1]["status"] == "done"
+    assert "trades" in lines[-1]["result"]["summary"]
+    assert c.get(f"/backtest/jobs/{job_id}").json()["status"] == "done"
+    assert c.get("/backtest/jobs/nope").status_code == 404
+    pool.shutdown()
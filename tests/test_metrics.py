@@ -0,0 +1,54 @@
+from fastapi.testclient import TestClient
+
+from services.inference_api import main as api
+from services.inference_api.metrics import STAGE_SECONDS, Registry, stage
+
+
+def test_histogram_and_counter_exposition():
+    reg = Registry()
+    h = reg.histogram("t_seconds", "test", ["stage"], buckets=(0.1, 1.0))
+    c = reg.counter("t_total", "test", ["route"])
+    h.observe(0.05, stage="a")
+    h.observe(0.5, stage="a")
+    h.observe(5.0, stage="a")
+    c.inc(route="/x")
+    c.inc(2, route="/x")
+    reg.gauge("t_ratio", "test", lambda: 0.25)
+    reg.gauge("t_broken", "test", lambda: 1 / 0)
+    text = reg.render()
+    assert 't_seconds_bucket{stage="a",le="0.1"} 1' in text
+    assert 't_seconds_bucket{stage="a",le="1"} 2' in text
+    assert 't_seconds_bucket{stage="a",le="+Inf"} 3' in text
+    assert 't_seconds_count{stage="a"} 3' in text
+    assert 't_total{route="/x"} 3' in text
+    assert "t_ratio 0.25" in text
+    assert "# TYPE t_broken gauge" in text
+    assert not [line for line in text.splitlines() if line.startswith("t_broken")]
+
+
+def test_stage_timer_records_even_on_error():
+    before = STAGE_SECONDS.count(stage="unit")
+    try:
+        with stage("unit"):
+            raise RuntimeError
+    except RuntimeError:
+        pass
+    assert STAGE_SECONDS.count(stage="unit") == before + 1
+
+
+def test_metrics_endpoint(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "test.db"))
+    monkeypatch.delenv("DB_URL", raising=False)
+    api._store.cache_clear()
+    c = TestClient(api.app)
+    assert c.get("/signals/latest").status_code == 200
+    assert c.get("/nope").status_code == 404
+    r = c.get("/metrics")
+    assert r.headers["content-type"].startswith("text/plain")
+    text = r.text
+    for s in ("candles", "features", "model_load", "predict", "persist"):
+        assert f'inference_stage_seconds_count{{stage="{s}"}}' in text
+    assert 'http_requests_total{route="/signals/latest",status="200"}' in text
+    assert 'http_requests_total{route="unmatched",status="404"}' in text
+    assert "signal_memo_hit_ratio" in text
+    assert 'signals_latest_total{source="on_demand"}' in text
@@ -0,0 +1,67 @@
+import json
+import sqlite3
+
+import pytest
+
+from cli import migrate_sqlite_to_postgres as mig
+from storage.db_store import get_store
+
+
+def _legacy_db(path, n):
+    con = sqlite3.connect(path)
+    con.execute("CREATE TABLE signals (asof_ts TEXT, raw_json TEXT)")
+    for i in range(n):
+        payload = {
+            "asof_ts": f"2024-01-01T00:{i:02d}:00Z",
+            "horizon": "30m",
+            "symbol": "GBPUSD",
+            "timeframe": "1m",
+            "side": "buy",
+            "prob_up": 0.6,
+        }
+        con.execute("INSERT INTO signals VALUES (?, ?)", (payload["asof_ts"], json.dumps(payload)))
+    con.execute("INSERT INTO signals VALUES (?, ?)", ("bad", "{not json"))
+    con.commit()
+    con.close()
+
+
+def _count(store):
+    with store.engine.connect() as conn:
+        return conn.exec_driver_sql("SELECT COUNT(*) FROM signals").scalar()
+
+
+def test_migrate_streams_batches_and_checkpoints(tmp_path):
+    src = tmp_path / "legacy.db"
+    _legacy_db(src, 7)
+    store = get_store(f"sqlite:///{tmp_path / 'target.db'}")
+    ckpt = tmp_path / "ckpt.json"
+
+    n = mig.migrate(str(src), store, checkpoint=ckpt, batch_size=3, workers=2)
+    assert n == 7
+    assert _count(store) == 7
+    assert json.loads(ckpt.read_text())["last_rowid"] == 8
+
+    # A rerun resumes after the checkpoint and has nothing left to do.
+    assert mig.migrate(str(src), store, checkpoint=ckpt, batch_size=3) == 0
+    # --restart replays everything; upserts keep the target idempotent.
+    assert mig.migrate(str(src), store, checkpoint=ckpt, batch_size=3, restart=True) == 7
+    assert _count(store) == 7
+
+
+def test_migrate_resumes_mid_table(tmp_path):
+    src = tmp_path / "legacy.db"
+    _legacy_db(src, 5)
+    store = get_store(f"sqlite:///{tmp_path / 'target.db'}")
+    ckpt = tmp_path / "ckpt.json"
+    mig._write_checkpoint(ckpt, last_rowid=3, migrated=3)
+
+    assert mig.migrate(str(src), store, checkpoint=ckpt, batch_size=2) == 2
+    assert _count(store) == 2
+    # The checkpoint keeps the total across runs, not just this run's rows.
+    assert json.loads(ckpt.read_text())["migrated"] == 5
+
+
+def test_main_requires_db_url(tmp_path, monkeypatch):
+    monkeypatch.delenv("DB_URL", raising=False)
+    with pytest.raises(SystemExit, match="DB_URL"):
+        mig.main(["--db_path", str(tmp_path / "x.db")])
@@ -0,0 +1,97 @@
+import json
+import os
+
+import joblib
+
+from services.inference_api.model_cache import ModelCache
+
+
+def _write(registry, h, version, obj):
+    d = registry / h / version
+    d.mkdir(parents=True, exist_ok=True)
+    joblib.dump(obj, d / "model.pkl")
+    (d / "feature_spec.json").write_text(json.dumps({"horizon": h, "features": ["f1"], "version": version}))
+    return d
+
+
+def _counting_loader(calls):
+    def load(path):
+        calls.append(path)
+        return joblib.load(path)
+
+    return load
+
+
+def test_cache_loads_once_and_serves_resident(tmp_path):
+    _write(tmp_path, "30m", "2024-01-01", {"w": 1})
+    calls = []
+    cache = ModelCache(str(tmp_path), check_every=3600, loader=_counting_loader(calls))
+
+    first = cache.get("30m")
+    assert first.model == {"w": 1}
+    assert first.meta["features"] == ["f1"]
+    assert first.version == "2024-01-01"
+    for _ in range(5):
+        assert cache.get("30m") is first
+    assert len(calls) == 1
+    assert cache.get("2h") is None
+
+
+def test_cache_hot_reloads_new_and_rewritten_versions(tmp_path):
+    _write(tmp_path, "30m", "2024-01-01", {"w": 1})
+    calls = []
+    cache = ModelCache(str(tmp_path), check_every=0, loader=_counting_loader(calls))
+    assert cache.get("30m").version == "2024-01-01"
+    assert cache.get("30m").version == "2024-01-01"
+    assert len(calls) == 1  # unchanged stamps: no reload
+
+    _write(tmp_path, "30m", "2024-01-02", {"w": 2})
+    assert cache.get("30m").model == {"w": 2}
+
+    # Same-day retrain overwrites the file in place.
+    d = _write(tmp_path, "30m", "2024-01-02", {"w": 3, "pad": "x" * 100})
+    st = os.stat(d / "model.pkl")
+    os.utime(d / "model.pkl", (st.st_atime, st.st_mtime + 5))
+    assert cache.get("30m").model["w"] == 3
+
+
+def test_cache_keeps_serving_while_another_thread_reloads(tmp_path):
+    _write(tmp_path, "30m", "2024-01-01", {"w": 1})
+    cache = ModelCache(str(tmp_path), check_every=3600)
+    resident = cache.get("30m")
+    cache.invalidate("30m")
+    _write(tmp_path, "30m", "2024-01-02", {"w": 2})
+
+    lock = cache._lock("30m")
+    lock.acquire()
+    try:
+        # A reload is "in progress" elsewhere: the resident model is returned immediately.
+        assert cache.get("30m") is resident
+    finally:
+        lock.release()
+    assert cache.get("30m").version == "2024-01-02"
+
+
+def test_cache_keeps_previous_model_when_load_fails(tmp_path):
+    _write(tmp_path, "30m", "2024-01-01", {"w": 1})
+    cache = ModelCache(str(tmp_path), check_every=0)
+    assert cache.get("30m").version == "2024-01-01"
+    bad = tmp_path / "30m" / "2024-01-02"
+    bad.mkdir()
+    (bad / "model.pkl").write_bytes(b"half-written")
+    assert cache.get("30m").version == "2024-01-01"
+
+
+def test_cache_reports_unreadable_artifact_until_it_loads(tmp_path):
+    d = _write(tmp_path, "30m", "2024-01-01", {"w": 1})
+    good = (d / "model.pkl").read_bytes()
+    (d / "model.pkl").write_bytes(good[: len(good) // 2])  # half-synced
+    cache = ModelCache(str(tmp_path), check_every=3600)
+    assert cache.get("30m") is None
+    assert "model.pkl" in cache.error("30m")
+    assert cache.error("2h") is None
+
+    (d / "model.pkl").write_bytes(good)
+    cache.invalidate("30m")
+    assert cache.get("30m").model == {"w": 1}
+    assert cache.error("30m") is None
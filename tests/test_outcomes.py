@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.outcomes import OutcomeJob, compute_outcomes, horizon_minutes, load_candles
+from storage.db_store import get_store, iso_z
+
+
+def _write_candles(root, start, n):
+    ts = pd.date_range(start, periods=n, freq="min", tz="UTC")
+    c = 1.25 + np.arange(n) * 0.0001  # strictly rising
+    df = pd.DataFrame({"ts": ts, "o": c, "h": c + 0.0002, "l": c - 0.0001, "c": c, "v": 1})
+    for dt, part in df.groupby(df["ts"].dt.date):
+        d = root / "GBPUSD" / "timeframe=1m" / f"dt={dt}"
+        d.mkdir(parents=True, exist_ok=True)
+        part.to_parquet(d / f"{dt}.parquet", index=False)
+    return df
+
+
+def test_horizon_minutes():
+    assert horizon_minutes("30m") == 30
+    assert horizon_minutes("2h") == 120
+    with pytest.raises(ValueError):
+        horizon_minutes("soon")
+
+
+def test_load_candles_prunes_by_dt(tmp_path):
+    _write_candles(tmp_path, "2024-01-01T23:00:00Z", 180)
+    df = load_candles(str(tmp_path), "GBPUSD", pd.Timestamp("2024-01-02T00:30:00Z"), pd.Timestamp("2024-01-02T00:40:00Z"))
+    assert len(df) == 11
+    assert list(df.columns) == ["ts", "h", "l", "c"]
+
+
+def test_compute_outcomes_excursions():
+    candles = pd.DataFrame(
+        {
+            "ts": pd.date_range("2024-01-01", periods=4, freq="10min", tz="UTC"),
+            "h": [1.0, 1.5, 1.2, 1.1],
+            "l": [1.0, 0.9, 0.7, 1.0],
+            "c": [1.0, 1.1, 0.8, 1.05],
+        }
+    )
+    out = compute_outcomes([pd.Timestamp("2024-01-01T00:05:00Z"), pd.Timestamp("2023-12-31T00:00:00Z")], candles, 30)
+    first = out.iloc[0]
+    assert first["c0"] == 1.0 and first["c1"] == 1.05
+    assert first["realized_up"] == 1
+    assert first["up_excursion"] == pytest.approx(0.5)
+    assert first["down_excursion"] == pytest.approx(0.3)
+    assert np.isnan(out.iloc[1]["c0"])
+
+
+def test_outcome_job_is_incremental(tmp_path):
+    _write_candles(tmp_path / "candles", "2024-01-01T00:00:00Z", 300)
+    store = get_store(f"sqlite:///{tmp_path / 'app.db'}")
+    t0 = pd.Timestamp("2024-01-01T01:00:00Z")
+    store.upsert_signals(
+        [
+            {"asof_ts": iso_z(t0 + pd.Timedelta(minutes=5 * i)), "horizon": "30m", "symbol": "GBPUSD",
+             "timeframe": "5m", "side": "buy" if i % 2 == 0 else "sell", "prob_up": 0.7}
+            for i in range(50)  # the last few have not matured by the end of the data
+        ]
+    )
+    job = OutcomeJob(store=store, data_dir=str(tmp_path / "candles"), symbol="GBPUSD", timeframe="5m",
+                     horizons=["30m"], batch_size=10)
+    now = pd.Timestamp("2024-01-01T05:00:00Z")
+    done = job.run(now=now)
+    assert 0 < done["30m"] < 50
+    assert job.run(now=now)["30m"] == 0
+
+    # Any window length is a plain read now.
+    summary = store.outcome_summary(days=3650, symbol="GBPUSD", timeframe="5m")
+    assert summary["count"] == done["30m"]
+    assert summary["accuracy"] == pytest.approx(0.5, abs=0.05)  # rising market: buys hit, sells miss
+    assert summary["brier"] == pytest.approx(0.09)
+
+    page = store.query_outcomes(days=3650, symbol="GBPUSD", timeframe="5m", limit=5)
+    recs = page.records()
+    assert recs[0]["hit"] == 1 and recs[1]["hit"] == 0
+    assert recs[0]["mfe"] > 0 and recs[1]["mfe"] < recs[1]["mae"]
+    assert page.next_cursor is not None
+
+    rolled = store.fetch_rollups(days=3650, symbol="GBPUSD", timeframe="5m", bucket="1d")
+    assert sum(r["n_outcome"] for r in rolled) == done["30m"]
+
+
+def test_api_evaluates_outcomes_for_served_symbols(tmp_path, monkeypatch):
+    from services.inference_api import main as api
+
+    _write_candles(tmp_path / "candles", "2024-01-01T00:00:00Z", 300)
+    _write_candles(tmp_path / "eur", "2024-01-01T00:00:00Z", 300)
+    (tmp_path / "eur" / "GBPUSD").rename(tmp_path / "candles" / "EURUSD")
+    store = get_store(f"sqlite:///{tmp_path / 'app.db'}")
+    # EURUSD is not configured; it was served lazily via ?symbol= and its signal persisted.
+    store.upsert_signals(
+        [{"asof_ts": "2024-01-01T01:00:00Z", "horizon": "30m", "symbol": sym,
+          "timeframe": f"{api.BAR_MINUTES}m", "side": "buy", "prob_up": 0.7} for sym in ("GBPUSD", "EURUSD")]
+    )
+    monkeypatch.setattr(api, "_store", lambda: store)
+    monkeypatch.setattr(api, "DATA_DIR", str(tmp_path / "candles"))
+    monkeypatch.setattr(api, "SYMBOLS", ("GBPUSD",))
+
+    done = api._evaluate_outcomes()
+    assert done["GBPUSD"]["30m"] == 1 and done["EURUSD"]["30m"] == 1
+    assert all(d["30m"] == 0 for d in api._evaluate_outcomes().values())
+    assert store.signal_symbols(f"{api.BAR_MINUTES}m") == ["EURUSD", "GBPUSD"]
@@ -0,0 +1,82 @@
+import asyncio
+import json
+import threading
+
+from fastapi.testclient import TestClient
+
+from services.inference_api import main as api
+from services.inference_api.pubsub import Broker, topic
+
+
+def test_replay_topics_and_drop_oldest():
+    async def go():
+        b = Broker(replay=3, queue_size=2)
+        for i in range(5):
+            b.publish("A:30m", {"i": i})
+        b.publish("B:30m", {"i": "b"})
+        sub = b.subscribe(["A:30m"], replay=2)
+        got = [(await sub.get(0.1))["signal"]["i"] for _ in range(2)]
+        assert got == [3, 4]
+        assert await sub.get(0.01) is None
+
+        for i in range(5, 9):
+            b.publish("A:30m", {"i": i})
+        b.publish("B:30m", {"i": "ignored"})
+        await asyncio.sleep(0)
+        got = [(await sub.get(0.1))["signal"]["i"] for _ in range(2)]
+        assert got == [7, 8] and sub.dropped == 2  # slow consumer keeps the newest
+        b.unsubscribe(sub)
+        assert b.subscribers == 0
+
+    asyncio.run(go())
+
+
+def test_publish_from_another_thread():
+    async def go():
+        b = Broker()
+        sub = b.subscribe([topic("GBPUSD", "2h")])
+        t = threading.Thread(target=b.publish, args=("GBPUSD:2h", {"side": "buy"}))
+        t.start()
+        msg = await sub.get(2)
+        t.join()
+        return msg
+
+    msg = asyncio.run(go())
+    assert msg["topic"] == "GBPUSD:2h" and msg["signal"] == {"side": "buy"}
+
+
+def _client(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "test.db"))
+    monkeypatch.delenv("DB_URL", raising=False)
+    api._store.cache_clear()
+    monkeypatch.setattr(api, "_broker", Broker())
+    return TestClient(api.app)
+
+
+def test_sse_replays_and_pushes_new_signals(tmp_path, monkeypatch):
+    c = _client(tmp_path, monkeypatch)
+    assert c.get("/signals/latest", params={"h": "30m"}).status_code == 200  # scoring publishes
+    assert api._broker.published == 1
+
+    r = c.get("/signals/stream", params={"topics": f"{api.SYMBOL}:30m", "limit": 1})
+    assert r.headers["content-type"].startswith("text/event-stream")
+    event = r.text.split("\n\n")[0].splitlines()
+    assert event[1] == "event: signal"
+    assert json.loads(event[2][len("data: "):])["signal"]["horizon"] == "30m"
+
+    timer = threading.Timer(0.3, api._broker.publish, args=(f"{api.SYMBOL}:2h", {"horizon": "2h"}))
+    timer.start()
+    r = c.get("/signals/stream", params={"topics": f"{api.SYMBOL}:2h", "replay": 0, "limit": 1, "heartbeat": 0.1})
+    timer.join()
+    assert r.text.startswith(": ping") or "event: signal" in r.text
+    assert '"horizon": "2h"' in r.text
+
+    assert c.get("/signals/stream", params={"topics": "GBPUSD"}).status_code == 400
+    assert c.get("/signals/stream", params={"topics": "NOPE:30m"}).status_code == 404
+
+
+def test_websocket_receives_replay(tmp_path, monkeypatch):
+    c = _client(tmp_path, monkeypatch)
+    api._broker.publish(f"{api.SYMBOL}:30m", {"horizon": "30m", "side": "sell"})
+    with c.websocket_connect(f"/signals/ws?topics={api.SYMBOL}:30m&limit=1") as ws:
+        assert ws.receive_json()["signal"]["side"] == "sell"
@@ -0,0 +1,63 @@
+import sys
+
+import numpy as np
+import pytest
+
+from models import registry as reg_cli
+from models.cv import make_pipeline
+from models.registry import Registry
+from models.train import save_version
+from services.inference_api.model_cache import ModelCache
+
+
+def _pipe(seed):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(100, 2))
+    return make_pipeline("xgb", {"n_estimators": 3}).fit(X, (X[:, 0] > 0).astype(int))
+
+
+def _save(root, version, seed=0, **kw):
+    meta = {"model": "xgb", "auc": 0.5 + seed / 100, "brier": 0.25, "features": ["a", "b"]}
+    return save_version(root, "30m", _pipe(seed), meta, version=version, **kw)
+
+
+def test_versions_are_indexed_and_never_overwritten(tmp_path):
+    reg = Registry(str(tmp_path))
+    a = _save(tmp_path, "2024-01-01T000000Z", 1)
+    b = _save(tmp_path, "2024-01-01T000000Z", 2)  # same second: gets a suffix instead of overwriting
+    assert (a.name, b.name) == ("2024-01-01T000000Z", "2024-01-01T000000Z-2")
+    idx = reg.index("30m")
+    assert [v["version"] for v in idx["versions"]] == [a.name, b.name]
+    assert idx["versions"][1]["auc"] == 0.52 and "model.pkl" in idx["versions"][1]["files"]
+    assert reg.current("30m") == b.name
+    assert not list(tmp_path.glob("30m/.staging-*"))
+
+    c = _save(tmp_path, "2024-01-02T000000Z", 3, promote=False)
+    assert reg.current("30m") == b.name and reg.current_dir("30m") == b
+    assert reg.verify("30m", c.name) == []
+    (c / "scale.npy").write_bytes(b"tampered")
+    assert reg.verify("30m", c.name) == ["scale.npy"]
+
+
+def test_promote_and_rollback_move_the_served_model(tmp_path, monkeypatch, capsys):
+    reg = Registry(str(tmp_path))
+    a = _save(tmp_path, "v1", 1)
+    b = _save(tmp_path, "v2", 2)
+    cache = ModelCache(str(tmp_path), check_every=0)
+    assert cache.get("30m").version == b.name
+
+    reg.promote("30m", a.name)
+    assert cache.get("30m").version == a.name
+    with pytest.raises(ValueError):
+        reg.promote("30m", "nope")
+
+    monkeypatch.setattr(sys, "argv", ["registry", "rollback", "--registry", str(tmp_path), "--horizon", "30m"])
+    reg_cli.main()
+    assert reg.current("30m") == b.name and cache.get("30m").version == b.name
+    monkeypatch.setattr(sys, "argv", ["registry", "list", "--registry", str(tmp_path), "--horizon", "30m"])
+    reg_cli.main()
+    assert f"* {b.name}" in capsys.readouterr().out
+
+    reg.rollback("30m")
+    with pytest.raises(ValueError):
+        reg.rollback("30m")
@@ -0,0 +1,85 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from services.inference_api import main as api
+from services.inference_api.scheduler import BarScheduler
+
+
+class _Clock:
+    def __init__(self, t):
+        self.t = t
+
+    def __call__(self):
+        return self.t
+
+
+def test_next_run_aligns_to_bar_close():
+    s = BarScheduler(lambda sym, hs: [], ["GBPUSD"], ["30m"], bar_minutes=5, delay=2.0)
+    assert s.next_run(1_700_000_000.0) == 1_700_000_100.0 + 2.0  # next multiple of 300s
+    assert s.next_run(1_700_000_100.0) == 1_700_000_400.0 + 2.0
+
+
+def test_tick_computes_once_per_symbol_and_isolates_failures():
+    calls = []
+
+    def compute(symbol, horizons):
+        calls.append((symbol, tuple(horizons)))
+        if symbol == "USDJPY":
+            raise RuntimeError("no candles")
+        return [{"symbol": symbol, "horizon": h} for h in horizons]
+
+    clock = _Clock(1000.0)
+    s = BarScheduler(compute, ["GBPUSD", "USDJPY", "EURUSD"], ["30m", "2h"], bar_minutes=5, clock=clock)
+    assert s.tick() == 4
+    assert calls == [(sym, ("30m", "2h")) for sym in ("GBPUSD", "USDJPY", "EURUSD")]
+    assert s.get("EURUSD", "2h") == {"symbol": "EURUSD", "horizon": "2h"}
+    assert s.get("USDJPY", "30m") is None
+
+    clock.t += 601  # two bars without a refresh: stale, fall back to on-demand
+    assert s.get("GBPUSD", "30m") is None
+
+
+def test_run_computes_on_start_and_stops():
+    published = []
+
+    async def go():
+        s = BarScheduler(lambda sym, hs: [published.append(h) or {"h": h} for h in hs], ["GBPUSD"], ["30m"], bar_minutes=5)
+        s.start()
+        for _ in range(100):
+            if published:
+                break
+            await asyncio.sleep(0.01)
+        await s.stop()
+        return s
+
+    s = asyncio.run(go())
+    assert published == ["30m"]
+    assert s.get("GBPUSD", "30m") == {"h": "30m"}
+
+
+def test_latest_serves_published_signal(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "test.db"))
+    monkeypatch.delenv("DB_URL", raising=False)
+    api._store.cache_clear()
+    sched = BarScheduler(lambda sym, hs: [], [api.SYMBOL], ["30m"], bar_minutes=api.BAR_MINUTES)
+    sched.publish(api.SYMBOL, "30m", {"horizon": "30m", "prob_up": 0.61, "now": "then"})
+    monkeypatch.setattr(api, "_scheduler", sched)
+
+    def _no_compute(h):
+        raise AssertionError("should be served from the scheduler table")
+
+    monkeypatch.setattr(api, "_signal", _no_compute)
+    j = TestClient(api.app).get("/signals/latest", params={"h": "30m"}).json()
+    assert j["prob_up"] == 0.61 and j["now"] != "then"
+    assert "session" in j
+
+
+def test_precompute_shares_one_pass_per_symbol(monkeypatch):
+    refreshed, scored = [], []
+    monkeypatch.setattr(api, "_candles", lambda symbol: type("B", (), {"refresh": lambda self: refreshed.append(symbol)})())
+    monkeypatch.setattr(api, "_signals", lambda symbol, hs: scored.append((symbol, tuple(hs))) or [{"horizon": h} for h in hs])
+    s = BarScheduler(api._precompute, [api.SYMBOL], ["30m", "2h"], bar_minutes=api.BAR_MINUTES)
+    assert s.tick() == 2
+    assert refreshed == [api.SYMBOL] and scored == [(api.SYMBOL, ("30m", "2h"))]
+    assert s.get(api.SYMBOL, "2h") == {"horizon": "2h"}
@@ -0,0 +1,119 @@
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from services.inference_api import main as api
+from services.inference_api.model_cache import LoadedModel
+from services.inference_api.scoring import FEATURE_COLUMNS, FeatureState, PayloadMemo, last_bar_features
+
+
+def _candles(n, end="2024-01-02T10:00:00Z"):
+    rng = np.random.default_rng(0)
+    c = 1.27 + np.cumsum(rng.normal(0, 1e-4, n))
+    return pd.DataFrame(
+        {
+            "ts": pd.date_range(end=end, periods=n, freq="min", tz="UTC"),
+            "o": c,
+            "h": c + np.abs(rng.normal(0, 5e-4, n)),
+            "l": c - np.abs(rng.normal(0, 5e-4, n)),
+            "c": c,
+            "v": 1.0,
+        }
+    )
+
+
+def test_last_bar_features_match_full_rebuild():
+    df = _candles(300)
+    full = api._build_features(df).iloc[-1]
+    last = last_bar_features(df)
+    for f in FEATURE_COLUMNS:
+        assert last[f] == pytest.approx(float(full[f]), rel=1e-9, abs=1e-12), f
+    assert last["c"] == df["c"].iloc[-1]
+    assert last_bar_features(df.head(20)) is None
+
+
+def test_feature_state_computes_once_per_bar():
+    state = FeatureState()
+    df = _candles(100)
+    ts, first = state.latest("GBPUSD", df)
+    assert ts == df["ts"].iloc[-1]
+    assert state.latest("GBPUSD", df)[1] is first
+    grown = pd.concat([df, _candles(101, end="2024-01-02T10:01:00Z").tail(1)], ignore_index=True)
+    assert state.latest("GBPUSD", grown)[1] is not first
+
+
+def test_payload_memo_is_bounded_lru():
+    memo = PayloadMemo(maxsize=2)
+    memo.put("a", {"x": 1})
+    memo.put("b", {"x": 2})
+    assert memo.get("a") == {"x": 1}
+    memo.put("c", {"x": 3})
+    assert memo.get("b") is None and memo.get("a") is not None
+    assert (memo.hits, memo.misses) == (2, 1)
+
+
+class _Model:
+    def __init__(self):
+        self.rows = []
+
+    def predict_proba(self, x):
+        self.rows.append(x.shape)
+        return np.array([[0.3, 0.7]])
+
+
+def test_latest_scores_each_bar_once(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "test.db"))
+    monkeypatch.delenv("DB_URL", raising=False)
+    api._store.cache_clear()
+    model = _Model()
+    loaded = LoadedModel("30m", "v1", "x/model.pkl", model, {"features": list(FEATURE_COLUMNS)}, (0.0, 0))
+    monkeypatch.setattr(api, "_model_cache", lambda symbol: type("C", (), {"get": lambda self, h: loaded})())
+    df = _candles(600)
+    monkeypatch.setattr(api, "_load_recent_parquet", lambda symbol=api.SYMBOL: df)
+    monkeypatch.setattr(api, "_memo", PayloadMemo())
+    c = TestClient(api.app)
+
+    first = c.get("/signals/latest", params={"h": "30m"}).json()
+    again = c.get("/signals/latest", params={"h": "30m"}).json()
+    assert first["side"] == "buy" and first["model_version"] == "v1"
+    assert again["asof_ts"] == first["asof_ts"] and again["prob_up"] == first["prob_up"]
+    assert model.rows == [(1, len(FEATURE_COLUMNS))]
+    assert c.get("/signals/history", params={"days": 3650}).json()["count"] == 1
+
+
+def test_batch_shares_features_and_writes_once(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "test.db"))
+    monkeypatch.delenv("DB_URL", raising=False)
+    api._store.cache_clear()
+    models = {h: _Model() for h in ("30m", "2h")}
+
+    class _Cache:
+        def get(self, h):
+            return LoadedModel(h, "v1", "x/model.pkl", models[h], {"features": list(FEATURE_COLUMNS)}, (0.0, 0))
+
+    monkeypatch.setattr(api, "_model_cache", lambda symbol: _Cache())
+    df = _candles(600, end="2024-01-03T10:00:00Z")
+    loads = []
+    monkeypatch.setattr(api, "_load_recent_parquet", lambda symbol=api.SYMBOL: loads.append(symbol) or df)
+    monkeypatch.setattr(api, "_memo", PayloadMemo())
+    monkeypatch.setattr(api, "_features", FeatureState())
+    monkeypatch.setattr(api._symbols, "known", lambda symbol: symbol in (api.SYMBOL, "EURUSD"))
+    writes = []
+    store = api._store()
+    monkeypatch.setattr(store, "upsert_signals", lambda payloads: writes.append(len(payloads)) or len(payloads))
+    c = TestClient(api.app)
+
+    pairs = [{"symbol": s, "horizon": h} for s, h in
+             ((api.SYMBOL, "30m"), ("EURUSD", "2h"), (api.SYMBOL, "2h"), (api.SYMBOL, "30m"), ("EURUSD", "30m"))]
+    j = c.post("/signals/batch", json={"pairs": pairs}).json()
+    assert j["count"] == 5
+    assert [(s["symbol"], s["horizon"]) for s in j["signals"]] == [(p["symbol"], p["horizon"]) for p in pairs]
+    assert sorted(loads) == sorted([api.SYMBOL, "EURUSD"])  # candles/features once per symbol
+    assert all(len(m.rows) == 2 for m in models.values())  # one row per symbol and horizon
+    assert writes == [4]  # one bulk write for both symbols
+
+    assert c.post("/signals/batch", json={"pairs": pairs}).json()["count"] == 5
+    assert writes == [4]  # same bar: served from the memo
+    assert c.post("/signals/batch", json={"pairs": [{"symbol": "XXXYYY"}]}).status_code == 400
+    assert c.post("/signals/batch", json={"pairs": pairs * 100}).status_code == 400
@@ -0,0 +1,43 @@
+import itertools
+
+import numpy as np
+
+from models import train
+from models.cv import CANDIDATES, fold_rows, share
+from models.dataset import build_training_set
+from models.search import MAX_TREES, rungs, sample_configs, successive_halving
+
+
+def test_rungs_and_config_sampling():
+    assert rungs(5, 3) == [1, 3, 5]
+    assert rungs(4, 2) == [1, 2, 4]
+    assert rungs(1, 3) == [1]
+    configs = sample_configs(10, seed=1)
+    assert len(configs) == 10
+    assert configs[:2] == [(n, {**p, "n_estimators": MAX_TREES}) for n, p in CANDIDATES.items()]
+    assert len({repr(c) for c in configs}) == 10
+
+
+def _inputs(tmp_path, ohlc):
+    ds = build_training_set(train.build_features(ohlc(500)), {"30m": 6}, train.FEATURES)
+    xp, yp = share(ds.X, str(tmp_path / "X.npy")), share(ds.labels, str(tmp_path / "y.npy"))
+    return xp, yp, {"30m": fold_rows(ds.rows("30m"), 3)}, {"30m": 0}
+
+
+def test_successive_halving_narrows_and_logs(tmp_path, ohlc):
+    xp, yp, folds, labels = _inputs(tmp_path, ohlc)
+    res = successive_halving(xp, yp, folds, labels, configs=4, eta=2, early_stopping=5)["30m"]
+    log = res["search"]
+    assert [(r["folds"], r["configs"], r["fits"]) for r in log["rungs"]] == [(1, 4, 4), (2, 2, 2), (3, 1, 1)]
+    assert [t["folds"] for t in log["trials"]] == [3, 2, 1, 1]
+    assert log["trials"][0]["auc"] == round(res["auc"], 6) and not log["stopped_by_budget"]
+    assert 1 <= res["params"]["n_estimators"] <= MAX_TREES  # early stopping picked the tree count
+
+
+def test_budget_stops_after_first_rung(tmp_path, ohlc):
+    xp, yp, folds, labels = _inputs(tmp_path, ohlc)
+    ticks = itertools.count(0, 10.0)
+    res = successive_halving(xp, yp, folds, labels, configs=3, eta=2, budget_s=5, early_stopping=5,
+                             clock=lambda: next(ticks))["30m"]
+    assert res["search"]["stopped_by_budget"] and len(res["search"]["rungs"]) == 1
+    assert np.isfinite(res["auc"])
@@ -0,0 +1,204 @@
+import warnings
+from datetime import timedelta
+
+import pytest
+
+from storage.db_store import get_store, iso_z, utc_now
+
+
+def _store(tmp_path):
+    return get_store(f"sqlite:///{tmp_path / 'signals.db'}")
+
+
+def _seed(store, n=5):
+    t0 = utc_now().replace(microsecond=0) - timedelta(hours=n)
+    for i in range(n):
+        store.upsert_signal(
+            {
+                "asof_ts": iso_z(t0 + timedelta(minutes=5 * i)),
+                "horizon": "30m",
+                "symbol": "GBPUSD",
+                "timeframe": "5m",
+                "side": "buy" if i % 2 else "sell",
+                "prob_up": 0.1 * i,
+                "suggestion": {"entry_px": 1.25},
+                "source": "test",
+            }
+        )
+    return t0
+
+
+def test_query_signals_projects_and_pages(tmp_path):
+    store = _store(tmp_path)
+    _seed(store, n=5)
+
+    seen = []
+    cursor = None
+    while True:
+        page = store.query_signals(fields=("prob_up", "side"), symbol="GBPUSD", timeframe="5m", limit=2, cursor=cursor)
+        assert page.fields == ("prob_up", "side")
+        assert all(len(r) == 2 for r in page.rows)
+        seen.extend(r[0] for r in page.rows)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert seen == pytest.approx([0.0, 0.1, 0.2, 0.3, 0.4])
+
+
+def test_query_signals_columns_and_records(tmp_path):
+    store = _store(tmp_path)
+    t0 = _seed(store, n=3)
+
+    page = store.query_signals(fields=("asof_ts", "entry_px"), symbol="GBPUSD", timeframe="5m")
+    cols = page.columns()
+    assert list(cols) == ["asof_ts", "entry_px"]
+    assert cols["entry_px"] == [1.25, 1.25, 1.25]
+    assert page.next_cursor is None
+
+    recs = page.records()
+    assert recs[0]["asof_ts"] == iso_z(t0)
+    assert "raw" not in recs[0]
+
+    full = store.fetch_signals(symbol="GBPUSD", timeframe="5m")
+    assert full[-1]["raw"]["side"] == "sell"
+
+
+def test_query_signals_rejects_unknown_fields(tmp_path):
+    with pytest.raises(ValueError):
+        _store(tmp_path).query_signals(fields=("nope",))
+
+
+def test_newest_first_pages_backwards(tmp_path):
+    store = _store(tmp_path)
+    _seed(store, n=3)
+    page = store.query_signals(fields=("prob_up", "asof_ts"), symbol="GBPUSD", timeframe="5m", limit=2, newest_first=True)
+    assert [r[0] for r in page.rows] == pytest.approx([0.2, 0.1])
+    rest = store.query_signals(fields=("prob_up",), symbol="GBPUSD", timeframe="5m", cursor=page.next_cursor, newest_first=True)
+    assert [r[0] for r in rest.rows] == pytest.approx([0.0])
+
+
+def test_rollups_track_upserts(tmp_path):
+    store = _store(tmp_path)
+    t0 = utc_now().replace(minute=0, second=0, microsecond=0) - timedelta(hours=2)
+    payloads = [
+        {"asof_ts": iso_z(t0 + timedelta(minutes=5 * i)), "horizon": "30m", "symbol": "GBPUSD",
+         "timeframe": "5m", "side": "buy" if i < 3 else "sell", "prob_up": 0.6 if i < 3 else 0.3}
+        for i in range(4)
+    ]
+    store.upsert_signals(payloads)
+
+    hourly = store.fetch_rollups(days=1, symbol="GBPUSD", timeframe="5m", bucket="1h")
+    assert len(hourly) == 1
+    assert hourly[0]["n"] == 4 and hourly[0]["n_buy"] == 3 and hourly[0]["n_sell"] == 1
+    assert hourly[0]["mean_prob_up"] == pytest.approx(0.525)
+    assert hourly[0]["hit_rate"] is None
+
+    # Re-upserting a signal with a different side rebuilds its bucket exactly.
+    store.upsert_signal({**payloads[3], "side": "buy", "prob_up": 0.9})
+    hourly = store.fetch_rollups(days=1, symbol="GBPUSD", timeframe="5m", bucket="1h")
+    assert hourly[0]["n"] == 4 and hourly[0]["n_buy"] == 4
+    assert hourly[0]["mean_prob_up"] == pytest.approx(0.675)
+
+    daily = store.fetch_rollups(days=2, symbol="GBPUSD", timeframe="5m", bucket="1d")
+    assert sum(r["n"] for r in daily) == 4
+
+    with store.engine.begin() as conn:
+        conn.exec_driver_sql("DELETE FROM signal_rollups")
+    assert store.refresh_rollups(days=3) >= 2
+    assert store.fetch_rollups(days=1, symbol="GBPUSD", timeframe="5m", bucket="1h")[0]["n"] == 4
+
+    with pytest.raises(ValueError):
+        store.fetch_rollups(bucket="1w")
+
+
+def test_archive_moves_cold_months_and_reads_union(tmp_path, monkeypatch):
+    store = get_store(f"sqlite:///{tmp_path / 'signals.db'}", archive_dir=str(tmp_path / "archive"))
+    now = utc_now().replace(microsecond=0)
+    stamps = [now - timedelta(days=d) for d in (120, 110, 100, 5, 4)]
+    store.upsert_signals(
+        [{"asof_ts": iso_z(t), "horizon": "30m", "symbol": "GBPUSD", "timeframe": "5m",
+          "side": "buy", "prob_up": 0.8} for t in stamps]
+    )
+    store.upsert_outcomes(
+        [{"asof_ts": t, "target_ts": t + timedelta(minutes=30), "horizon": "30m", "symbol": "GBPUSD",
+          "timeframe": "5m", "c0": 1.0, "c1": 1.1, "realized_up": 1, "up_excursion": 0.2, "down_excursion": 0.0}
+         for t in stamps]
+    )
+
+    res = store.archive_before(now - timedelta(days=60))
+    assert res["signals"] == 3 and res["outcomes"] == 3
+    with store.engine.connect() as conn:
+        assert conn.exec_driver_sql("SELECT COUNT(*) FROM signals").scalar() == 2
+        assert conn.exec_driver_sql("SELECT COUNT(*) FROM signal_outcomes").scalar() == 2
+
+    kw = dict(symbol="GBPUSD", timeframe="5m", days=3650)
+    # Hot-only windows never touch the archive.
+    assert len(store.query_signals(days=30, symbol="GBPUSD", timeframe="5m")) == 2
+
+    asc = store.query_signals(fields=("asof_ts", "raw"), limit=2, **kw)
+    assert [iso_z(r[0]) for r in asc.rows] == [iso_z(t) for t in stamps[:2]]
+    assert asc.rows[0][1]["prob_up"] == 0.8
+    rest = store.query_signals(fields=("asof_ts",), cursor=asc.next_cursor, **kw)
+    assert [iso_z(r[0]) for r in rest.rows] == [iso_z(t) for t in stamps[2:]]
+
+    desc = store.query_signals(fields=("asof_ts",), limit=3, newest_first=True, **kw)
+    assert [iso_z(r[0]) for r in desc.rows] == [iso_z(t) for t in stamps[::-1][:3]]
+
+    # A page reads only the archive slice it can show: up to its first hot row, at most a page.
+    calls = []
+    read = store.archive.read
+    monkeypatch.setattr(store.archive, "read", lambda *a, **k: calls.append(k) or read(*a, **k))
+    first = store.query_signals(fields=("asof_ts",), limit=1, **kw)
+    assert [iso_z(r[0]) for r in first.rows] == [iso_z(stamps[0])]
+    assert calls[-1]["hi"] == stamps[3] and calls[-1]["limit"] == 2
+    newest = read("signals", "GBPUSD", "5m", "30m", limit=1, newest_first=True)
+    assert [iso_z(t) for t in newest["asof_ts"]] == [iso_z(stamps[2])]
+
+    summary = store.outcome_summary(**kw)
+    assert summary["count"] == 5 and summary["accuracy"] == 1.0
+    assert summary["brier"] == pytest.approx(0.04)
+    assert len(store.query_outcomes(**kw)) == 5
+
+    # Re-running is a no-op for already archived months.
+    assert store.archive_before(now - timedelta(days=60))["signals"] == 0
+
+
+def test_archived_pending_outcomes_stay_out_of_outcome_reads(tmp_path):
+    store = get_store(f"sqlite:///{tmp_path / 'signals.db'}", archive_dir=str(tmp_path / "archive"))
+    now = utc_now().replace(microsecond=0)
+    stamps = [now - timedelta(days=d) for d in (130, 100, 3)]
+    store.upsert_signals(
+        [{"asof_ts": iso_z(t), "horizon": "30m", "symbol": "GBPUSD", "timeframe": "5m",
+          "side": "buy", "prob_up": 0.8} for t in stamps]
+    )
+    store.upsert_outcomes(
+        [{"asof_ts": t, "target_ts": t + timedelta(minutes=30), "horizon": "30m", "symbol": "GBPUSD",
+          "timeframe": "5m", "c0": None if i == 1 else 1.0, "c1": None if i == 1 else 1.1,
+          "realized_up": None if i == 1 else 1, "up_excursion": None, "down_excursion": None}
+         for i, t in enumerate(stamps)]
+    )
+    assert store.archive_before(now - timedelta(days=60))["outcomes"] == 2
+
+    kw = dict(symbol="GBPUSD", timeframe="5m", days=3650)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", FutureWarning)
+        page = store.query_outcomes(fields=("asof_ts", "hit"), **kw)
+    assert [iso_z(r[0]) for r in page.rows] == [iso_z(stamps[0]), iso_z(stamps[2])]
+    assert [r[1] for r in page.rows] == [1, 1]
+    assert store.outcome_summary(**kw)["count"] == len(page)
+
+
+def test_archive_stops_when_the_month_lock_times_out(tmp_path, monkeypatch):
+    from sqlalchemy.exc import OperationalError
+
+    store = get_store(f"sqlite:///{tmp_path / 'signals.db'}", archive_dir=str(tmp_path / "archive"))
+    old = utc_now().replace(microsecond=0) - timedelta(days=120)
+    store.upsert_signals([{"asof_ts": iso_z(old), "horizon": "30m", "symbol": "GBPUSD", "timeframe": "5m", "side": "buy"}])
+
+    def locked(*a, **k):
+        raise OperationalError("LOCK TABLE", {}, Exception("canceling statement due to lock timeout"))
+
+    monkeypatch.setattr(store, "_archive_month", locked)
+    res = store.archive_before(utc_now() - timedelta(days=60), lock_timeout=0.1)
+    assert res["skipped"] == f"{old:%Y-%m}" and res["signals"] == 0
+    assert len(store.query_signals(days=3650, symbol="GBPUSD", timeframe="5m")) == 1
@@ -0,0 +1,88 @@
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from services.inference_api import main as api
+from services.inference_api.scheduler import BarScheduler
+from services.inference_api.startup import StartupProfile
+
+
+def test_profile_times_phases_and_blocks_readiness_on_failure():
+    prof = StartupProfile()
+    with prof.phase("ok"):
+        pass
+    with prof.phase("boom"):
+        raise OSError("no db")
+    assert not prof.finish()
+    d = prof.as_dict()
+    assert [p["phase"] for p in d["phases"]] == ["ok", "boom"]
+    assert d["phases"][1]["error"] == "OSError: no db"
+    assert d["warmup_seconds"] is not None
+
+
+def test_failed_phases_are_retried_until_ready():
+    prof = StartupProfile()
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise OSError("db not up yet")
+
+    failed = prof.run([("ok", lambda: None), ("db", flaky)])
+    assert [name for name, _ in failed] == ["db"]
+    assert not prof.finish()
+    asyncio.run(prof.retry(failed, first=0.001, cap=0.002))
+    assert prof.ready and len(calls) == 3
+    db = prof.as_dict()["phases"][1]
+    assert db["phase"] == "db" and db["attempts"] == 3 and "error" not in db
+
+
+@pytest.mark.parametrize("scheduler", ["0", "1"])
+def test_lifespan_warms_up_before_ready(tmp_path, monkeypatch, scheduler):
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "test.db"))
+    monkeypatch.delenv("DB_URL", raising=False)
+    monkeypatch.setenv("SIGNAL_SCHEDULER", scheduler)
+    api._store.cache_clear()
+    monkeypatch.setattr(api, "_startup", StartupProfile())
+    monkeypatch.setattr(api, "_scheduler", BarScheduler(api._precompute, api.SYMBOLS, api.HORIZONS, api.BAR_MINUTES))
+
+    assert TestClient(api.app).get("/ready").status_code == 503  # no lifespan, never warmed
+    with TestClient(api.app) as c:
+        assert c.get("/health").status_code == 200
+        for _ in range(200):
+            r = c.get("/ready")
+            if r.status_code == 200:
+                break
+            time.sleep(0.05)
+        assert r.status_code == 200
+        phases = [p["phase"] for p in r.json()["phases"]]
+        assert phases[0] == "import"
+        assert {"db", f"candles:{api.SYMBOL}", f"models:{api.SYMBOL}", "signals"} <= set(phases)
+        # The first scoring pass publishes only when a running scheduler keeps the table fresh.
+        published = api._scheduler.get(api.SYMBOL, "30m")
+        assert (published is not None) if scheduler == "1" else (published is None)
+
+
+def test_unreadable_model_fails_its_phase_until_synced(tmp_path, monkeypatch):
+    import joblib
+
+    from services.inference_api.model_cache import ModelCache
+
+    d = tmp_path / "30m" / "2024-01-01"
+    d.mkdir(parents=True)
+    (d / "feature_spec.json").write_text('{"features": ["f1"]}')
+    (d / "model.pkl").write_bytes(b"\x80\x04partial")
+    cache = ModelCache(str(tmp_path), check_every=3600)
+    monkeypatch.setattr(api, "_model_cache", lambda sym: cache)
+    monkeypatch.setattr(api, "HORIZONS", ("30m",))
+
+    prof = StartupProfile()
+    failed = prof.run([("models:GBPUSD", lambda: api._load_models("GBPUSD"))])
+    assert not prof.finish() and "failed to load" in prof.as_dict()["phases"][0]["error"]
+
+    joblib.dump({"w": 1}, d / "model.pkl")
+    asyncio.run(prof.retry(failed, first=0.001))
+    assert prof.ready and cache.get("30m").model == {"w": 1}
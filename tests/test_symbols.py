@@ -0,0 +1,64 @@
+import json
+
+import joblib
+import numpy as np
+import pandas as pd
+from fastapi.testclient import TestClient
+
+from services.inference_api import main as api
+from services.inference_api.symbols import SymbolRegistry
+
+
+def _model(root, symbol_dir, h="30m", version="2024-01-01", payload=b"x" * 4096):
+    d = root / symbol_dir / h / version
+    d.mkdir(parents=True, exist_ok=True)
+    joblib.dump({"blob": payload}, d / "model.pkl")
+    (d / "feature_spec.json").write_text(json.dumps({"horizon": h, "features": ["ret1"]}))
+
+
+def _candles(data_dir, symbol, n=100):
+    ts = pd.date_range("2024-01-02", periods=n, freq="min", tz="UTC")
+    c = 1.1 + np.arange(n) * 1e-5
+    d = data_dir / symbol / "timeframe=1m" / "dt=2024-01-02"
+    d.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame({"ts": ts, "o": c, "h": c + 1e-4, "l": c - 1e-4, "c": c, "v": 1.0}).to_parquet(d / "part.parquet")
+
+
+def test_lazy_state_and_lowercase_registry_dirs(tmp_path):
+    _model(tmp_path / "reg", "eurusd")
+    reg = SymbolRegistry(str(tmp_path / "reg"), str(tmp_path / "data"), budget_bytes=10**9)
+    assert reg.resident() == []
+    assert reg.known("EURUSD") and not reg.known("USDJPY") and not reg.known("../etc")
+    state = reg.get("EURUSD")
+    assert state.models.registry.endswith("eurusd")
+    assert reg.resident() == ["EURUSD"] and reg.nbytes() == 0  # nothing loaded until used
+    assert state.models.get("30m").version == "2024-01-01"
+    assert reg.nbytes() > 0
+
+
+def test_lru_eviction_respects_budget_and_pins(tmp_path):
+    for sym in ("AAA", "BBB", "CCC"):
+        _model(tmp_path / "reg", sym)
+    reg = SymbolRegistry(str(tmp_path / "reg"), str(tmp_path / "data"), budget_bytes=6000,
+                         pinned=["AAA"], recheck_every=0)
+    for sym in ("AAA", "BBB", "CCC"):
+        reg.get(sym).models.get("30m")
+    reg.get("CCC")
+    assert reg.resident() == ["AAA", "CCC"]
+    assert reg.evictions == 1
+    reg.get("BBB").models.get("30m")  # reloads lazily
+    reg.get("BBB")
+    assert reg.resident() == ["AAA", "BBB"]
+
+
+def test_latest_serves_any_symbol_in_registry(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "test.db"))
+    monkeypatch.delenv("DB_URL", raising=False)
+    api._store.cache_clear()
+    _candles(tmp_path / "data", "EURUSD")
+    monkeypatch.setattr(api, "_symbols", SymbolRegistry(str(tmp_path / "reg"), str(tmp_path / "data"), budget_bytes=10**9))
+    c = TestClient(api.app)
+    j = c.get("/signals/latest", params={"symbol": "EURUSD"}).json()
+    assert j["symbol"] == "EURUSD" and j["asof_ts"].startswith("2024-01-02T01:39")
+    assert c.get("/signals/latest", params={"symbol": "NOPE"}).status_code == 404
+    assert c.get("/signals/history", params={"symbol": "EURUSD", "days": 3650}).json()["count"] == 1
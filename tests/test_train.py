@@ -0,0 +1,42 @@
+import numpy as np
+from sklearn.model_selection import TimeSeriesSplit
+
+from models import train
+from models.cv import fold_rows, plan
+from models.dataset import build_training_set
+
+
+def test_fold_rows_match_time_series_split():
+    got = fold_rows(103, 5)
+    want = [((0, tr[-1] + 1), (te[0], te[-1] + 1)) for tr, te in TimeSeriesSplit(5).split(np.empty(103))]
+    assert got == want
+
+
+def test_plan_splits_cores_between_workers_and_threads():
+    assert plan(cpus=8) == (8, 1)
+    assert plan(cpus=8, workers=2) == (2, 4)
+    assert plan(cpus=8, threads=4) == (2, 4)
+    assert plan(cpus=1, workers=4) == (4, 1)
+
+
+def test_parallel_training_matches_serial(ohlc):
+    df = ohlc(symbol="GBPUSD")
+    serial = train.train_all(df, train.HORIZONS, workers=1, n_splits=3)
+    parallel = train.train_all(df, train.HORIZONS, workers=2, n_splits=3)
+    assert set(serial) == {"30m", "2h"}
+    for h, (pipe, meta) in serial.items():
+        assert meta["features"] == train.FEATURES  # string columns never reach the model
+        assert meta["model"] == parallel[h][1]["model"]
+        assert abs(meta["auc"] - parallel[h][1]["auc"]) < 1e-9
+        assert pipe.predict_proba(np.zeros((1, len(train.FEATURES)))).shape == (1, 2)
+
+
+def test_training_set_labels_all_horizons_from_one_feature_build(ohlc):
+    x = train.build_features(ohlc(300))
+    ds = build_training_set(x, {"30m": 6, "2h": 24, "4h": 48}, train.FEATURES)
+    assert ds.labels.shape == (3, len(x))
+    for h, bars in ds.horizons.items():
+        X, y = ds.horizon(h)
+        assert len(X) == len(y) == len(x) - bars
+        assert np.shares_memory(X, ds.X) and np.shares_memory(y, ds.labels)
+        np.testing.assert_array_equal(y, train.target(x, bars).to_numpy()[:-bars])
@@ -0,0 +1,12 @@
+import json
+
+from benchmarks import train_bench
+
+
+def test_train_bench_reports_stages_and_writes_json(tmp_path):
+    out = tmp_path / "bench.json"
+    r = train_bench.main(["--rows", "3000", "--horizons", "30m=6", "--n_splits", "2", "--tracemalloc", "--out", str(out)])
+    assert {"load_parquet", "build_features", "labels", "cv", "final_fit", "save", "scaler_fit_once"} <= set(r.stages)
+    assert r.fits == 2 * 2 + 1 and r.fits_per_sec > 0
+    assert r.peak_rss_mb > 0 and r.tracemalloc_peak_mb > 0
+    assert json.loads(out.read_text())["stages"] == r.stages
@@ -0,0 +1,54 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from services.inference_api import main as api
+from services.inference_api.workers import Saturated, WorkerPool
+
+
+def test_pool_rejects_beyond_workers_plus_queue():
+    gate = threading.Event()
+    pool = WorkerPool("t", max_workers=1, max_queue=1, processes=False)
+
+    async def go():
+        first = asyncio.ensure_future(pool.run(gate.wait, 5))
+        second = asyncio.ensure_future(pool.run(gate.wait, 5))
+        await asyncio.sleep(0)
+        assert pool.inflight == 2
+        with pytest.raises(Saturated):
+            await pool.run(gate.wait, 5)
+        gate.set()
+        assert await asyncio.gather(first, second) == [True, True]
+        assert pool.inflight == 0
+        return await pool.run(sum, [1, 2])
+
+    try:
+        assert asyncio.run(go()) == 3
+    finally:
+        pool.shutdown()
+
+
+def test_process_pool_runs_off_process():
+    pool = WorkerPool("p", max_workers=1, max_queue=0)
+    try:
+        assert asyncio.run(pool.run(divmod, 7, 3)) == (2, 1)
+    finally:
+        pool.shutdown()
+
+
+def test_saturated_heavy_pool_returns_429(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "test.db"))
+    monkeypatch.delenv("DB_URL", raising=False)
+    api._store.cache_clear()
+    full = WorkerPool("heavy", max_workers=1, max_queue=0, processes=False)
+    full._inflight = 1
+    monkeypatch.setattr(api, "_heavy", full)
+    monkeypatch.setattr(api._jobs, "pool", full)
+    c = TestClient(api.app)
+    r = c.post("/backtest/run", json={"horizon": "30m", "days": 30})
+    assert r.status_code == 429
+    assert r.headers["retry-after"] == "1"
+    assert c.get("/signals/evaluate").status_code == 429
+    assert c.get("/signals/latest").status_code == 200